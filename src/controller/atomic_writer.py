@@ -0,0 +1,130 @@
+"""Streaming file writer with on-the-fly hashing and atomic finalization."""
+
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+FSYNC_NONE = "none"
+FSYNC_FILE = "file"
+FSYNC_FULL = "full"
+FSYNC_POLICIES = (FSYNC_NONE, FSYNC_FILE, FSYNC_FULL)
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class write_result:
+    pfad: Path
+    sha256: str
+    size: int
+
+
+def fsync_policy(settings) -> str:
+    """Read the configured fsync policy, falling back to ``FSYNC_FILE``.
+
+    Args:
+        settings: QSettings-like object for persisted preferences.
+
+    Returns:
+        str: One of ``FSYNC_POLICIES``.
+    """
+    value = str(settings.value("files/fsync_policy", FSYNC_FILE, type=str) or "").lower()
+    return value if value in FSYNC_POLICIES else FSYNC_FILE
+
+
+class atomic_writer:
+    """Writes a file through a temporary path and renames it into place.
+
+    Every written chunk feeds a SHA-256 digest, so the hash is available at
+    commit time without reading the file again. With ``resume=True`` an
+    existing temporary file is extended instead of truncated.
+    """
+
+    def __init__(
+        self,
+        dest: Path,
+        *,
+        temp: Path | None = None,
+        resume: bool = False,
+        fsync_policy: str = FSYNC_FILE,
+    ):
+        self.dest = Path(dest)
+        self.temp = Path(temp) if temp is not None else self.dest.with_name(
+            f".{self.dest.name}.{uuid.uuid4().hex}.tmp"
+        )
+        self.fsync_policy = fsync_policy if fsync_policy in FSYNC_POLICIES else FSYNC_FILE
+        # Explicit temp paths are resumable partial files and survive errors.
+        self.keep_partial = temp is not None
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self.dest.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.temp.exists():
+            self._hash_existing()
+            self._handle = open(self.temp, "ab")
+        else:
+            self._handle = open(self.temp, "wb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._handle is None:
+            return False
+        if self.keep_partial:
+            self.close()
+        else:
+            self.discard()
+        return False
+
+    def write(self, data: bytes):
+        self._handle.write(data)
+        self._digest.update(data)
+        self.size += len(data)
+
+    def commit(self) -> write_result:
+        """Flush, optionally fsync, and atomically move the file to ``dest``.
+
+        Returns:
+            write_result: Final path, SHA-256 hex digest and byte size.
+
+        Raises:
+            OSError: If flushing or renaming fails; the temp file is kept for resumable writers.
+        """
+        self._handle.flush()
+        if self.fsync_policy != FSYNC_NONE:
+            os.fsync(self._handle.fileno())
+        self.close()
+        os.replace(self.temp, self.dest)
+        if self.fsync_policy == FSYNC_FULL:
+            _fsync_directory(self.dest.parent)
+        return write_result(self.dest, self._digest.hexdigest(), self.size)
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def discard(self):
+        self.close()
+        self.temp.unlink(missing_ok=True)
+
+    def _hash_existing(self):
+        with open(self.temp, "rb") as handle:
+            for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+                self._digest.update(chunk)
+                self.size += len(chunk)
+
+
+def _fsync_directory(path: Path):
+    # Persists the rename itself; not supported on every platform.
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -40,11 +40,12 @@ class auth_flow:
             return
 
         try:
-            resp = requests.post(
-                f"{self.controller.api_base_url}/token",
+            resp = self.controller.api_client.post(
+                "/token",
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
                 data={"username": username, "password": password},
                 timeout=10,
+                interactive=True,
             )
         except requests.RequestException as exc:
             self.controller.login_view.show_error(f"Login fehlgeschlagen: {exc}")
@@ -89,10 +90,11 @@ class auth_flow:
             return
 
         try:
-            resp = requests.post(
-                f"{self.controller.api_base_url}/register",
+            resp = self.controller.api_client.post(
+                "/register",
                 json={"username": username, "password_hash": password},
                 timeout=10,
+                interactive=True,
             )
         except requests.RequestException as exc:
             self.controller.login_view.show_error(f"Registrierung fehlgeschlagen: {exc}")
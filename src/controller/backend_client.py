@@ -0,0 +1,195 @@
+"""Shared HTTP client for the backend API with pooled keep-alive connections."""
+
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from controller.retry_policy import retry_after_from, retry_policy, token_bucket
+
+
+SESSION_EXPIRED_MESSAGE = "Sitzung abgelaufen. Bitte erneut einloggen."
+
+STATUS_MESSAGES = {
+    401: SESSION_EXPIRED_MESSAGE,
+    403: "Kein Zugriff auf diese Datei.",
+    404: "Datei nicht gefunden.",
+}
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,})$")
+
+
+def status_error_message(status_code: int, fallback: str) -> str:
+    """Map a backend status code to the user-facing error message.
+
+    Args:
+        status_code (int): HTTP status code returned by the backend.
+        fallback (str): Message used when the status has no shared mapping.
+
+    Returns:
+        str: Localized error message for the UI.
+    """
+    return STATUS_MESSAGES.get(status_code, fallback)
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """Collapse id segments so latency counters aggregate per endpoint.
+
+    Args:
+        method (str): HTTP method.
+        path (str): Request path relative to the API base URL.
+
+    Returns:
+        str: Key such as ``GET /files/{id}/download``.
+    """
+    segments = [
+        "{id}" if _ID_SEGMENT.match(segment) else segment
+        for segment in path.split("?", 1)[0].split("/")
+    ]
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+class backend_client:
+    """Owns one pooled requests session shared by all backend flows."""
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        pool_size: int = 8,
+        session=None,
+        retry: retry_policy | None = None,
+        limiter: token_bucket | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = max(1, int(pool_size))
+        self.retry = retry
+        self.limiter = limiter
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+        self._auth_cache: tuple[str | None, dict] = (None, {})
+        self._stats_lock = threading.Lock()
+        self._stats: dict[str, dict] = {}
+
+    def url_for(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        token: str | None = None,
+        interactive: bool = False,
+        **kwargs,
+    ):
+        """Send a request through the pooled session and record its latency.
+
+        Retryable statuses and transport errors of idempotent calls are
+        retried according to ``self.retry``; every attempt passes the rate
+        limiter first. Interactive calls are sent once and skip the limiter,
+        so a caller on the UI thread never sleeps.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Path relative to the API base URL.
+            token (str | None): Bearer token; omitted when empty.
+            interactive (bool): Send once, without retries or rate limiting.
+            **kwargs: Forwarded to ``requests.Session.request``. ``idempotent``
+                overrides the method-based retry decision.
+
+        Returns:
+            requests.Response: The backend response.
+
+        Raises:
+            requests.RequestException: On transport-level failures.
+        """
+        headers = dict(self._headers_for(token))
+        headers.update(kwargs.pop("headers", None) or {})
+        idempotent = kwargs.pop("idempotent", None)
+        key = endpoint_key(method, path)
+        url = self.url_for(path)
+        retrying = self.retry is not None and not interactive
+        attempts = self.retry.max_attempts if retrying else 1
+        delay = 0.0
+        for attempt in range(1, attempts + 1):
+            if self.limiter is not None and not interactive:
+                self.limiter.acquire()
+            started = time.perf_counter()
+            try:
+                resp = self.session.request(method, url, headers=headers, **kwargs)
+            except requests.RequestException as exc:
+                self._record(key, time.perf_counter() - started, failed=True, retry=attempt > 1)
+                if attempt == attempts or not self.retry.is_retryable_exception(
+                    method, exc, idempotent=idempotent
+                ):
+                    raise
+                delay = self.retry.next_delay(delay)
+                self.retry.wait(delay)
+                continue
+            self._record(key, time.perf_counter() - started, failed=False, retry=attempt > 1)
+            if attempt == attempts or not self.retry.is_retryable_status(
+                method, resp.status_code, idempotent=idempotent
+            ):
+                return resp
+            next_delay = self.retry.next_delay(delay, retry_after_from(resp))
+            if next_delay is None:
+                # The server asked for a longer pause than we are willing to block for.
+                return resp
+            delay = next_delay
+            resp.close()
+            self.retry.wait(delay)
+        return resp
+
+    def get(self, path: str, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path: str, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def latency_stats(self) -> dict[str, dict]:
+        """Return a snapshot of per-endpoint call counts and latencies.
+
+        Returns:
+            dict[str, dict]: Endpoint key mapped to count/errors/retries/total_s/max_s.
+        """
+        with self._stats_lock:
+            return {key: dict(value) for key, value in self._stats.items()}
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats.clear()
+
+    def close(self):
+        self.session.close()
+
+    def _headers_for(self, token: str | None) -> dict:
+        # Cache the header dict so repeated calls do not rebuild it per request.
+        cached_token, headers = self._auth_cache
+        if token != cached_token:
+            headers = {"Authorization": f"Bearer {token}"} if token else {}
+            self._auth_cache = (token, headers)
+        return headers
+
+    def _record(self, key: str, elapsed: float, *, failed: bool, retry: bool = False):
+        with self._stats_lock:
+            entry = self._stats.setdefault(
+                key, {"count": 0, "errors": 0, "retries": 0, "total_s": 0.0, "max_s": 0.0}
+            )
+            entry["count"] += 1
+            if failed:
+                entry["errors"] += 1
+            if retry:
+                entry["retries"] += 1
+            entry["total_s"] += elapsed
+            entry["max_s"] = max(entry["max_s"], elapsed)
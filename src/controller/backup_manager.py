@@ -15,6 +15,7 @@ class backup_result:
     ziel_datei: Path | None = None
     msg: str = ""
     error: Exception | None = None
+    sha256: str | None = None
 
 
 class backup_manager:
@@ -42,7 +43,9 @@ class backup_manager:
                 f"Zielordner: {zielordner}\n"
             ).encode("utf-8")
 
-            ziel_datei = self._dm.speichere_datei(rel_name, content)
-            return backup_result(True, ziel_datei, "Backup (Demo) geschrieben.")
+            geschrieben = self._dm.schreibe_datei(rel_name, [content])
+            return backup_result(
+                True, geschrieben.pfad, "Backup (Demo) geschrieben.", sha256=geschrieben.sha256
+            )
         except Exception as e:
             return backup_result(False, None, "Backup konnte nicht geschrieben werden.", e)
@@ -0,0 +1,91 @@
+"""Cancellation token shared between the UI thread and a running chat request."""
+
+import threading
+
+
+class request_cancelled(RuntimeError):
+    """Raised inside a request once its token has been cancelled."""
+
+
+class cancellation_token:
+    """Signals cancellation and tears down the HTTP responses a request is reading.
+
+    ``cancel`` may be called from any thread. One token can cover several
+    parallel calls. A response attached after cancellation is closed
+    immediately, so a call that was still waiting for headers stops as soon
+    as they arrive.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._responses = []
+
+    def cancel(self):
+        """Mark the request cancelled and interrupt any blocked response read.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._event.set()
+            responses = self._responses
+            self._responses = []
+        for response in responses:
+            _shutdown_response(response)
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise request_cancelled("Anfrage abgebrochen.")
+
+    def wait(self, delay: float) -> bool:
+        """Sleep up to ``delay`` seconds, waking early on cancellation.
+
+        Args:
+            delay (float): Seconds to wait.
+
+        Returns:
+            bool: True if the token was cancelled.
+        """
+        if delay > 0:
+            return self._event.wait(delay)
+        return self._event.is_set()
+
+    def attach(self, response):
+        """Register the response currently being read.
+
+        Args:
+            response (requests.Response): Open response.
+
+        Raises:
+            request_cancelled: If the token was cancelled already.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._responses.append(response)
+                return
+        _shutdown_response(response)
+        raise request_cancelled("Anfrage abgebrochen.")
+
+    def detach(self, response):
+        with self._lock:
+            if response in self._responses:
+                self._responses.remove(response)
+
+
+def _shutdown_response(response):
+    raw = getattr(response, "raw", None)
+    # Closing alone does not wake a thread blocked in recv(); shutting the socket down does.
+    shutdown = getattr(raw, "shutdown", None)
+    if shutdown is not None:
+        try:
+            shutdown()
+        except (OSError, ValueError):
+            pass
+    try:
+        response.close()
+    except OSError:
+        pass
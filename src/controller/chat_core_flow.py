@@ -1,8 +1,15 @@
 """Chat flow that manages background AI requests."""
 
-from PyQt6.QtCore import QThread
+import logging
 
 from controller.chat_worker import chat_worker
+from controller.chat_worker_pool import chat_request
+from controller.prompt_builder import prompt_builder
+
+logger = logging.getLogger(__name__)
+
+# Shown as the user message of a summary; the reply mode comes from the button, not this text.
+SUMMARY_PROMPT = "Fasse die ausgewaehlten Dateien zusammen."
 
 
 class chat_core_flow:
@@ -14,12 +21,14 @@ class chat_core_flow:
         if not self.controller.auth_token:
             self.controller.datei_liste_view.show_error("Bitte zuerst einloggen.")
             return
+        self.leave_session()
         self.controller.is_temp_chat = False
         self.controller.chat_started = False
         self.controller.chat_view.clear_chat()
         self.controller.chat_view.clear_chat_input()
         self.controller.chat_file_context = []
         self.controller.chat_file_meta = []
+        self.controller.chat_files_loading = {}
         self.controller.chat_view.set_selected_files([])
         self.controller.current_chat_id = None
         self.controller.stack.setCurrentWidget(self.controller.chat_view)
@@ -31,6 +40,26 @@ class chat_core_flow:
         text = self.controller.chat_view.get_chat_input().strip()
         if not text:
             return
+        self.controller.chat_view.clear_chat_input()
+        self.send_text(text)
+
+    def on_chat_summarize_clicked(self):
+        self.send_text(SUMMARY_PROMPT, mode="summary")
+
+    def send_text(self, text: str, mode: str = "chat"):
+        """Start a chat session if needed and submit or queue a message.
+
+        Args:
+            text (str): User message.
+            mode (str): ``"chat"`` for a regular reply, ``"summary"`` for a
+                map-reduce summary of the selected files.
+
+        Returns:
+            None
+        """
+        if mode == "summary" and not self.controller.chat_file_meta:
+            self.controller.datei_liste_view.show_error("Bitte zuerst Dateien auswaehlen.")
+            return
 
         if not self.controller.chat_started:
             self.controller.is_temp_chat = self.controller.chat_view.is_temp_chat_checked()
@@ -39,22 +68,256 @@ class chat_core_flow:
             self.controller.chat_started = True
             self.controller.chat_view.set_temp_chat_enabled(False)
 
+        if self.is_chat_busy():
+            # Answered in order once the running reply is done or cancelled.
+            depth = self.controller.chat_request_queue.push(self.session_key(), text, mode)
+            self.controller.chat_view.set_queue_depth(depth)
+            return
+        self.submit_chat_message(text, mode)
+
+    def submit_chat_message(self, text: str, mode: str = "chat"):
+        """Show a user message and start the request that answers it.
+
+        Args:
+            text (str): User message.
+            mode (str): Reply mode, see ``send_text``.
+
+        Returns:
+            None
+        """
         self.controller.chat_view.add_message("user", text)
-        self.controller.chat_view.clear_chat_input()
         self.controller.chat_messages.append({"role": "user", "content": text})
-        self.controller.chat_view.set_send_enabled(False)
+        self.controller.chat_view.set_cancel_enabled(True)
         self.controller.chat_view.start_loading()
+        if mode == "summary":
+            waiting = set(self.controller.chat_files_loading)
+        else:
+            waiting = self.files_needed_for(text)
+        if waiting:
+            # Sent as soon as the files this question depends on are loaded.
+            self.controller.pending_chat_files = waiting
+            self.controller.pending_chat_mode = mode
+            return
+        self.start_reply(mode=mode)
+
+    def start_reply(self, mode: str = "chat"):
+        """Start the request answering the latest user message.
+
+        Args:
+            mode (str): ``"summary"`` runs map-reduce over the full text of the
+                selected files; ``"chat"`` is a regular chat completion.
+
+        Returns:
+            None
+        """
+        if mode == "summary":
+            self.start_chat_worker(
+                mode="summary",
+                payload={"documents": self.summary_documents()},
+            )
+            return
         self.start_chat_worker(
             mode="chat",
             payload={"messages": self.build_chat_request_messages()},
         )
 
+    def summary_documents(self) -> list[dict]:
+        return [
+            {"name": entry.get("name") or "", "content": entry.get("content") or ""}
+            for entry in self.controller.chat_file_context
+        ]
+
+    def is_chat_busy(self) -> bool:
+        return (
+            self.controller.chat_workers.is_busy(self.session_key())
+            or self.controller.pending_chat_files is not None
+        )
+
+    def session_key(self) -> str:
+        return self.controller.current_chat_id or "temp"
+
+    def on_chat_cancel_clicked(self):
+        """Abort the running reply and move on to the next queued message.
+
+        The worker's HTTP response is torn down right away and its pool slot
+        is freed without waiting for the thread to wind down.
+
+        Returns:
+            None
+        """
+        if self.controller.pending_chat_files is not None:
+            self.controller.pending_chat_files = None
+        elif self.controller.chat_workers.cancel(self.session_key()) is None:
+            return
+        self.controller.chat_request_queue.note_cancelled()
+        self.controller.chat_view.mark_cancelled()
+        self.controller.chat_view.set_cancel_enabled(False)
+        if not self.controller.is_temp_chat and self.controller.current_chat_id:
+            self.persist_current_chat()
+        self.start_next_queued()
+
+    def start_next_queued(self):
+        key = self.session_key()
+        queued = self.controller.chat_request_queue.pop(key)
+        self.controller.chat_view.set_queue_depth(self.controller.chat_request_queue.depth(key))
+        if queued is not None:
+            text, mode = queued
+            self.submit_chat_message(text, mode)
+
+    def leave_session(self):
+        """Switch away from the current chat before another one is shown.
+
+        A saved chat keeps generating in the background and is persisted
+        when its reply arrives; its queued follow-ups wait until it is opened
+        again. A question still waiting for its context files is saved and
+        answered when the chat is opened again. A temp chat is discarded
+        together with its requests.
+
+        Returns:
+            None
+        """
+        if self.controller.is_temp_chat:
+            self.abandon_session_requests()
+            return
+        if self.controller.pending_chat_files is not None:
+            self.controller.pending_chat_files = None
+            self.controller.unanswered_chat_sessions[self.session_key()] = (
+                self.controller.pending_chat_mode
+            )
+            self.persist_current_chat()
+        self.controller.chat_view.set_queue_depth(0)
+        self.controller.chat_view.set_cancel_enabled(False)
+
+    def reset_session(self):
+        """Drop the current chat's queued and waiting work before its state is cleared.
+
+        A saved chat's unanswered question is kept for when it is reopened;
+        queued follow-ups and file loads are discarded.
+
+        Returns:
+            None
+        """
+        key = self.session_key()
+        self.leave_session()
+        self.controller.chat_request_queue.drop(key)
+        self.controller.pending_chat_files = None
+        self.controller.chat_files_loading = {}
+        if self.controller._context_worker is not None:
+            self.controller._context_worker.cancel()
+        self.controller.chat_view.set_queue_depth(0)
+
+    def abandon_session_requests(self):
+        """Cancel the running reply and drop queued messages of the current session.
+
+        Returns:
+            None
+        """
+        self.controller.chat_request_queue.drop(self.session_key())
+        self.controller.chat_workers.cancel(self.session_key())
+        self.controller.pending_chat_files = None
+        self.controller.chat_view.set_queue_depth(0)
+        self.controller.chat_view.set_cancel_enabled(False)
+
+    def session_messages(self, chat_id: str, stored: list[dict]) -> list[dict]:
+        """Return the live message list of a chat that is still generating.
+
+        Args:
+            chat_id (str): Chat session id.
+            stored (list[dict]): Messages loaded from the history file.
+
+        Returns:
+            list[dict]: The running request's messages, otherwise ``stored``.
+        """
+        request = self.controller.chat_workers.request_for(chat_id or "temp")
+        return request.messages if request is not None else stored
+
+    def on_session_shown(self):
+        """Restore busy state after a chat has been rendered.
+
+        Returns:
+            None
+        """
+        key = self.session_key()
+        unanswered = self.controller.unanswered_chat_sessions.pop(key, None)
+        if unanswered is not None or self.controller.chat_workers.is_busy(key):
+            self.controller.chat_view.set_cancel_enabled(True)
+            self.controller.chat_view.start_loading()
+            self.controller.chat_view.set_queue_depth(self.controller.chat_request_queue.depth(key))
+            if unanswered is not None:
+                self.resume_unanswered(unanswered)
+            return
+        self.start_next_queued()
+
+    def resume_unanswered(self, mode: str):
+        """Answer the question a reopened chat left waiting for its files.
+
+        Args:
+            mode (str): Reply mode the question was sent with.
+
+        Returns:
+            None
+        """
+        waiting = set(self.controller.chat_files_loading)
+        if waiting:
+            # The chat's files are loading again; the reply starts once they settle.
+            self.controller.pending_chat_files = waiting
+            self.controller.pending_chat_mode = mode
+            return
+        self.start_reply(mode=mode)
+
+    def files_needed_for(self, question: str) -> set[str]:
+        """Return ids of still-loading files the question depends on.
+
+        A question that names loading files waits only for those; one that
+        names only ready files waits for nothing; any other question waits
+        for every file still loading.
+
+        Args:
+            question (str): The user's message.
+
+        Returns:
+            set[str]: File ids to wait for.
+        """
+        loading = self.controller.chat_files_loading
+        if not loading:
+            return set()
+        text = question.lower()
+
+        def mentioned(name: str) -> bool:
+            name = name.lower()
+            stem = name.rsplit(".", 1)[0]
+            return name in text or (len(stem) >= 3 and stem in text)
+
+        named = {file_id for file_id, name in loading.items() if mentioned(name)}
+        if named:
+            return named
+        ready = [
+            meta.get("name") or ""
+            for meta in self.controller.chat_file_meta
+            if str(meta.get("id")) not in loading
+        ]
+        if any(mentioned(name) for name in ready if name):
+            return set()
+        return set(loading)
+
+    def on_context_file_settled(self, file_id: str):
+        pending = self.controller.pending_chat_files
+        if pending is None:
+            return
+        pending.discard(str(file_id))
+        if pending:
+            return
+        self.controller.pending_chat_files = None
+        self.start_reply(mode=self.controller.pending_chat_mode)
+
     def on_chat_back_clicked(self):
         if self.controller.is_temp_chat:
+            self.abandon_session_requests()
             self.controller.current_chat_id = None
             self.controller.chat_messages = []
             self.controller.chat_file_context = []
             self.controller.chat_file_meta = []
+            self.controller.chat_files_loading = {}
             self.controller.chat_view.clear_chat()
             self.controller.chat_view.clear_chat_input()
             self.controller.chat_view.set_selected_files([])
@@ -64,7 +327,12 @@ class chat_core_flow:
         self.controller.stack.setCurrentWidget(self.controller.datei_liste_view)
 
     def start_chat_worker(self, *, mode: str, payload: dict):
-        """Start a background worker to avoid blocking the UI thread.
+        """Hand the current session's request to the shared worker pool.
+
+        The request keeps references to the session's messages and files, so
+        its reply lands in the right chat even after the user switched away.
+        Callers queue messages while the session is busy, so at most one
+        request per session runs at a time.
 
         Args:
             mode (str): Worker mode identifier.
@@ -73,30 +341,77 @@ class chat_core_flow:
         Returns:
             None
         """
-        if self.controller._chat_thread is not None and self.controller._chat_thread.isRunning():
-            # Prevent concurrent workers from racing against shared UI state.
-            return
-        thread = QThread()
-        worker = chat_worker(
-            mode=mode,
+        request = chat_request(
+            session=self.session_key(),
+            chat_id=self.controller.current_chat_id,
+            temp=self.controller.is_temp_chat,
+            messages=self.controller.chat_messages,
+            files=self.controller.chat_file_meta,
             payload=payload,
+            mode=mode,
+            stream=self.streaming_enabled(),
+        )
+        self.controller.chat_workers.submit(request)
+
+    def make_chat_worker(self, request: chat_request) -> chat_worker:
+        return chat_worker(
+            mode=request.mode,
+            payload=request.payload,
             analyzer=self.controller.ki_analyzer,
             api_base_url=self.controller.api_base_url,
             auth_token=self.controller.auth_token or "",
             ai_prefs=self.controller.settings_flow.build_ai_preferences(),
+            stream=request.stream,
+            summarizer=self.controller.summarizer,
         )
-        worker.moveToThread(thread)
-        thread.started.connect(worker.run)
-        worker.finished.connect(self.on_chat_worker_finished)
-        worker.failed.connect(self.on_chat_worker_failed)
-        worker.finished.connect(thread.quit)
-        worker.failed.connect(thread.quit)
-        thread.finished.connect(self.on_chat_thread_finished)
-        thread.finished.connect(thread.deleteLater)
-        thread.finished.connect(worker.deleteLater)
-        self.controller._chat_thread = thread
-        self.controller._chat_worker = worker
-        thread.start()
+
+    def is_foreground(self, request: chat_request) -> bool:
+        return (
+            request.session == self.session_key()
+            and request.messages is self.controller.chat_messages
+        )
+
+    def on_request_delta(self, request: chat_request, text: str):
+        if self.is_foreground(request):
+            self.on_chat_delta(text)
+
+    def on_request_progress(self, request: chat_request, done: int, total: int):
+        if self.is_foreground(request):
+            self.controller.chat_view.set_loading_progress(
+                f"Zusammenfassung: {done}/{total} Teilschritte"
+            )
+
+    def on_request_finished(self, request: chat_request, result: dict):
+        if self.is_foreground(request):
+            self.on_chat_worker_finished(result)
+            return
+        assistant_text = result.get("assistant", "")
+        if assistant_text:
+            request.messages.append({"role": "assistant", "content": assistant_text})
+        self.persist_background_chat(request)
+
+    def on_request_failed(self, request: chat_request, message: str):
+        if self.is_foreground(request):
+            self.on_chat_worker_failed(message)
+            return
+        self.persist_background_chat(request)
+        self.controller.datei_liste_view.show_error(f"KI Chat fehlgeschlagen: {message}")
+
+    def persist_background_chat(self, request: chat_request):
+        if request.temp or not request.chat_id:
+            return
+        logger.info("Background chat %r settled; saving to history", request.chat_id)
+        self.controller.history_service.update_chat_session(
+            chat_id=request.chat_id,
+            messages=request.messages,
+            files=request.files,
+        )
+
+    def streaming_enabled(self) -> bool:
+        return self.controller.settings.value("ai/stream", True, type=bool)
+
+    def on_chat_delta(self, text: str):
+        self.controller.chat_view.append_stream_delta(text)
 
     def on_chat_worker_finished(self, result: dict):
         assistant_text = result.get("assistant", "")
@@ -105,25 +420,32 @@ class chat_core_flow:
                 {"role": "assistant", "content": assistant_text}
             )
 
-        self.controller.chat_view.set_send_enabled(True)
-        self.controller.chat_view.stop_loading_and_stream(assistant_text)
+        self.controller.chat_view.set_cancel_enabled(False)
+        if result.get("streamed"):
+            # Text is already on screen; only the final markdown render is left.
+            self.controller.chat_view.finish_stream(assistant_text)
+        else:
+            self.controller.chat_view.stop_loading_and_stream(assistant_text)
         if (
             not self.controller.is_temp_chat
             and self.controller.chat_started
             and self.controller.current_chat_id
         ):
             self.persist_current_chat()
+        self.start_next_queued()
 
     def on_chat_worker_failed(self, message: str):
-        self.controller.chat_view.set_send_enabled(True)
+        self.controller.chat_view.set_cancel_enabled(False)
         self.controller.chat_view.stop_loading_and_stream("")
         self.controller.datei_liste_view.show_error(f"KI Chat fehlgeschlagen: {message}")
-
-    def on_chat_thread_finished(self):
-        self.controller._chat_thread = None
-        self.controller._chat_worker = None
+        self.start_next_queued()
 
     def build_chat_request_messages(self) -> list[dict]:
+        """Assemble the request within the configured context token budget.
+
+        Returns:
+            list[dict]: System prompt, file contexts and the turns that fit.
+        """
         system_msg = (
             "You are a helpful assistant. Use the provided file context when relevant. "
             "If the question is not about the file, answer normally."
@@ -132,15 +454,28 @@ class chat_core_flow:
         if ai_prefs:
             system_msg = f"{system_msg}\n\nUser preferences:\n{ai_prefs}"
 
-        messages = [{"role": "system", "content": system_msg}]
-        for entry in self.controller.chat_file_context:
-            name = entry.get("name") or "Datei"
-            content = entry.get("content") or ""
-            context_msg = f"File name: {name}\n\nFile content:\n{content}"
-            messages.append({"role": "user", "content": context_msg})
+        builder = prompt_builder(self.context_budget())
+        plan = builder.build(system_msg, self.select_file_contexts(), self.controller.chat_messages)
+        return plan.messages
+
+    def select_file_contexts(self) -> list[dict]:
+        """Pick the file chunks most relevant to the latest user question.
 
-        messages.extend(self.controller.chat_messages)
-        return messages
+        Returns:
+            list[dict]: One context entry per file that has matching chunks.
+        """
+        index = self.controller.chat_context_index
+        index.sync(self.controller.chat_file_context)
+        query = ""
+        for msg in reversed(self.controller.chat_messages):
+            if msg.get("role") == "user":
+                query = str(msg.get("content") or "")
+                break
+        k = self.controller.settings.value("ai/context_chunks", 8, type=int)
+        return index.select_contexts(query, k)
+
+    def context_budget(self) -> int:
+        return self.controller.settings.value("ai/context_tokens", 8000, type=int)
 
     def new_chat_session(self, *, title: str) -> str:
         if self.controller.is_temp_chat:
@@ -162,10 +497,11 @@ class chat_core_flow:
         )
 
     def render_chat_messages(self, messages: list[dict]):
-        for msg in messages:
-            role = msg.get("role")
-            if role not in {"user", "assistant"}:
-                continue
-            text = str(msg.get("content") or "")
-            self.controller.chat_view.add_message(role, text, stream=False)
+        self.controller.chat_view.add_messages(
+            [
+                (msg.get("role"), str(msg.get("content") or ""))
+                for msg in messages
+                if msg.get("role") in {"user", "assistant"}
+            ]
+        )
         self.controller.chat_view.refresh_message_sizes()
@@ -1,6 +1,8 @@
 """File selection and context building for chat prompts."""
 
-import requests
+from pathlib import Path
+
+from PyQt6.QtCore import QThread
 from PyQt6.QtWidgets import (
     QAbstractItemView,
     QDialog,
@@ -10,7 +12,14 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
+from controller.atomic_writer import fsync_policy
+from controller.backend_client import status_error_message
 from controller.chat_worker import extract_text_from_downloaded_content
+from controller.context_worker import context_worker
+from controller.download_service import ensure_local_copy
+from controller.file_path_service import resolve_download_dir
+from controller.sync_manifest import sync_manifest
+from controller.text_cache import file_version
 
 
 class chat_file_flow:
@@ -23,6 +32,10 @@ class chat_file_flow:
             self.controller.chat_view.show_error("Bitte zuerst einloggen.")
             return
 
+        if self.is_loading_contexts():
+            self.controller.chat_view.show_error("Dateien werden noch geladen.")
+            return
+
         records = self.prompt_select_files()
         if records is None:
             return
@@ -37,6 +50,9 @@ class chat_file_flow:
             self.controller.chat_view.show_error(str(exc))
 
     def on_chat_clear_files_clicked(self):
+        if self.is_loading_contexts():
+            self.controller.chat_view.show_error("Dateien werden noch geladen.")
+            return
         self.set_chat_files([])
 
     def prompt_select_files(self) -> list[dict] | None:
@@ -81,9 +97,21 @@ class chat_file_flow:
         return records
 
     def set_chat_files(self, records: list[dict]):
+        """Select chat files and load their text in the background.
+
+        Args:
+            records (list[dict]): Selected file records.
+
+        Returns:
+            None
+
+        Raises:
+            RuntimeError: If a record has no file id.
+        """
         if not records:
             self.controller.chat_file_context = []
             self.controller.chat_file_meta = []
+            self.controller.chat_files_loading = {}
             self.controller.chat_view.set_selected_files([])
             if (
                 not self.controller.is_temp_chat
@@ -93,31 +121,210 @@ class chat_file_flow:
                 self.controller.chat_core_flow.persist_current_chat()
             return
 
-        contexts = self.load_chat_file_contexts(records)
-        self.controller.chat_file_context = contexts
+        if any(record.get("id") is None for record in records):
+            raise RuntimeError("Ausgewaehlter Eintrag hat keine Datei-ID.")
+        self.controller.chat_file_context = []
         self.controller.chat_file_meta = [
             {"id": record.get("id"), "name": record.get("name")}
             for record in records
         ]
-        names = [record.get("name") or f"file_{record.get('id')}" for record in records]
-        self.controller.chat_view.set_selected_files(names)
+        self.controller.chat_files_loading = {
+            str(record.get("id")): self.display_name(record) for record in records
+        }
+        self.refresh_selected_files()
         if (
             not self.controller.is_temp_chat
             and self.controller.chat_started
             and self.controller.current_chat_id
         ):
             self.controller.chat_core_flow.persist_current_chat()
+        self.start_context_worker(records)
+
+    def start_context_worker(self, records: list[dict]):
+        if self.controller._context_worker is not None:
+            # Superseded by the new selection; its late results are ignored.
+            self.controller._context_worker.cancel()
+        thread = QThread()
+        worker = context_worker(
+            records=records,
+            load_one=self.load_file_context,
+            max_workers=self.context_concurrency(),
+        )
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.file_loaded.connect(self.on_context_file_loaded)
+        worker.file_failed.connect(self.on_context_file_failed)
+        worker.finished.connect(self.on_context_finished)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(lambda: self.on_context_thread_finished(thread))
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(worker.deleteLater)
+        self.controller._context_thread = thread
+        self.controller._context_worker = worker
+        thread.start()
+
+    def is_loading_contexts(self) -> bool:
+        thread = self.controller._context_thread
+        return thread is not None and thread.isRunning()
+
+    def context_concurrency(self) -> int:
+        value = self.controller.settings.value("ai/context_concurrency", 4, type=int)
+        try:
+            return min(max(int(value), 1), 8)
+        except (TypeError, ValueError):
+            return 4
+
+    def on_context_file_loaded(self, entry: dict):
+        file_id = str(entry.get("id"))
+        if file_id not in self.controller.chat_files_loading:
+            # Result of a selection the user has since replaced.
+            return
+        del self.controller.chat_files_loading[file_id]
+        order = [str(meta.get("id")) for meta in self.controller.chat_file_meta]
+        contexts = self.controller.chat_file_context + [entry]
+        contexts.sort(key=lambda item: order.index(str(item.get("id"))))
+        self.controller.chat_file_context = contexts
+        self.refresh_selected_files()
+        self.controller.chat_core_flow.on_context_file_settled(file_id)
+
+    def on_context_file_failed(self, file_id, message: str):
+        file_id = str(file_id)
+        if file_id not in self.controller.chat_files_loading:
+            return
+        del self.controller.chat_files_loading[file_id]
+        self.controller.chat_file_meta = [
+            meta for meta in self.controller.chat_file_meta if str(meta.get("id")) != file_id
+        ]
+        self.refresh_selected_files()
+        self.controller.chat_view.show_error(message)
+        self.controller.chat_core_flow.on_context_file_settled(file_id)
+
+    def on_context_finished(self, summary: dict):
+        if (
+            summary.get("errors")
+            and not self.controller.is_temp_chat
+            and self.controller.chat_started
+            and self.controller.current_chat_id
+        ):
+            self.controller.chat_core_flow.persist_current_chat()
+
+    def on_context_thread_finished(self, thread: QThread):
+        thread.wait()
+        if self.controller._context_thread is thread:
+            self.controller._context_thread = None
+            self.controller._context_worker = None
+
+    def refresh_selected_files(self):
+        names = [self.display_name(meta) for meta in self.controller.chat_file_meta]
+        loading = set(self.controller.chat_files_loading.values())
+        self.controller.chat_view.set_selected_files(names, loading=loading)
+
+    @staticmethod
+    def display_name(record: dict) -> str:
+        return record.get("name") or f"file_{record.get('id')}"
 
     def load_chat_file_contexts(self, records: list[dict]) -> list[dict]:
-        contexts = []
-        for record in records:
-            file_id = record.get("id")
-            if file_id is None:
-                raise RuntimeError("Ausgewaehlter Eintrag hat keine Datei-ID.")
-            name = record.get("name") or f"file_{file_id}"
-            text = self.download_file_text(file_id, name)
-            contexts.append({"id": file_id, "name": name, "content": text})
-        return contexts
+        """Load extracted text for each record, preferring the local text cache.
+
+        Args:
+            records (list[dict]): Selected file records or history file metadata.
+
+        Returns:
+            list[dict]: Context entries with id, name, content and version.
+
+        Raises:
+            RuntimeError: If a record has no id or a download fails.
+        """
+        return [self.load_file_context(record) for record in records]
+
+    def load_file_context(self, record: dict) -> dict:
+        """Load one file's text from the text cache or the backend.
+
+        Safe to call from worker threads: it only reads controller state and
+        goes through the thread-safe API client and text cache.
+
+        Lookup order: extracted-text cache, the synced copy in the download
+        directory, then an in-memory download. A missing or stale local copy
+        is downloaded into the download directory, so chat and "open file"
+        share one copy.
+
+        Args:
+            record (dict): File record or history file metadata.
+
+        Returns:
+            dict: Context entry with id, name, content and, if known, version.
+
+        Raises:
+            RuntimeError: If the record has no id or the download fails.
+        """
+        file_id = record.get("id")
+        if file_id is None:
+            raise RuntimeError("Ausgewaehlter Eintrag hat keine Datei-ID.")
+        name = record.get("name") or f"file_{file_id}"
+        remote = record if file_version(record) else self.find_remote_record(file_id)
+        version = file_version(remote)
+        text = None
+        if version is not None:
+            text = self.controller.text_cache.get(file_id, version)
+        if text is None:
+            if remote is not None:
+                text = self.read_local_copy(remote, name)
+            if text is None:
+                text = self.download_file_text(file_id, name)
+            if version is not None:
+                self.controller.text_cache.put(file_id, version, text)
+        entry = {"id": file_id, "name": name, "content": text}
+        if version is not None:
+            # Lets the chat index skip re-chunking files that did not change.
+            entry["version"] = version
+        return entry
+
+    def read_local_copy(self, remote: dict, name: str) -> str | None:
+        """Extract text from the download-directory copy, fetching it if stale.
+
+        Args:
+            remote (dict): Remote file record with size and ``updated_at``.
+            name (str): Display name used for file-type detection.
+
+        Returns:
+            str | None: Extracted text, or None if no local copy can be used.
+
+        Raises:
+            RuntimeError: If the backend rejects the download.
+        """
+        target = self.local_cache_dir()
+        if target is None:
+            return None
+        result = ensure_local_copy(
+            self.controller.api_client,
+            token=self.controller.auth_token,
+            record=remote,
+            manifest=sync_manifest.for_directory(target),
+            timeout=60,
+            fsync_policy=fsync_policy(self.controller.settings),
+        )
+        if not result.ok:
+            if result.status_code is None:
+                # Local write problems; an in-memory download may still work.
+                return None
+            raise RuntimeError(result.msg)
+        try:
+            content = result.pfad.read_bytes()
+        except OSError:
+            return None
+        return extract_text_from_downloaded_content(
+            file_name=name, content_type="", content_bytes=content
+        )
+
+    def local_cache_dir(self) -> Path | None:
+        return resolve_download_dir(self.controller.settings, None)
+
+    def find_remote_record(self, file_id) -> dict | None:
+        # History entries only store id and name; the listing has the version.
+        for record in self.controller.file_records:
+            if str(record.get("id")) == str(file_id):
+                return record
+        return None
 
     def download_file_text(self, file_id: str | int, name: str) -> str:
         """Download and extract text for use in chat context.
@@ -132,57 +339,48 @@ class chat_file_flow:
         Raises:
             RuntimeError: If the file cannot be downloaded or parsed.
         """
-        resp = requests.get(
-            f"{self.controller.api_base_url}/files/{file_id}/download",
-            headers={"Authorization": f"Bearer {self.controller.auth_token}"},
+        resp = self.controller.api_client.get(
+            f"/files/{file_id}/download",
+            token=self.controller.auth_token,
             timeout=30,
         )
-        if resp.status_code == 401:
-            raise RuntimeError("Sitzung abgelaufen. Bitte erneut einloggen.")
-        if resp.status_code == 403:
-            raise RuntimeError("Kein Zugriff auf diese Datei.")
-        if resp.status_code == 404:
-            raise RuntimeError("Datei nicht gefunden.")
         if resp.status_code != 200:
-            raise RuntimeError(f"Datei konnte nicht geladen werden (HTTP {resp.status_code}).")
+            raise RuntimeError(
+                status_error_message(
+                    resp.status_code,
+                    f"Datei konnte nicht geladen werden (HTTP {resp.status_code}).",
+                )
+            )
 
-        content = extract_text_from_downloaded_content(
+        # The full text is kept; prompt_builder trims it to the token budget per request.
+        return extract_text_from_downloaded_content(
             file_name=name,
             content_type=resp.headers.get("Content-Type", "").lower(),
             content_bytes=resp.content,
         )
-        # Limit context size to keep requests within practical prompt budgets.
-        max_chars = 12000
-        return content[:max_chars]
 
     def open_history_entry(self, history: list[dict], idx: int):
+        self.controller.chat_core_flow.leave_session()
         self.controller.is_temp_chat = False
         self.controller.chat_started = True
         entry = history[idx]
         self.controller.current_chat_id = entry.get("id")
-        self.controller.chat_messages = entry.get("messages", [])
-        self.controller.chat_file_meta = entry.get("files", [])
+        self.controller.chat_messages = self.controller.chat_core_flow.session_messages(
+            entry.get("id"), entry.get("messages", [])
+        )
+        # Files load in the background; questions that need them wait in pending_chat_files.
+        self.controller.chat_file_context = []
+        self.controller.chat_file_meta = list(entry.get("files", []))
+        self.controller.chat_files_loading = {
+            str(meta.get("id")): self.display_name(meta)
+            for meta in self.controller.chat_file_meta
+        }
+        self.refresh_selected_files()
         if self.controller.chat_file_meta:
-            try:
-                self.controller.chat_file_context = self.load_chat_file_contexts(
-                    self.controller.chat_file_meta
-                )
-            except RuntimeError as exc:
-                self.controller.chat_file_context = []
-                self.controller.chat_file_meta = []
-                self.controller.chat_view.set_selected_files([])
-                self.controller.history_view.show_error(str(exc))
-            else:
-                names = [
-                    record.get("name") or f"file_{record.get('id')}"
-                    for record in self.controller.chat_file_meta
-                ]
-                self.controller.chat_view.set_selected_files(names)
-        else:
-            self.controller.chat_file_context = []
-            self.controller.chat_view.set_selected_files([])
+            self.start_context_worker(self.controller.chat_file_meta)
         self.controller.chat_view.clear_chat()
         self.controller.chat_core_flow.render_chat_messages(self.controller.chat_messages)
         self.controller.stack.setCurrentWidget(self.controller.chat_view)
         self.controller.chat_view.set_temp_chat_checked(False)
         self.controller.chat_view.set_temp_chat_enabled(False)
+        self.controller.chat_core_flow.on_session_shown()
@@ -0,0 +1,112 @@
+"""Per-session queue of chat messages waiting for the chat worker."""
+
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class chat_request_queue:
+    """FIFO of pending chat messages per session with depth and wait-time counters.
+
+    Messages sent while a reply is still running wait here instead of being
+    dropped; the flow pops the next one once the worker is free.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._queues: dict[str, deque[tuple[str, str, float]]] = {}
+        self.enqueued = 0
+        self.started = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.max_depth = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+        self.last_wait_s = 0.0
+
+    def push(self, session: str, text: str, mode: str = "chat") -> int:
+        """Queue a message behind the running request.
+
+        Args:
+            session (str): Chat session key.
+            text (str): User message.
+            mode (str): Reply mode the message is answered with.
+
+        Returns:
+            int: Queue depth of the session after the push.
+        """
+        queue = self._queues.setdefault(session, deque())
+        queue.append((text, mode, self._clock()))
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, len(queue))
+        logger.info("Chat queue %r: message queued, depth %d", session, len(queue))
+        return len(queue)
+
+    def pop(self, session: str) -> tuple[str, str] | None:
+        """Take the oldest waiting message and record how long it waited.
+
+        Args:
+            session (str): Chat session key.
+
+        Returns:
+            tuple[str, str] | None: Message text and reply mode, or None if
+                nothing is queued.
+        """
+        queue = self._queues.get(session)
+        if not queue:
+            return None
+        text, mode, enqueued_at = queue.popleft()
+        if not queue:
+            del self._queues[session]
+        wait_s = max(0.0, self._clock() - enqueued_at)
+        self.started += 1
+        self.total_wait_s += wait_s
+        self.max_wait_s = max(self.max_wait_s, wait_s)
+        self.last_wait_s = wait_s
+        logger.info(
+            "Chat queue %r: message started after %.2fs, depth %d",
+            session,
+            wait_s,
+            len(queue),
+        )
+        return text, mode
+
+    def depth(self, session: str) -> int:
+        return len(self._queues.get(session) or ())
+
+    def drop(self, session: str) -> int:
+        """Discard every message still waiting in a session.
+
+        Args:
+            session (str): Chat session key.
+
+        Returns:
+            int: Number of discarded messages.
+        """
+        queue = self._queues.pop(session, None)
+        count = len(queue) if queue else 0
+        self.dropped += count
+        return count
+
+    def note_cancelled(self):
+        self.cancelled += 1
+
+    def stats(self) -> dict:
+        """Return queue counters for instrumentation.
+
+        Returns:
+            dict: Current depth, peak depth, counters and wait times in seconds.
+        """
+        return {
+            "depth": sum(len(queue) for queue in self._queues.values()),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "started": self.started,
+            "dropped": self.dropped,
+            "cancelled": self.cancelled,
+            "avg_wait_s": self.total_wait_s / self.started if self.started else 0.0,
+            "max_wait_s": self.max_wait_s,
+            "last_wait_s": self.last_wait_s,
+        }
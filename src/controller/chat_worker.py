@@ -1,11 +1,11 @@
 """Background worker for chat requests and file text extraction."""
 
-import io
-
-from PyPDF2 import PdfReader
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from controller.cancellation import cancellation_token, request_cancelled
 from controller.ki_analyzer import ki_analyzer
+from controller.pdf_extractor import extract_pdf_text
+from controller.summarizer import map_reduce_summarizer
 
 
 def extract_text_from_downloaded_content(*, file_name: str, content_type: str, content_bytes: bytes) -> str:
@@ -23,8 +23,7 @@ def extract_text_from_downloaded_content(*, file_name: str, content_type: str, c
         RuntimeError: If no readable text can be extracted.
     """
     if file_name.lower().endswith(".pdf") or content_type.startswith("application/pdf"):
-        reader = PdfReader(io.BytesIO(content_bytes))
-        pages = [(page.extract_text() or "").strip() for page in reader.pages]
+        pages = extract_pdf_text(content_bytes)
         content = "\n".join([page for page in pages if page])
     else:
         content = content_bytes.decode("utf-8", errors="replace")
@@ -36,9 +35,12 @@ def extract_text_from_downloaded_content(*, file_name: str, content_type: str, c
 
 
 class chat_worker(QObject):
-    """Runs chat requests off the UI thread and emits results via signals."""
+    """Runs chat and summary requests off the UI thread and emits results via signals."""
     finished = pyqtSignal(dict)
     failed = pyqtSignal(str)
+    delta = pyqtSignal(str)
+    progress = pyqtSignal(int, int)
+    cancelled = pyqtSignal()
 
     def __init__(
         self,
@@ -49,6 +51,8 @@ class chat_worker(QObject):
         api_base_url: str,
         auth_token: str,
         ai_prefs: str,
+        stream: bool = False,
+        summarizer: map_reduce_summarizer | None = None,
     ):
         super().__init__()
         self.mode = mode
@@ -57,18 +61,55 @@ class chat_worker(QObject):
         self.api_base_url = api_base_url
         self.auth_token = auth_token
         self.ai_prefs = ai_prefs
+        self.stream = stream
+        self.summarizer = summarizer
+        self.cancellation = cancellation_token()
+
+    def cancel(self):
+        """Abort the running request; safe to call from the UI thread.
+
+        Returns:
+            None
+        """
+        self.cancellation.cancel()
 
     def run(self):
         try:
             if self.mode == "chat":
                 result = self._run_chat()
+            elif self.mode == "summary":
+                result = self._run_summary()
             else:
                 raise ValueError("Unknown worker mode")
-            self.finished.emit(result)
+        except request_cancelled:
+            self.cancelled.emit()
+            return
         except Exception as exc:  # noqa: BLE001
-            self.failed.emit(str(exc))
+            if self.cancellation.is_cancelled():
+                self.cancelled.emit()
+            else:
+                self.failed.emit(str(exc))
+            return
+        if self.cancellation.is_cancelled():
+            self.cancelled.emit()
+            return
+        self.finished.emit(result)
 
     def _run_chat(self) -> dict:
         messages = self.payload["messages"]
-        assistant_text = self.analyzer.chat(messages)
+        if self.stream:
+            assistant_text = self.analyzer.chat_stream(
+                messages, on_delta=self.delta.emit, cancellation=self.cancellation
+            )
+            return {"mode": "chat", "assistant": assistant_text, "streamed": True}
+        assistant_text = self.analyzer.chat(messages, cancellation=self.cancellation)
         return {"mode": "chat", "assistant": assistant_text}
+
+    def _run_summary(self) -> dict:
+        summarizer = self.summarizer or map_reduce_summarizer(self.analyzer)
+        assistant_text = summarizer.summarize(
+            self.payload["documents"],
+            on_progress=self.progress.emit,
+            cancellation=self.cancellation,
+        )
+        return {"mode": "summary", "assistant": assistant_text}
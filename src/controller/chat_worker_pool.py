@@ -0,0 +1,179 @@
+"""Shared pool that runs chat workers for several sessions in parallel."""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+
+from PyQt6.QtCore import QThread
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 3
+
+
+@dataclass
+class chat_request:
+    """One chat completion together with the session it answers."""
+    session: str
+    chat_id: str | None
+    temp: bool
+    messages: list[dict]
+    files: list[dict]
+    payload: dict
+    mode: str = "chat"
+    stream: bool = False
+    queued_at: float = field(default_factory=time.perf_counter)
+    worker: object | None = None
+    thread: QThread | None = None
+
+
+class chat_worker_pool:
+    """Runs at most ``max_workers`` chat workers at once, one per session.
+
+    Requests beyond the limit wait in FIFO order. Worker signals are routed
+    to the callbacks together with their ``chat_request``; signals from a
+    request that was cancelled or already settled are dropped.
+    """
+
+    def __init__(
+        self,
+        *,
+        make_worker: Callable[[chat_request], object],
+        on_delta: Callable[[chat_request, str], None],
+        on_finished: Callable[[chat_request, dict], None],
+        on_failed: Callable[[chat_request, str], None],
+        on_progress: Callable[[chat_request, int, int], None] | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        clock=time.perf_counter,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self._make_worker = make_worker
+        self._on_delta = on_delta
+        self._on_finished = on_finished
+        self._on_failed = on_failed
+        self._on_progress = on_progress
+        self._clock = clock
+        self.active: dict[str, chat_request] = {}
+        self.waiting: deque[chat_request] = deque()
+        # Cancelled or settled threads are kept referenced until they have stopped.
+        self._retired: list[QThread] = []
+        self.started = 0
+        self.max_active = 0
+        self.max_slot_wait_s = 0.0
+
+    def submit(self, request: chat_request):
+        """Start the request now or once a worker slot frees up.
+
+        Args:
+            request (chat_request): Request to run; its session must not be busy.
+
+        Returns:
+            None
+        """
+        if len(self.active) < self.max_workers:
+            self._start(request)
+            return
+        self.waiting.append(request)
+        logger.info(
+            "Chat pool: %d/%d busy, session %r waits for a slot",
+            len(self.active),
+            self.max_workers,
+            request.session,
+        )
+
+    def is_busy(self, session: str) -> bool:
+        return self.request_for(session) is not None
+
+    def request_for(self, session: str) -> chat_request | None:
+        request = self.active.get(session)
+        if request is not None:
+            return request
+        return next((item for item in self.waiting if item.session == session), None)
+
+    def cancel(self, session: str) -> chat_request | None:
+        """Cancel the running or waiting request of a session.
+
+        Args:
+            session (str): Session key.
+
+        Returns:
+            chat_request | None: The cancelled request, if there was one.
+        """
+        request = self.active.pop(session, None)
+        if request is not None:
+            request.worker.cancel()
+            self._retire(request)
+            self._fill()
+            return request
+        for item in list(self.waiting):
+            if item.session == session:
+                self.waiting.remove(item)
+                return item
+        return None
+
+    def cancel_all(self):
+        self.waiting.clear()
+        for session in list(self.active):
+            self.cancel(session)
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self.active),
+            "waiting": len(self.waiting),
+            "max_workers": self.max_workers,
+            "max_active": self.max_active,
+            "started": self.started,
+            "max_slot_wait_s": self.max_slot_wait_s,
+        }
+
+    def _start(self, request: chat_request):
+        thread = QThread()
+        worker = self._make_worker(request)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.delta.connect(partial(self._route, request, self._on_delta))
+        if self._on_progress is not None:
+            worker.progress.connect(partial(self._route, request, self._on_progress))
+        worker.finished.connect(partial(self._settle, request, self._on_finished))
+        worker.failed.connect(partial(self._settle, request, self._on_failed))
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        worker.cancelled.connect(thread.quit)
+        thread.finished.connect(partial(self._on_thread_finished, thread))
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(worker.deleteLater)
+        request.worker = worker
+        request.thread = thread
+        self.active[request.session] = request
+        self.started += 1
+        self.max_active = max(self.max_active, len(self.active))
+        self.max_slot_wait_s = max(self.max_slot_wait_s, self._clock() - request.queued_at)
+        thread.start()
+
+    def _route(self, request: chat_request, handler, *args):
+        if self.active.get(request.session) is request:
+            handler(request, *args)
+
+    def _settle(self, request: chat_request, handler, *args):
+        if self.active.get(request.session) is not request:
+            return
+        del self.active[request.session]
+        self._retire(request)
+        # Waiting sessions get the freed slot before the handler can queue a follow-up.
+        self._fill()
+        handler(request, *args)
+
+    def _retire(self, request: chat_request):
+        if request.thread is not None:
+            self._retired.append(request.thread)
+
+    def _on_thread_finished(self, thread: QThread):
+        if thread in self._retired:
+            self._retired.remove(thread)
+
+    def _fill(self):
+        while self.waiting and len(self.active) < self.max_workers:
+            self._start(self.waiting.popleft())
@@ -0,0 +1,236 @@
+"""In-memory BM25 index over chunked file contexts of a chat session."""
+
+import hashlib
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+CHUNK_CHARS = 1200
+CHUNK_OVERLAP = 200
+CHUNK_GAP_MARKER = "\n[...]\n"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if len(token) > 1]
+
+
+def chunk_text(text: str, size: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP) -> list[str]:
+    """Split text into overlapping windows that prefer whitespace boundaries.
+
+    Args:
+        text (str): Extracted file text.
+        size (int): Target chunk length in characters.
+        overlap (int): Characters shared by neighbouring chunks.
+
+    Returns:
+        list[str]: Non-empty chunks in document order.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    overlap = min(max(0, overlap), size // 2)
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + size)
+        if end < len(text):
+            # Break at the last whitespace in the back half of the window.
+            window = text[start:end]
+            cut = max(window.rfind(" "), window.rfind("\n"))
+            if cut > size // 2:
+                end = start + cut
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+def content_version(entry: dict) -> str:
+    version = entry.get("version")
+    if version:
+        return str(version)
+    content = str(entry.get("content") or "")
+    return hashlib.sha1(content.encode("utf-8", errors="replace")).hexdigest()
+
+
+@dataclass(frozen=True)
+class chunk_hit:
+    file_id: str
+    name: str
+    position: int
+    text: str
+    score: float
+
+
+@dataclass
+class _indexed_file:
+    name: str
+    version: str
+    chunks: list[str]
+    term_counts: list[Counter]
+    lengths: list[int]
+
+
+class context_index:
+    """BM25 index over the chunks of the files selected in a chat session.
+
+    Files are chunked and tokenized once per version; the inverted index is
+    rebuilt lazily after the file set changes.
+    """
+
+    def __init__(self, *, k1: float = 1.5, b: float = 0.75):
+        self.k1 = float(k1)
+        self.b = float(b)
+        self._files: dict[str, _indexed_file] = {}
+        self._postings: dict[str, list[tuple[str, int, int]]] | None = None
+        self._avg_length = 0.0
+        self._chunk_count = 0
+        self.files_indexed = 0
+
+    def sync(self, contexts: list[dict]):
+        """Index new or changed file contexts and forget deselected ones.
+
+        Args:
+            contexts (list[dict]): Entries with ``id``, ``name``, ``content`` and optional ``version``.
+
+        Returns:
+            None
+        """
+        wanted = {}
+        for entry in contexts:
+            file_id = str(entry.get("id") if entry.get("id") is not None else entry.get("name"))
+            wanted[file_id] = entry
+        for file_id in list(self._files):
+            if file_id not in wanted:
+                del self._files[file_id]
+                self._postings = None
+        for file_id, entry in wanted.items():
+            version = content_version(entry)
+            current = self._files.get(file_id)
+            if current is not None and current.version == version:
+                continue
+            chunks = chunk_text(str(entry.get("content") or ""))
+            counts = [Counter(tokenize(chunk)) for chunk in chunks]
+            self._files[file_id] = _indexed_file(
+                name=str(entry.get("name") or "Datei"),
+                version=version,
+                chunks=chunks,
+                term_counts=counts,
+                lengths=[sum(c.values()) for c in counts],
+            )
+            self.files_indexed += 1
+            self._postings = None
+
+    def search(self, query: str, k: int = 8) -> list[chunk_hit]:
+        """Return the ``k`` best-scoring chunks for a query.
+
+        Args:
+            query (str): Latest user question.
+            k (int): Maximum number of chunks.
+
+        Returns:
+            list[chunk_hit]: Hits ordered by descending BM25 score.
+        """
+        terms = set(tokenize(query))
+        if not terms or k <= 0:
+            return []
+        postings = self._ensure_postings()
+        scores: dict[tuple[str, int], float] = {}
+        for term in terms:
+            entries = postings.get(term)
+            if not entries:
+                continue
+            idf = math.log(1 + (self._chunk_count - len(entries) + 0.5) / (len(entries) + 0.5))
+            for file_id, position, tf in entries:
+                length = self._files[file_id].lengths[position]
+                norm = self.k1 * (1 - self.b + self.b * length / (self._avg_length or 1.0))
+                scores[(file_id, position)] = scores.get((file_id, position), 0.0) + (
+                    idf * tf * (self.k1 + 1) / (tf + norm)
+                )
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [self._hit(file_id, position, score) for (file_id, position), score in best]
+
+    def leading_chunks(self, k: int = 8) -> list[chunk_hit]:
+        """Return the first chunks of every file, round-robin, up to ``k``.
+
+        Used when the question shares no terms with the files, e.g. a request
+        to summarize them.
+
+        Args:
+            k (int): Maximum number of chunks.
+
+        Returns:
+            list[chunk_hit]: Hits with score 0.
+        """
+        hits = []
+        position = 0
+        while len(hits) < k:
+            added = False
+            for file_id, indexed in self._files.items():
+                if position < len(indexed.chunks) and len(hits) < k:
+                    hits.append(self._hit(file_id, position, 0.0))
+                    added = True
+            if not added:
+                break
+            position += 1
+        return hits
+
+    def select_contexts(self, query: str, k: int = 8) -> list[dict]:
+        """Group the top-k chunks per file into prompt-ready file contexts.
+
+        Args:
+            query (str): Latest user question.
+            k (int): Maximum number of chunks across all files.
+
+        Returns:
+            list[dict]: Entries with ``id``, ``name``, ``content`` and ``score``,
+            chunks kept in document order.
+        """
+        hits = self.search(query, k) or self.leading_chunks(k)
+        grouped: dict[str, list[chunk_hit]] = {}
+        for hit in hits:
+            grouped.setdefault(hit.file_id, []).append(hit)
+        contexts = []
+        for file_id, indexed in self._files.items():
+            file_hits = sorted(grouped.get(file_id, []), key=lambda h: h.position)
+            if not file_hits:
+                continue
+            contexts.append(
+                {
+                    "id": file_id,
+                    "name": indexed.name,
+                    "content": CHUNK_GAP_MARKER.join(h.text for h in file_hits),
+                    "score": sum(h.score for h in file_hits),
+                }
+            )
+        return contexts
+
+    def chunk_count(self) -> int:
+        return sum(len(indexed.chunks) for indexed in self._files.values())
+
+    def _hit(self, file_id: str, position: int, score: float) -> chunk_hit:
+        indexed = self._files[file_id]
+        return chunk_hit(file_id, indexed.name, position, indexed.chunks[position], score)
+
+    def _ensure_postings(self) -> dict[str, list[tuple[str, int, int]]]:
+        if self._postings is not None:
+            return self._postings
+        postings: dict[str, list[tuple[str, int, int]]] = {}
+        total_length = 0
+        count = 0
+        for file_id, indexed in self._files.items():
+            for position, counts in enumerate(indexed.term_counts):
+                for term, tf in counts.items():
+                    postings.setdefault(term, []).append((file_id, position, tf))
+                total_length += indexed.lengths[position]
+                count += 1
+        self._postings = postings
+        self._chunk_count = count
+        self._avg_length = total_length / count if count else 0.0
+        return postings
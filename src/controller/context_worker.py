@@ -0,0 +1,57 @@
+"""Background worker that loads chat file contexts concurrently."""
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class context_worker(QObject):
+    """Loads the text of several files in parallel and reports each one as it lands."""
+    file_loaded = pyqtSignal(dict)
+    file_failed = pyqtSignal(object, str)
+    finished = pyqtSignal(dict)
+
+    def __init__(
+        self,
+        *,
+        records: list[dict],
+        load_one: Callable[[dict], dict],
+        max_workers: int,
+    ):
+        super().__init__()
+        self.records = list(records)
+        self.load_one = load_one
+        self.max_workers = max(1, int(max_workers))
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Skip files that have not started loading and stop reporting results."""
+        self._cancel.set()
+
+    def run(self):
+        """Load every record and emit one summary at the end.
+
+        Returns:
+            None
+        """
+        summary = {"total": len(self.records), "loaded": 0, "errors": []}
+        if self.records:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(self.load_one, record): record for record in self.records}
+                for future in as_completed(futures):
+                    if self._cancel.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    record = futures[future]
+                    try:
+                        entry = future.result()
+                    except Exception as exc:  # noqa: BLE001
+                        summary["errors"].append(str(exc))
+                        self.file_failed.emit(record.get("id"), str(exc))
+                        continue
+                    summary["loaded"] += 1
+                    self.file_loaded.emit(entry)
+        self.finished.emit(summary)
@@ -1,8 +1,12 @@
 """Path validation and local file writing utilities."""
 
+from __future__ import annotations
+
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
+from controller.atomic_writer import FSYNC_FILE, atomic_writer, write_result
 from model import fehlertyp
 from model.pfad_validator import pfad_validator
 
@@ -15,9 +19,10 @@ class pfad_result:
 
 class datei_manager:
     """Validates target folders and writes downloaded files to disk."""
-    def __init__(self, validator: pfad_validator):
+    def __init__(self, validator: pfad_validator, fsync_policy: str = FSYNC_FILE):
         self._validator = validator
         self._zielpfad: Path | None = None
+        self.fsync_policy = fsync_policy
 
     def setze_und_pruefe_pfad(self, pfad_str: str) -> pfad_result:
         p = Path(pfad_str).expanduser().resolve()
@@ -43,7 +48,20 @@ class datei_manager:
         return self._zielpfad
 
     def speichere_datei(self, rel_name: str, data: bytes) -> Path:
+        return self.schreibe_datei(rel_name, [data]).pfad
+
+    def schreibe_datei(self, rel_name: str, chunks: Iterable[bytes]) -> write_result:
+        """Stream chunks into the target folder and replace the file atomically.
+
+        Args:
+            rel_name (str): File name relative to the validated target folder.
+            chunks (Iterable[bytes]): Content, written and hashed chunk by chunk.
+
+        Returns:
+            write_result: Final path with SHA-256 and size of the written bytes.
+        """
         ziel = self.get_zielpfad() / rel_name
-        ziel.parent.mkdir(parents=True, exist_ok=True)
-        ziel.write_bytes(data)
-        return ziel
+        with atomic_writer(ziel, fsync_policy=self.fsync_policy) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+            return writer.commit()
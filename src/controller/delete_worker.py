@@ -0,0 +1,134 @@
+"""Background worker that deletes several remote files at once."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from controller.backend_client import backend_client, status_error_message
+
+
+class delete_worker(QObject):
+    """Deletes files via a bulk endpoint or bounded parallel single calls."""
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(dict)
+
+    def __init__(
+        self,
+        *,
+        api_client: backend_client,
+        auth_token: str,
+        file_ids: list,
+        max_workers: int,
+        bulk_path: str | None = None,
+    ):
+        super().__init__()
+        self.api_client = api_client
+        self.auth_token = auth_token
+        self.file_ids = list(file_ids)
+        self.max_workers = max(1, int(max_workers))
+        self.bulk_path = bulk_path
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        """Delete all files and emit one aggregated summary.
+
+        Returns:
+            None
+        """
+        summary = {
+            "total": len(self.file_ids),
+            "deleted": [],
+            "errors": [],
+            "session_expired": False,
+            "bulk": False,
+        }
+        self.progress.emit(0, summary["total"])
+        pending = self.file_ids
+        if self.bulk_path and pending:
+            pending = self._delete_bulk(pending, summary)
+        if pending:
+            self._delete_each(pending, summary)
+        self.finished.emit(summary)
+
+    def _delete_bulk(self, file_ids: list, summary: dict) -> list:
+        # Returns the ids that still need per-file calls.
+        try:
+            resp = self.api_client.post(
+                self.bulk_path,
+                token=self.auth_token,
+                json={"ids": file_ids},
+                timeout=60,
+            )
+        except requests.RequestException:
+            return file_ids
+
+        if resp.status_code in (404, 405, 501):
+            # Advertised but not actually available; fall back silently.
+            return file_ids
+        if resp.status_code == 401:
+            summary["session_expired"] = True
+            return []
+        if resp.status_code >= 400:
+            summary["errors"].append(
+                status_error_message(
+                    resp.status_code, f"Loeschen fehlgeschlagen (HTTP {resp.status_code})."
+                )
+            )
+            return []
+
+        try:
+            payload = resp.json() or {}
+        except ValueError:
+            payload = {}
+        summary["bulk"] = True
+        deleted = payload.get("deleted")
+        summary["deleted"].extend(file_ids if deleted is None else deleted)
+        for failure in payload.get("failed") or []:
+            summary["errors"].append(
+                f"Loeschen fehlgeschlagen ({failure.get('id')}): {failure.get('detail', '')}".strip()
+            )
+        self.progress.emit(summary["total"], summary["total"])
+        return []
+
+    def _delete_each(self, file_ids: list, summary: dict):
+        total = summary["total"]
+        done = total - len(file_ids)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self._delete_one, file_id) for file_id in file_ids]
+            for future in as_completed(futures):
+                file_id, status_code, error = future.result()
+                done += 1
+                if status_code == 401:
+                    summary["session_expired"] = True
+                elif error:
+                    summary["errors"].append(error)
+                elif status_code is not None:
+                    summary["deleted"].append(file_id)
+                self.progress.emit(done, total)
+
+    def _delete_one(self, file_id) -> tuple:
+        if self._cancel.is_set():
+            return file_id, None, ""
+        try:
+            resp = self.api_client.delete(
+                f"/files/{file_id}",
+                token=self.auth_token,
+                timeout=30,
+            )
+        except requests.RequestException as exc:
+            return file_id, None, f"Loeschen fehlgeschlagen: {exc}"
+
+        if resp.status_code == 401:
+            # The remaining calls would fail the same way.
+            self._cancel.set()
+            return file_id, 401, ""
+        if resp.status_code >= 400:
+            return file_id, resp.status_code, status_error_message(
+                resp.status_code, f"Loeschen fehlgeschlagen (HTTP {resp.status_code})."
+            )
+        return file_id, resp.status_code, ""
@@ -0,0 +1,118 @@
+"""Size-bounded directory of blobs evicted in least-recently-used order."""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from controller.atomic_writer import FSYNC_NONE, atomic_writer
+
+
+class disk_lru:
+    """Stores one file per key and evicts the least recently used beyond ``max_bytes``.
+
+    The in-memory index mirrors the directory in access order and is built
+    lazily from file mtimes, which are bumped on every read. All operations
+    hold one lock, so a store can be shared across worker threads.
+    """
+
+    def __init__(self, directory: Path, *, suffix: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.max_bytes = max(0, int(max_bytes))
+        self.lock = threading.RLock()
+        self._index: OrderedDict[str, int] | None = None
+        self._bytes = 0
+        self.evictions = 0
+
+    def read(self, key: str) -> bytes | None:
+        with self.lock:
+            index = self._load_index()
+            if key not in index:
+                return None
+            path = self._path_for(key)
+            try:
+                data = path.read_bytes()
+            except OSError:
+                self.drop(key)
+                return None
+            index.move_to_end(key)
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return data
+
+    def write(self, key: str, data: bytes) -> bool:
+        """Store ``data`` atomically and evict old entries beyond the size cap.
+
+        Args:
+            key (str): File-name-safe key.
+            data (bytes): Blob to store.
+
+        Returns:
+            bool: False if the blob could not be written.
+        """
+        with self.lock:
+            index = self._load_index()
+            try:
+                writer = atomic_writer(self._path_for(key), fsync_policy=FSYNC_NONE)
+                with writer:
+                    writer.write(data)
+                    writer.commit()
+            except OSError:
+                return False
+            self._bytes -= index.pop(key, 0)
+            index[key] = len(data)
+            self._bytes += len(data)
+            self._evict()
+            return True
+
+    def drop(self, key: str):
+        with self.lock:
+            index = self._load_index()
+            self._bytes -= index.pop(key, 0)
+            try:
+                self._path_for(key).unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def keys(self) -> list[str]:
+        with self.lock:
+            return list(self._load_index())
+
+    def clear(self):
+        with self.lock:
+            for key in self.keys():
+                self.drop(key)
+
+    def size(self) -> tuple[int, int]:
+        with self.lock:
+            index = self._load_index()
+            return len(index), self._bytes
+
+    def _path_for(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._index is not None:
+            return self._index
+        entries = []
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for path in self.directory.glob(f"*{self.suffix}"):
+                stat = path.stat()
+                key = path.name[: -len(self.suffix)]
+                entries.append((stat.st_mtime, key, stat.st_size))
+        except OSError:
+            entries = []
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._bytes = sum(self._index.values())
+        self._evict()
+        return self._index
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._index:
+            self.drop(next(iter(self._index)))
+            self.evictions += 1
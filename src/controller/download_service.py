@@ -0,0 +1,235 @@
+"""Resumable file downloads into partial files with atomic finalization."""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+
+from controller.atomic_writer import FSYNC_FILE, atomic_writer
+from controller.backend_client import backend_client, status_error_message
+from controller.sync_manifest import sync_manifest
+
+PART_SUFFIX = ".part"
+CHUNK_SIZE = 8192
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+_UNSATISFIED_RANGE = re.compile(r"bytes\s+\*/(\d+)")
+
+
+@dataclass(frozen=True)
+class download_result:
+    ok: bool
+    pfad: Path | None = None
+    status_code: int | None = None
+    msg: str = ""
+    sha256: str | None = None
+
+
+def part_path(dest: Path) -> Path:
+    return dest.with_name(dest.name + PART_SUFFIX)
+
+
+def download_file(
+    api_client: backend_client,
+    *,
+    token: str | None,
+    file_id,
+    dest: Path,
+    timeout: float,
+    max_resumes: int = 3,
+    fsync_policy: str = FSYNC_FILE,
+    interactive: bool = False,
+) -> download_result:
+    """Stream a backend file into ``dest`` and resume interrupted transfers.
+
+    Data is written to ``<dest>.part``. Interrupted transfers continue from
+    the bytes already on disk via ``Range`` requests, and ``dest`` only
+    appears through an atomic rename once the expected length is verified.
+    Bytes go through an ``atomic_writer``, which hashes them on the fly.
+
+    Args:
+        api_client (backend_client): Shared backend client.
+        token (str | None): Bearer token for the request.
+        file_id: Backend file identifier.
+        dest (Path): Final file path.
+        timeout (float): Per-request timeout in seconds.
+        max_resumes (int): Extra attempts after an interrupted transfer.
+        fsync_policy (str): One of ``atomic_writer.FSYNC_POLICIES``.
+        interactive (bool): Called on the UI thread; no retries or rate limiting.
+
+    Returns:
+        download_result: Outcome including the HTTP status on failure.
+    """
+    part = part_path(dest)
+    try:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+    except OSError as exc:
+        return download_result(False, None, None, f"Datei konnte nicht gespeichert werden: {exc}")
+
+    last_error = ""
+    for _ in range(max(max_resumes, 0) + 1):
+        offset = part.stat().st_size if part.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            resp = api_client.get(
+                f"/files/{file_id}/download",
+                token=token,
+                timeout=timeout,
+                stream=True,
+                headers=headers,
+                interactive=interactive,
+            )
+        except requests.RequestException as exc:
+            last_error = f"Download fehlgeschlagen: {exc}"
+            continue
+
+        with resp:
+            if resp.status_code == 416 and offset:
+                # The partial file may already hold every byte; otherwise start over.
+                match = _UNSATISFIED_RANGE.match(resp.headers.get("Content-Range", ""))
+                if match and int(match.group(1)) == offset:
+                    try:
+                        writer = atomic_writer(
+                            dest, temp=part, resume=True, fsync_policy=fsync_policy
+                        )
+                    except OSError as exc:
+                        return download_result(
+                            False, None, None, f"Datei konnte nicht gespeichert werden: {exc}"
+                        )
+                    with writer:
+                        return _commit(writer, resp.status_code)
+                part.unlink(missing_ok=True)
+                continue
+
+            if resp.status_code not in (200, 206):
+                return download_result(
+                    False,
+                    None,
+                    resp.status_code,
+                    status_error_message(
+                        resp.status_code, f"Download fehlgeschlagen (HTTP {resp.status_code})."
+                    ),
+                )
+
+            expected = None
+            if resp.status_code == 206:
+                match = _CONTENT_RANGE.match(resp.headers.get("Content-Range", ""))
+                if match is None or int(match.group(1)) != offset:
+                    part.unlink(missing_ok=True)
+                    last_error = "Download fehlgeschlagen: ungueltige Content-Range."
+                    continue
+                if match.group(3) != "*":
+                    expected = int(match.group(3))
+            else:
+                # Server ignored the Range header and resent the whole file.
+                offset = 0
+                length = resp.headers.get("Content-Length")
+                expected = int(length) if length and length.isdigit() else None
+
+            try:
+                writer = atomic_writer(
+                    dest, temp=part, resume=bool(offset), fsync_policy=fsync_policy
+                )
+            except OSError as exc:
+                return download_result(
+                    False, None, None, f"Datei konnte nicht gespeichert werden: {exc}"
+                )
+            with writer:
+                try:
+                    for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                        if chunk:
+                            writer.write(chunk)
+                except requests.RequestException as exc:
+                    last_error = f"Download fehlgeschlagen: {exc}"
+                    continue
+                except OSError as exc:
+                    return download_result(
+                        False, None, None, f"Datei konnte nicht gespeichert werden: {exc}"
+                    )
+
+                if expected is not None and writer.size != expected:
+                    last_error = f"Download unvollstaendig ({writer.size} von {expected} Bytes)."
+                    if writer.size > expected:
+                        writer.discard()
+                    continue
+                return _commit(writer, resp.status_code)
+
+    return download_result(False, None, None, last_error or "Download fehlgeschlagen.")
+
+
+def ensure_local_copy(
+    api_client: backend_client,
+    *,
+    token: str | None,
+    record: dict,
+    manifest: sync_manifest,
+    timeout: float,
+    fsync_policy: str = FSYNC_FILE,
+    interactive: bool = False,
+) -> download_result:
+    """Return the local copy of a record, downloading only when it is missing or stale.
+
+    A copy counts as current when the manifest's size and ``updated_at``
+    match the record and the file on disk still has the recorded size. Fresh
+    downloads are registered in the manifest, so every caller shares one copy;
+    concurrent callers for the same file wait for the first download.
+
+    Args:
+        api_client (backend_client): Shared backend client.
+        token (str | None): Bearer token for the request.
+        record (dict): Normalized remote file record.
+        manifest (sync_manifest): Manifest of the download directory.
+        timeout (float): Per-request timeout in seconds.
+        fsync_policy (str): One of ``atomic_writer.FSYNC_POLICIES``.
+        interactive (bool): Called on the UI thread; no retries or rate limiting.
+
+    Returns:
+        download_result: Outcome with ``pfad`` set to the local copy on success.
+    """
+    dest, state = manifest.resolve(record)
+    if state == "current" and _matches_size(dest, record.get("size")):
+        return download_result(ok=True, pfad=dest)
+    with manifest.download_lock(dest):
+        # Another thread may have fetched the file while this one waited for the lock.
+        dest, state = manifest.resolve(record)
+        if state == "current" and _matches_size(dest, record.get("size")):
+            return download_result(ok=True, pfad=dest)
+        if state == "adopt":
+            # A copy cached before the manifest existed; keep it instead of downloading.
+            manifest.adopt([(record, dest)])
+            manifest.save()
+            return download_result(ok=True, pfad=dest)
+        if state == "update":
+            part_path(dest).unlink(missing_ok=True)
+        result = download_file(
+            api_client,
+            token=token,
+            file_id=record.get("id"),
+            dest=dest,
+            timeout=timeout,
+            fsync_policy=fsync_policy,
+            interactive=interactive,
+        )
+        if result.ok:
+            manifest.record_download(record, dest, result.sha256)
+            manifest.save()
+    return result
+
+
+def _matches_size(path: Path, size) -> bool:
+    try:
+        actual = path.stat().st_size
+    except OSError:
+        return False
+    return size is None or not str(size).isdigit() or actual == int(size)
+
+
+def _commit(writer: atomic_writer, status_code: int) -> download_result:
+    try:
+        written = writer.commit()
+    except OSError as exc:
+        return download_result(
+            False, None, status_code, f"Datei konnte nicht gespeichert werden: {exc}"
+        )
+    return download_result(True, written.pfad, status_code, sha256=written.sha256)
@@ -3,12 +3,14 @@
 from datetime import datetime
 from pathlib import Path
 
-import requests
 from PyQt6.QtCore import QUrl
 from PyQt6.QtGui import QDesktopServices
 
+from controller.atomic_writer import fsync_policy
+from controller.download_service import download_file, download_result, ensure_local_copy
 from controller.file_path_service import resolve_download_dir
 from controller.file_utils import format_date, format_size
+from controller.sync_manifest import sync_manifest
 
 
 class file_access_flow:
@@ -44,48 +46,17 @@ class file_access_flow:
         if not save_path:
             return
 
-        try:
-            resp = requests.get(
-                f"{self.controller.api_base_url}/files/{file_id}/download",
-                headers={"Authorization": f"Bearer {self.controller.auth_token}"},
-                timeout=30,
-                stream=True,
-            )
-        except requests.RequestException as exc:
-            self.controller.datei_liste_view.show_error(f"Download fehlgeschlagen: {exc}")
-            return
-
-        if resp.status_code == 200:
-            try:
-                with open(save_path, "wb") as handle:
-                    for chunk in resp.iter_content(chunk_size=8192):
-                        if chunk:
-                            handle.write(chunk)
-            except OSError as exc:
-                self.controller.datei_liste_view.show_error(
-                    f"Datei konnte nicht gespeichert werden: {exc}"
-                )
-                return
-            return
-
-        if resp.status_code == 401:
-            self.controller.datei_liste_view.show_error(
-                "Sitzung abgelaufen. Bitte erneut einloggen."
-            )
-            self.controller.stack.setCurrentWidget(self.controller.login_view)
-            return
-
-        if resp.status_code == 403:
-            self.controller.datei_liste_view.show_error("Kein Zugriff auf diese Datei.")
-            return
-
-        if resp.status_code == 404:
-            self.controller.datei_liste_view.show_error("Datei nicht gefunden.")
-            return
-
-        self.controller.datei_liste_view.show_error(
-            f"Download fehlgeschlagen (HTTP {resp.status_code})."
+        result = download_file(
+            self.controller.api_client,
+            token=self.controller.auth_token,
+            file_id=file_id,
+            dest=Path(save_path),
+            timeout=30,
+            fsync_policy=fsync_policy(self.controller.settings),
+            interactive=True,
         )
+        if not result.ok:
+            self._show_download_error(result)
 
     def on_file_open_requested(self, row: int):
         if not self.controller.auth_token:
@@ -120,9 +91,11 @@ class file_access_flow:
         safe_name = Path(name).name or (f"file_{file_id}" if file_id is not None else "")
         if not safe_name:
             return {}
-        local_path = target_dir / safe_name
-        if not local_path.exists():
-            return {}
+        local_path = None
+        if file_id is not None:
+            local_path = sync_manifest.for_directory(target_dir).local_path(file_id)
+        if local_path is None:
+            local_path = target_dir / safe_name
         try:
             stat = local_path.stat()
         except OSError:
@@ -141,60 +114,27 @@ class file_access_flow:
         if target is None:
             return None
         file_id = record.get("id")
-        name = record.get("name") or ""
-        safe_name = Path(name).name or (f"file_{file_id}" if file_id is not None else "")
-        if not safe_name:
+        if file_id is None:
             self.controller.datei_liste_view.show_error(
                 "Ausgewaehlter Eintrag hat keine Datei-ID."
             )
             return None
-        dest = target / safe_name
-        if dest.exists():
-            # Reuse cached files to avoid redundant downloads.
-            return dest
 
-        try:
-            resp = requests.get(
-                f"{self.controller.api_base_url}/files/{file_id}/download",
-                headers={"Authorization": f"Bearer {self.controller.auth_token}"},
-                timeout=60,
-                stream=True,
-            )
-        except requests.RequestException as exc:
-            self.controller.datei_liste_view.show_error(f"Download fehlgeschlagen: {exc}")
+        result = ensure_local_copy(
+            self.controller.api_client,
+            token=self.controller.auth_token,
+            record=record,
+            manifest=sync_manifest.for_directory(target),
+            timeout=60,
+            fsync_policy=fsync_policy(self.controller.settings),
+            interactive=True,
+        )
+        if not result.ok:
+            self._show_download_error(result)
             return None
+        return result.pfad
 
-        if resp.status_code == 401:
-            self.controller.datei_liste_view.show_error(
-                "Sitzung abgelaufen. Bitte erneut einloggen."
-            )
+    def _show_download_error(self, result: download_result):
+        self.controller.datei_liste_view.show_error(result.msg)
+        if result.status_code == 401:
             self.controller.stack.setCurrentWidget(self.controller.login_view)
-            return None
-
-        if resp.status_code == 403:
-            self.controller.datei_liste_view.show_error("Kein Zugriff auf diese Datei.")
-            return None
-
-        if resp.status_code == 404:
-            self.controller.datei_liste_view.show_error("Datei nicht gefunden.")
-            return None
-
-        if resp.status_code != 200:
-            self.controller.datei_liste_view.show_error(
-                f"Download fehlgeschlagen (HTTP {resp.status_code})."
-            )
-            return None
-
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            with open(dest, "wb") as handle:
-                for chunk in resp.iter_content(chunk_size=8192):
-                    if chunk:
-                        handle.write(chunk)
-        except OSError as exc:
-            self.controller.datei_liste_view.show_error(
-                f"Datei konnte nicht gespeichert werden: {exc}"
-            )
-            return None
-
-        return dest
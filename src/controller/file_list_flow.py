@@ -2,6 +2,7 @@
 
 import requests
 
+from controller.backend_client import SESSION_EXPIRED_MESSAGE
 from controller.file_utils import (
     file_extension,
     format_date,
@@ -10,11 +11,14 @@ from controller.file_utils import (
     parse_iso_datetime,
 )
 
+BULK_DELETE_HEADER = "X-Bulk-Delete"
+
 
 class file_list_flow:
     """Handles listing, sorting, and filtering remote files."""
     def __init__(self, controller):
         self.controller = controller
+        self._listing_cache = None
 
     def load_files_and_show(self):
         """Fetch file list from the API and refresh the UI state.
@@ -26,37 +30,61 @@ class file_list_flow:
             self.controller.login_view.show_error("Bitte zuerst einloggen.")
             return
 
-        try:
-            resp = requests.get(
-                f"{self.controller.api_base_url}/files/",
-                headers={"Authorization": f"Bearer {self.controller.auth_token}"},
-                timeout=10,
-            )
-        except requests.RequestException as exc:
-            self.controller.login_view.show_error(
-                f"Dateiliste konnte nicht geladen werden: {exc}"
-            )
+        cache = self._listing_cache
+        if cache is not None and cache["token"] != self.controller.auth_token:
+            cache = None
+        headers = {}
+        if cache is not None:
+            if cache["etag"]:
+                headers["If-None-Match"] = cache["etag"]
+            if cache["last_modified"]:
+                headers["If-Modified-Since"] = cache["last_modified"]
+
+        resp = self.request_listing(headers)
+        if resp is None:
+            return
+        if resp.status_code == 304 and cache is None:
+            # Nothing cached to reuse (e.g. dropped after a token change); ask for the body.
+            resp = self.request_listing({"Cache-Control": "no-cache"})
+            if resp is None:
+                return
+
+        if resp.status_code in (200, 304):
+            # Backends that support batch deletes advertise the endpoint on the listing.
+            self.controller.bulk_delete_path = resp.headers.get(BULK_DELETE_HEADER) or None
+
+        if resp.status_code == 304:
+            # Listing unchanged: keep the normalized records and skip view rebuild and sync.
+            records = cache["records"] if cache is not None else self.controller.file_records
+            if self.controller.file_records is not records:
+                self.controller.file_records = records
+                self.refresh_file_list_view()
+                self.controller.file_mutation_flow.sync_files_to_folder()
+            self.reset_chat_state()
+            self.controller.stack.setCurrentWidget(self.controller.datei_liste_view)
             return
 
         if resp.status_code == 200:
             data = resp.json()
             self.controller.file_records = normalize_file_records(data)
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            self._listing_cache = None
+            if etag or last_modified:
+                self._listing_cache = {
+                    "token": self.controller.auth_token,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "records": self.controller.file_records,
+                }
             self.refresh_file_list_view()
-            self.controller.chat_messages = []
-            self.controller.current_chat_id = None
-            self.controller.chat_file_context = []
-            self.controller.chat_file_meta = []
-            self.controller.chat_view.clear_chat()
-            self.controller.chat_view.clear_chat_input()
-            self.controller.chat_view.set_selected_files([])
+            self.reset_chat_state()
             self.controller.file_mutation_flow.sync_files_to_folder()
             self.controller.stack.setCurrentWidget(self.controller.datei_liste_view)
             return
 
         if resp.status_code == 401:
-            self.controller.login_view.show_error(
-                "Sitzung abgelaufen. Bitte erneut einloggen."
-            )
+            self.controller.login_view.show_error(SESSION_EXPIRED_MESSAGE)
             self.controller.stack.setCurrentWidget(self.controller.login_view)
             return
 
@@ -64,6 +92,39 @@ class file_list_flow:
             f"Dateiliste konnte nicht geladen werden (HTTP {resp.status_code})."
         )
 
+    def request_listing(self, headers: dict):
+        """GET the file listing, reporting transport errors in the login view.
+
+        Args:
+            headers (dict): Extra request headers, e.g. conditional validators.
+
+        Returns:
+            requests.Response | None: The response, or None if the request failed.
+        """
+        try:
+            return self.controller.api_client.get(
+                "/files/",
+                token=self.controller.auth_token,
+                headers=headers,
+                timeout=10,
+                interactive=True,
+            )
+        except requests.RequestException as exc:
+            self.controller.login_view.show_error(
+                f"Dateiliste konnte nicht geladen werden: {exc}"
+            )
+            return None
+
+    def reset_chat_state(self):
+        self.controller.chat_core_flow.reset_session()
+        self.controller.chat_messages = []
+        self.controller.current_chat_id = None
+        self.controller.chat_file_context = []
+        self.controller.chat_file_meta = []
+        self.controller.chat_view.clear_chat()
+        self.controller.chat_view.clear_chat_input()
+        self.controller.chat_view.set_selected_files([])
+
     def sorted_file_records(self, records: list[dict]) -> list[dict]:
         mode = self.controller.file_sort_mode
         sorted_records = list(records)
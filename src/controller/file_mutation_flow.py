@@ -2,16 +2,27 @@
 
 from pathlib import Path
 
-import requests
+from PyQt6.QtCore import QThread
 from PyQt6.QtWidgets import QMessageBox
 
+from controller.atomic_writer import fsync_policy
+from controller.backend_client import SESSION_EXPIRED_MESSAGE
+from controller.delete_worker import delete_worker
+from controller.download_service import part_path
 from controller.file_path_service import resolve_download_dir
+from controller.file_utils import format_size
+from controller.sync_manifest import sync_manifest
+from controller.sync_worker import sync_worker
+from controller.upload_worker import upload_worker
 
 
 class file_mutation_flow:
     """Handles mutating file operations against the backend API."""
     def __init__(self, controller):
         self.controller = controller
+        self._sync_rerun_pending = False
+        self._delete_errors: list[str] = []
+        self._upload_queue: list[str] = []
 
     def on_upload_clicked(self):
         if not self.controller.auth_token:
@@ -19,41 +30,98 @@ class file_mutation_flow:
             return
 
         default_dir = self.controller.settings.value("files/default_dir", "", type=str)
-        path = self.controller.datei_liste_view.prompt_open_file(default_dir)
-        if not path:
+        paths = self.controller.datei_liste_view.prompt_open_files(default_dir)
+        if not paths:
             return
+        self.enqueue_uploads(paths)
 
+    def enqueue_uploads(self, paths: list[str]):
+        """Queue files for upload and start the worker when it is idle.
+
+        Args:
+            paths (list[str]): Local file paths to upload.
+
+        Returns:
+            None
+        """
+        self._upload_queue.extend(paths)
+        if self.controller._upload_thread is not None and self.controller._upload_thread.isRunning():
+            # Picked up by on_upload_thread_finished once the current batch is done.
+            return
+        self.start_upload_worker()
+
+    def start_upload_worker(self):
+        paths, self._upload_queue = self._upload_queue, []
+        thread = QThread()
+        worker = upload_worker(
+            api_client=self.controller.api_client,
+            auth_token=self.controller.auth_token or "",
+            paths=paths,
+            max_workers=self.upload_concurrency(),
+        )
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.on_upload_progress)
+        worker.file_finished.connect(self.on_upload_file_finished)
+        worker.finished.connect(self.on_upload_finished)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(self.on_upload_thread_finished)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(worker.deleteLater)
+        self.controller._upload_thread = thread
+        self.controller._upload_worker = worker
+        thread.start()
+
+    def upload_concurrency(self) -> int:
+        value = self.controller.settings.value("files/upload_concurrency", 3, type=int)
         try:
-            with open(path, "rb") as handle:
-                resp = requests.post(
-                    f"{self.controller.api_base_url}/files/upload",
-                    headers={"Authorization": f"Bearer {self.controller.auth_token}"},
-                    files={"file": handle},
-                    timeout=60,
-                )
-        except requests.RequestException as exc:
-            self.controller.datei_liste_view.show_error(f"Upload fehlgeschlagen: {exc}")
-            return
-        except OSError as exc:
-            self.controller.datei_liste_view.show_error(
-                f"Datei konnte nicht gelesen werden: {exc}"
+            return min(max(int(value), 1), 8)
+        except (TypeError, ValueError):
+            return 3
+
+    def on_upload_progress(self, sent: int, total: int, rate: float):
+        # Scale to permille; QProgressBar ranges are 32-bit.
+        done = sent * 1000 // total if total else 0
+        self.controller.datei_liste_view.set_upload_progress(done, 1000 if total else 0)
+        if total and sent < total:
+            self.controller.datei_liste_view.set_upload_status(
+                f"Upload: {format_size(sent)} von {format_size(total)} "
+                f"({format_size(int(rate))}/s)"
             )
+
+    def on_upload_file_finished(self, result: dict):
+        record = result.get("record")
+        if not record:
             return
+        records = [r for r in self.controller.file_records if r.get("id") != record.get("id")]
+        records.append(record)
+        self.controller.file_records = records
+        self.controller.file_list_flow.refresh_file_list_view()
 
-        if resp.status_code == 401:
-            self.controller.datei_liste_view.show_error(
-                "Sitzung abgelaufen. Bitte erneut einloggen."
-            )
+    def on_upload_finished(self, summary: dict):
+        self.controller.datei_liste_view.set_upload_status("")
+        if summary.get("session_expired"):
+            self._upload_queue = []
+            self.controller.datei_liste_view.show_error(SESSION_EXPIRED_MESSAGE)
             self.controller.stack.setCurrentWidget(self.controller.login_view)
             return
 
-        if resp.status_code >= 400:
-            self.controller.datei_liste_view.show_error(
-                f"Upload fehlgeschlagen (HTTP {resp.status_code})."
-            )
-            return
+        if summary.get("missing_records"):
+            # The backend did not describe the new files; fall back to one listing reload.
+            self.controller.file_list_flow.load_files_and_show()
+        elif summary.get("uploaded"):
+            self.sync_files_to_folder()
+        errors = summary.get("errors") or []
+        if errors:
+            self.controller.datei_liste_view.show_error("\n".join(errors))
 
-        self.controller.file_list_flow.load_files_and_show()
+    def on_upload_thread_finished(self):
+        if self.controller._upload_thread is not None:
+            self.controller._upload_thread.wait()
+        self.controller._upload_thread = None
+        self.controller._upload_worker = None
+        if self._upload_queue:
+            self.start_upload_worker()
 
     def on_delete_clicked(self):
         if not self.controller.auth_token:
@@ -98,47 +166,91 @@ class file_mutation_flow:
         if confirm != QMessageBox.StandardButton.Yes:
             return
 
+        if self.controller._delete_thread is not None and self.controller._delete_thread.isRunning():
+            self.controller.datei_liste_view.show_error("Es laeuft bereits ein Loeschvorgang.")
+            return
+
         errors: list[str] = []
+        file_ids = []
         for record in records:
             file_id = record.get("id")
             if file_id is None:
                 errors.append("Ausgewaehlter Eintrag hat keine Datei-ID.")
                 continue
-            try:
-                resp = requests.delete(
-                    f"{self.controller.api_base_url}/files/{file_id}",
-                    headers={"Authorization": f"Bearer {self.controller.auth_token}"},
-                    timeout=30,
-                )
-            except requests.RequestException as exc:
-                errors.append(f"Loeschen fehlgeschlagen: {exc}")
-                continue
+            file_ids.append(file_id)
 
-            if resp.status_code == 401:
-                self.controller.datei_liste_view.show_error(
-                    "Sitzung abgelaufen. Bitte erneut einloggen."
-                )
-                self.controller.stack.setCurrentWidget(self.controller.login_view)
-                return
+        if not file_ids:
+            self.controller.datei_liste_view.show_error("\n".join(errors))
+            return
+        self._delete_errors = errors
+        self.start_delete_worker(file_ids)
 
-            if resp.status_code == 403:
-                errors.append("Kein Zugriff auf diese Datei.")
-                continue
+    def start_delete_worker(self, file_ids: list):
+        """Delete files in a worker thread and refresh the list once at the end.
 
-            if resp.status_code == 404:
-                errors.append("Datei nicht gefunden.")
-                continue
+        Args:
+            file_ids (list): Backend ids of the files to delete.
 
-            if resp.status_code >= 400:
-                errors.append(f"Loeschen fehlgeschlagen (HTTP {resp.status_code}).")
-                continue
+        Returns:
+            None
+        """
+        thread = QThread()
+        worker = delete_worker(
+            api_client=self.controller.api_client,
+            auth_token=self.controller.auth_token or "",
+            file_ids=file_ids,
+            max_workers=self.delete_concurrency(),
+            bulk_path=self.controller.bulk_delete_path,
+        )
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.on_delete_progress)
+        worker.finished.connect(self.on_delete_finished)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(self.on_delete_thread_finished)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(worker.deleteLater)
+        self.controller._delete_thread = thread
+        self.controller._delete_worker = worker
+        thread.start()
+
+    def delete_concurrency(self) -> int:
+        value = self.controller.settings.value("files/delete_concurrency", 8, type=int)
+        try:
+            return min(max(int(value), 1), 16)
+        except (TypeError, ValueError):
+            return 8
+
+    def on_delete_progress(self, done: int, total: int):
+        self.controller.datei_liste_view.set_delete_progress(done, total)
+        self.controller.datei_liste_view.set_delete_status(
+            f"Loeschen: {done} von {total}" if done < total else ""
+        )
+
+    def on_delete_finished(self, summary: dict):
+        self.controller.datei_liste_view.set_delete_status("")
+        errors = self._delete_errors + list(summary.get("errors") or [])
+        self._delete_errors = []
+        if summary.get("session_expired"):
+            self.controller.datei_liste_view.show_error(SESSION_EXPIRED_MESSAGE)
+            self.controller.stack.setCurrentWidget(self.controller.login_view)
+            return
 
         self.controller.file_list_flow.load_files_and_show()
         if errors:
             self.controller.datei_liste_view.show_error("\n".join(errors))
 
+    def on_delete_thread_finished(self):
+        if self.controller._delete_thread is not None:
+            self.controller._delete_thread.wait()
+        self.controller._delete_thread = None
+        self.controller._delete_worker = None
+
     def sync_files_to_folder(self):
-        """Best-effort local cache sync for visible files.
+        """Start a background sync that mirrors remote changes into the cache.
+
+        The sync manifest decides which files are new, changed or deleted on
+        the backend, so unchanged files are skipped without touching the disk.
 
         Returns:
             None
@@ -152,51 +264,89 @@ class file_mutation_flow:
             self.controller.datei_liste_view.show_error(f"{res.fehlertyp}: {res.msg}")
             return
 
-        for record in self.controller.file_records:
-            file_id = record.get("id")
-            if file_id is None:
-                continue
-            name = record.get("name") or f"file_{file_id}"
-            safe_name = Path(name).name or f"file_{file_id}"
-            dest = self.controller.datei_manager.get_zielpfad() / safe_name
-            if dest.exists():
-                # Skip already cached files to keep sync cheap.
-                continue
+        if self.controller._sync_thread is not None and self.controller._sync_thread.isRunning():
+            # Re-run once the current pass is done so new records are not missed.
+            self._sync_rerun_pending = True
+            return
 
-            try:
-                resp = requests.get(
-                    f"{self.controller.api_base_url}/files/{file_id}/download",
-                    headers={"Authorization": f"Bearer {self.controller.auth_token}"},
-                    timeout=60,
-                    stream=True,
-                )
-            except requests.RequestException as exc:
-                self.controller.datei_liste_view.show_error(
-                    f"Download fehlgeschlagen: {exc}"
-                )
-                continue
+        manifest = sync_manifest.for_directory(self.controller.datei_manager.get_zielpfad())
+        plan = manifest.plan(self.controller.file_records)
+        manifest.remove_obsolete(plan.delete)
+        manifest.adopt(plan.adopt)
+        for _, dest in plan.update:
+            # A leftover partial file belongs to the old version and must not be resumed.
+            part_path(dest).unlink(missing_ok=True)
+        manifest.save()
 
-            if resp.status_code == 401:
-                self.controller.datei_liste_view.show_error(
-                    "Sitzung abgelaufen. Bitte erneut einloggen."
-                )
-                self.controller.stack.setCurrentWidget(self.controller.login_view)
-                return
-
-            if resp.status_code != 200:
-                self.controller.datei_liste_view.show_error(
-                    f"Download fehlgeschlagen (HTTP {resp.status_code})."
-                )
-                continue
+        if not plan.jobs:
+            return
+        self.start_sync_worker(plan.jobs, manifest)
 
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                with open(dest, "wb") as handle:
-                    for chunk in resp.iter_content(chunk_size=8192):
-                        if chunk:
-                            handle.write(chunk)
-            except OSError as exc:
-                self.controller.datei_liste_view.show_error(
-                    f"Datei konnte nicht gespeichert werden: {exc}"
-                )
-                continue
+    def start_sync_worker(self, jobs: list[tuple[dict, Path]], manifest: sync_manifest):
+        """Run downloads in a worker thread so the list view stays responsive.
+
+        Args:
+            jobs (list[tuple[dict, Path]]): File records paired with their targets.
+            manifest (sync_manifest): Manifest updated after each download.
+
+        Returns:
+            None
+        """
+        thread = QThread()
+        worker = sync_worker(
+            api_client=self.controller.api_client,
+            auth_token=self.controller.auth_token or "",
+            jobs=jobs,
+            max_workers=self.sync_concurrency(),
+            manifest=manifest,
+            fsync_policy=fsync_policy(self.controller.settings),
+        )
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.on_sync_progress)
+        worker.file_finished.connect(self.on_sync_file_finished)
+        worker.finished.connect(self.on_sync_finished)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(self.on_sync_thread_finished)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(worker.deleteLater)
+        self.controller._sync_thread = thread
+        self.controller._sync_worker = worker
+        thread.start()
+
+    def sync_concurrency(self) -> int:
+        value = self.controller.settings.value("files/sync_concurrency", 4, type=int)
+        try:
+            return min(max(int(value), 1), 16)
+        except (TypeError, ValueError):
+            return 4
+
+    def on_sync_progress(self, done: int, total: int):
+        self.controller.datei_liste_view.set_sync_progress(done, total)
+
+    def on_sync_file_finished(self, result: dict):
+        if result.get("ok"):
+            self.controller.datei_liste_view.set_sync_status(
+                f"Synchronisiert: {result.get('name')}"
+            )
+
+    def on_sync_finished(self, summary: dict):
+        self.controller.datei_liste_view.set_sync_status("")
+        if summary.get("session_expired"):
+            self._sync_rerun_pending = False
+            self.controller.datei_liste_view.show_error(SESSION_EXPIRED_MESSAGE)
+            self.controller.stack.setCurrentWidget(self.controller.login_view)
+            return
+        errors = summary.get("errors") or []
+        if errors:
+            self.controller.datei_liste_view.show_error("\n".join(errors))
+
+    def on_sync_thread_finished(self):
+        if self.controller._sync_thread is not None:
+            # finished fires before run() fully returns; drop the last reference only after that.
+            self.controller._sync_thread.wait()
+        self.controller._sync_thread = None
+        self.controller._sync_worker = None
+        if self._sync_rerun_pending:
+            self._sync_rerun_pending = False
+            self.sync_files_to_folder()
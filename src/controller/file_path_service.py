@@ -8,7 +8,7 @@ def resolve_download_dir(settings, view) -> Path | None:
 
     Args:
         settings: QSettings-like object for persisted preferences.
-        view: View instance used to surface errors.
+        view: View instance used to surface errors; None keeps it silent.
 
     Returns:
         Path | None: Resolved directory path or None when unavailable.
@@ -27,5 +27,6 @@ def resolve_download_dir(settings, view) -> Path | None:
         if candidate.exists() and candidate.is_dir():
             return candidate
 
-    view.show_error("Kein gueltiger Download-Ordner gefunden.")
+    if view is not None:
+        view.show_error("Kein gueltiger Download-Ordner gefunden.")
     return None
@@ -1,8 +1,9 @@
 """UI composition root that wires views, flows, and services."""
 
 import sys
+from pathlib import Path
 
-from PyQt6.QtCore import QSettings
+from PyQt6.QtCore import QSettings, QStandardPaths
 from PyQt6.QtWidgets import QApplication, QStackedWidget
 
 from view.menue_view import menue_view
@@ -13,10 +14,20 @@ from view.chat_view import chat_view
 from view.chat_history_view import chat_history_view
 
 from model.pfad_validator import pfad_validator
+from controller.backend_client import backend_client
+from controller.retry_policy import retry_policy, token_bucket
 from controller.datei_manager import datei_manager
+from controller.atomic_writer import fsync_policy
 from controller.backup_manager import backup_manager
 from controller.ki_analyzer import ki_analyzer
+from controller.response_cache import response_cache
+from controller.summarizer import map_reduce_summarizer
 from controller.chat_history_service import chat_history_service
+from controller.chat_request_queue import chat_request_queue
+from controller.chat_worker_pool import chat_worker_pool
+from controller.context_index import context_index
+from controller.text_cache import text_cache
+from controller.pdf_extractor import shutdown_pool
 from controller.user_settings_store import user_settings_store
 
 from controller.auth_flow import auth_flow
@@ -42,20 +53,61 @@ class flow_controller:
         self.visible_file_records = []
         self.file_sort_mode = "Name (A-Z)"
         self.file_search_query = ""
-        self.ki_analyzer = ki_analyzer()
+        self.bulk_delete_path = None
         self.chat_messages = []
         self.current_chat_id = None
         self.is_temp_chat = False
         self.chat_started = False
         self.chat_file_context = []
         self.chat_file_meta = []
+        self.chat_context_index = context_index()
+        self.chat_files_loading = {}
+        self.pending_chat_files = None
+        self.pending_chat_mode = "chat"
+        self.unanswered_chat_sessions = {}
+        self.chat_request_queue = chat_request_queue()
         self.visible_history_entries = []
         self.history_sort_mode = "Datum (neu-alt)"
         self.history_search_query = ""
-        self._chat_thread = None
-        self._chat_worker = None
+        self._sync_thread = None
+        self._sync_worker = None
+        self._delete_thread = None
+        self._delete_worker = None
+        self._upload_thread = None
+        self._upload_worker = None
+        self._context_thread = None
+        self._context_worker = None
         self.settings = QSettings("swe_dhbw", "swe_dhbw")
+        self.api_client = backend_client(
+            self.api_base_url,
+            pool_size=self.settings.value("network/pool_size", 8, type=int),
+            retry=retry_policy(
+                max_attempts=self.settings.value("network/max_attempts", 3, type=int)
+            ),
+            limiter=token_bucket(
+                rate=self.settings.value("network/requests_per_second", 20.0, type=float),
+                capacity=self.settings.value("network/request_burst", 40.0, type=float),
+            ),
+        )
         self.history_service = chat_history_service(self.settings)
+        self.ki_analyzer = ki_analyzer(
+            temperature=self.settings.value("ai/temperature", 0.2, type=float),
+            cache=self._build_response_cache(),
+            pool_size=self.settings.value("ai/connection_pool_size", 8, type=int),
+        )
+        self.text_cache = text_cache(
+            self._app_data_dir() / "text_cache",
+            max_bytes=self.settings.value("ai/text_cache_max_mb", 100, type=int) * 1024 * 1024,
+        )
+        self.summarizer = map_reduce_summarizer(
+            self.ki_analyzer,
+            cache=response_cache(
+                self._app_data_dir() / "summary_cache",
+                max_bytes=self.settings.value("ai/cache_max_mb", 20, type=int) * 1024 * 1024,
+            ),
+            chunk_tokens=self.settings.value("ai/summary_chunk_tokens", 3000, type=int),
+            max_workers=self.settings.value("ai/summary_concurrency", 4, type=int),
+        )
         self.user_settings_store = user_settings_store("swe_dhbw")
 
         self.start_view = menue_view()
@@ -74,7 +126,9 @@ class flow_controller:
         self.stack.addWidget(self.history_view)
 
         self.pfad_validator = pfad_validator()
-        self.datei_manager = datei_manager(self.pfad_validator)
+        self.datei_manager = datei_manager(
+            self.pfad_validator, fsync_policy=fsync_policy(self.settings)
+        )
         self.backup_manager = backup_manager(self.datei_manager)
 
         self.settings_flow = settings_flow(self)
@@ -83,6 +137,14 @@ class flow_controller:
         self.file_access_flow = file_access_flow(self)
         self.file_mutation_flow = file_mutation_flow(self)
         self.chat_core_flow = chat_core_flow(self)
+        self.chat_workers = chat_worker_pool(
+            make_worker=self.chat_core_flow.make_chat_worker,
+            on_delta=self.chat_core_flow.on_request_delta,
+            on_finished=self.chat_core_flow.on_request_finished,
+            on_failed=self.chat_core_flow.on_request_failed,
+            on_progress=self.chat_core_flow.on_request_progress,
+            max_workers=self.settings.value("ai/max_parallel_chats", 3, type=int),
+        )
         self.chat_file_flow = chat_file_flow(self)
         self.history_flow = history_flow(self)
         self.backup_flow = backup_flow(self)
@@ -95,7 +157,27 @@ class flow_controller:
         self.stack.setCurrentWidget(self.start_view)
         self.stack.show()
         self.auth_flow.start_splash()
-        return self.app.exec()
+        exit_code = self.app.exec()
+        self.chat_workers.cancel_all()
+        self.api_client.close()
+        self.ki_analyzer.close()
+        shutdown_pool()
+        return exit_code
+
+    @staticmethod
+    def _app_data_dir() -> Path:
+        return Path(
+            QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+        )
+
+    def _build_response_cache(self) -> response_cache | None:
+        if not self.settings.value("ai/response_cache", True, type=bool):
+            return None
+        return response_cache(
+            self._app_data_dir() / "response_cache",
+            ttl_s=self.settings.value("ai/cache_ttl_hours", 168, type=int) * 3600,
+            max_bytes=self.settings.value("ai/cache_max_mb", 20, type=int) * 1024 * 1024,
+        )
 
     def __setup_connections(self):
         self.login_view.get_btn_login().clicked.connect(self.auth_flow.on_login_clicked)
@@ -144,6 +226,9 @@ class flow_controller:
         self.chat_view.get_btn_send().clicked.connect(
             self.chat_core_flow.on_chat_send_clicked
         )
+        self.chat_view.get_btn_cancel().clicked.connect(
+            self.chat_core_flow.on_chat_cancel_clicked
+        )
         self.chat_view.get_btn_back().clicked.connect(
             self.chat_core_flow.on_chat_back_clicked
         )
@@ -153,6 +238,9 @@ class flow_controller:
         self.chat_view.get_btn_clear_files().clicked.connect(
             self.chat_file_flow.on_chat_clear_files_clicked
         )
+        self.chat_view.get_btn_summarize().clicked.connect(
+            self.chat_core_flow.on_chat_summarize_clicked
+        )
 
         self.history_view.get_btn_open().clicked.connect(
             self.history_flow.on_history_open_clicked
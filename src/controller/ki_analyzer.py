@@ -1,12 +1,22 @@
-"""OpenAI chat client wrapper with retry logic."""
+"""OpenAI chat client wrapper with retry logic and streaming responses."""
 
 from __future__ import annotations
 
+import json
 import os
-import time
+import threading
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from controller.cancellation import cancellation_token, request_cancelled
+from controller.response_cache import cache_key, response_cache
+from controller.retry_policy import circuit_breaker, retry_after_from, retry_policy
+
+# Upstream trouble that counts against the circuit breaker; other 4xx are caller errors.
+UPSTREAM_FAILURE_STATUSES = frozenset({500, 502, 503, 504})
 
 
 class ki_analyzer:
@@ -16,6 +26,13 @@ class ki_analyzer:
     - OPENAI_API_KEY (required)
     - OPENAI_MODEL (optional, default: gpt-4o-mini)
     - OPENAI_BASE_URL (optional, default: https://api.openai.com/v1)
+
+    Mit ``cache`` werden Antworten bei Temperatur 0 wiederverwendet; bei
+    anderen Temperaturen wird der Cache umgangen. Ein ``cancellation_token``
+    bricht laufende Anfragen und Wartezeiten zwischen Wiederholungen ab.
+    Eine Instanz kann von mehreren Chat-Workern gleichzeitig genutzt werden;
+    sie haelt eine Session mit Keep-Alive-Verbindungen und einen Circuit
+    Breaker, der nach wiederholten Serverfehlern sofort abbricht.
     """
 
     def __init__(
@@ -23,16 +40,39 @@ class ki_analyzer:
         max_wiederholungen: int = 3,
         modell: str | None = None,
         timeout_s: float = 60.0,
+        temperature: float = 0.2,
+        cache: response_cache | None = None,
+        pool_size: int = 8,
+        session=None,
+        breaker: circuit_breaker | None = None,
     ):
         self.max_wiederholungen = int(max_wiederholungen)
-        self.aktuelle_iteration = 0
+        # Several chat workers share one analyzer; attempt counts are per thread.
+        self._local = threading.local()
         self.timeout_s = float(timeout_s)
+        self.temperature = float(temperature)
+        self.cache = cache
+        self._retry = retry_policy(max_attempts=self.max_wiederholungen, base_s=0.5, cap_s=8.0)
+        self.breaker = breaker or circuit_breaker(failure_threshold=5, cooldown_s=30.0)
+        self.pool_size = max(1, int(pool_size))
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+        self._metrics_lock = threading.Lock()
+        self._metrics = {"calls": 0, "attempts": 0, "retries": 0, "failures": 0, "rejected": 0}
 
         self._load_dotenv()
         self._api_key = os.getenv("OPENAI_API_KEY", "").strip()
         self._base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
         self._modell = (modell or os.getenv("OPENAI_MODEL") or "gpt-4o-mini").strip()
 
+    @property
+    def aktuelle_iteration(self) -> int:
+        """Attempt number of the calling thread's most recent request."""
+        return getattr(self._local, "iteration", 0)
+
     def _load_dotenv(self) -> None:
         """Load dotenv values to allow local dev without external tooling.
 
@@ -59,15 +99,145 @@ class ki_analyzer:
                 return
             return
 
-    def chat(self, messages: list[dict[str, str]], *, temperature: float = 0.2) -> str:
-        return self._call_openai_chat_messages(messages=messages, temperature=temperature)
+    def chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        temperature: float | None = None,
+        cancellation: cancellation_token | None = None,
+    ) -> str:
+        temperature = self.temperature if temperature is None else float(temperature)
+        key = self._cache_key(messages, temperature)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        text = self._call_openai_chat_messages(
+            messages=messages, temperature=temperature, cancellation=cancellation
+        )
+        if key is not None:
+            self.cache.put(key, text)
+        return text
 
-    def _call_openai_chat_messages(self, *, messages: list[dict[str, str]], temperature: float) -> str:
-        """Send chat messages to the OpenAI API with bounded retry backoff.
+    def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        on_delta: Callable[[str], None],
+        temperature: float | None = None,
+        cancellation: cancellation_token | None = None,
+    ) -> str:
+        """Request a streamed completion and forward text deltas as they arrive.
+
+        Args:
+            messages (list[dict[str, str]]): Chat payload in OpenAI format.
+            on_delta (Callable[[str], None]): Called with each content fragment.
+            temperature (float | None): Sampling temperature; defaults to ``self.temperature``.
+            cancellation (cancellation_token | None): Aborts the request and closes the stream.
+
+        Returns:
+            str: Full assistant response text.
+
+        Raises:
+            ValueError: If the API key is missing.
+            RuntimeError: If the request fails or the stream breaks off.
+            request_cancelled: If ``cancellation`` was triggered.
+        """
+        temperature = self.temperature if temperature is None else float(temperature)
+        key = self._cache_key(messages, temperature)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                on_delta(cached)
+                return cached
+        resp = self._post_chat_completion(
+            self._build_payload(messages, temperature, stream=True),
+            stream=True,
+            cancellation=cancellation,
+        )
+        parts: list[str] = []
+        try:
+            for delta in iter_sse_deltas(resp.iter_lines()):
+                parts.append(delta)
+                on_delta(delta)
+        except (requests.RequestException, AttributeError, ValueError) as exc:
+            # A cancelled stream surfaces as whatever the torn-down socket raises.
+            _raise_if_cancelled(cancellation)
+            if isinstance(exc, requests.RequestException):
+                raise RuntimeError(f"OpenAI stream interrupted: {exc}") from exc
+            raise
+        finally:
+            if cancellation is not None:
+                cancellation.detach(resp)
+            resp.close()
+        # A shut-down socket can also end the stream cleanly without [DONE].
+        _raise_if_cancelled(cancellation)
+        text = "".join(parts)
+        if key is not None:
+            self.cache.put(key, text)
+        return text
+
+    def request_key(
+        self, messages: list[dict[str, str]], *, temperature: float | None = None
+    ) -> str:
+        """Hash model, temperature and messages so callers can cache results themselves.
+
+        Args:
+            messages (list[dict[str, str]]): Chat payload in OpenAI format.
+            temperature (float | None): Sampling temperature; defaults to ``self.temperature``.
+
+        Returns:
+            str: Key in the format of ``response_cache``.
+        """
+        temperature = self.temperature if temperature is None else float(temperature)
+        return cache_key(self._modell, temperature, messages)
+
+    def metrics(self) -> dict:
+        """Return call, retry and connection-reuse counters plus breaker state.
+
+        Returns:
+            dict: calls, attempts, retries, failures, rejected, connections_opened,
+            connections_reused and breaker.
+        """
+        with self._metrics_lock:
+            snapshot = dict(self._metrics)
+        opened, requested = 0, 0
+        for adapter in set(self.session.adapters.values()):
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            for key in list(pools.keys()) if pools is not None else []:
+                pool = pools.get(key)
+                opened += getattr(pool, "num_connections", 0)
+                requested += getattr(pool, "num_requests", 0)
+        snapshot["connections_opened"] = opened
+        snapshot["connections_reused"] = max(0, requested - opened)
+        snapshot["breaker"] = self.breaker.stats()
+        return snapshot
+
+    def close(self):
+        self.session.close()
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats() if self.cache is not None else {}
+
+    def _cache_key(self, messages: list[dict[str, str]], temperature: float) -> str | None:
+        # Sampled answers differ per call; only greedy decoding is safe to replay.
+        if self.cache is None or temperature != 0:
+            return None
+        return cache_key(self._modell, temperature, messages)
+
+    def _call_openai_chat_messages(
+        self,
+        *,
+        messages: list[dict[str, str]],
+        temperature: float,
+        cancellation: cancellation_token | None = None,
+    ) -> str:
+        """Send chat messages to the OpenAI API and return the full answer.
 
         Args:
             messages (list[dict[str, str]]): Chat payload in OpenAI format.
             temperature (float): Sampling temperature for the model.
+            cancellation (cancellation_token | None): Aborts the request.
 
         Returns:
             str: Assistant response text.
@@ -75,6 +245,67 @@ class ki_analyzer:
         Raises:
             ValueError: If the API key is missing.
             RuntimeError: If the API request fails after retries.
+            request_cancelled: If ``cancellation`` was triggered.
+        """
+        # With a token the body is read lazily, so cancelling can interrupt it.
+        resp = self._post_chat_completion(
+            self._build_payload(messages, temperature),
+            stream=cancellation is not None,
+            cancellation=cancellation,
+        )
+        try:
+            data = resp.json()
+            return str(data["choices"][0]["message"]["content"])
+        except (ValueError, KeyError, IndexError, TypeError) as exc:
+            _raise_if_cancelled(cancellation)
+            raise RuntimeError(f"OpenAI API returned an invalid response: {exc}") from exc
+        except (requests.RequestException, AttributeError) as exc:
+            _raise_if_cancelled(cancellation)
+            raise RuntimeError(f"OpenAI API response interrupted: {exc}") from exc
+        finally:
+            if cancellation is not None:
+                cancellation.detach(resp)
+                resp.close()
+
+    def _build_payload(
+        self, messages: list[dict[str, str]], temperature: float, *, stream: bool = False
+    ) -> dict:
+        payload = {
+            "model": self._modell,
+            "messages": messages,
+            "temperature": float(temperature),
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def _post_chat_completion(
+        self,
+        payload: dict,
+        *,
+        stream: bool = False,
+        cancellation: cancellation_token | None = None,
+    ):
+        """POST to /chat/completions, retrying only transient failures.
+
+        Rate limits, 5xx responses and connection errors are retried with
+        jittered backoff; other 4xx responses fail immediately. 5xx responses
+        and transport errors count against the circuit breaker, which rejects
+        calls outright while it is open. The returned response is attached to
+        ``cancellation``.
+
+        Args:
+            payload (dict): Request body.
+            stream (bool): Keep the response body open for incremental reads.
+            cancellation (cancellation_token | None): Aborts the request and backoff waits.
+
+        Returns:
+            requests.Response: Successful response.
+
+        Raises:
+            ValueError: If the API key is missing.
+            RuntimeError: If the API request fails after retries or the circuit is open.
+            request_cancelled: If ``cancellation`` was triggered.
         """
         if not self._api_key:
             raise ValueError(
@@ -86,27 +317,111 @@ class ki_analyzer:
             "Authorization": f"Bearer {self._api_key}",
             "Content-Type": "application/json",
         }
-        payload = {
-            "model": self._modell,
-            "messages": messages,
-            "temperature": float(temperature),
-        }
+        kwargs = {"stream": True} if stream else {}
 
         last_exc: Exception | None = None
-        for attempt in range(1, max(self.max_wiederholungen, 1) + 1):
-            self.aktuelle_iteration = attempt
+        attempts = self._retry.max_attempts
+        delay = 0.0
+        attempt = 0
+        self._count("calls")
+        for attempt in range(1, attempts + 1):
+            self._local.iteration = attempt
+            _raise_if_cancelled(cancellation)
+            if not self.breaker.allow():
+                self._count("rejected")
+                raise RuntimeError(
+                    "OpenAI API temporarily unavailable after repeated failures; "
+                    f"retrying in {self.breaker.retry_in():.0f}s"
+                )
+            self._count("attempts")
+            if attempt > 1:
+                self._count("retries")
             try:
-                resp = requests.post(url, headers=headers, json=payload, timeout=self.timeout_s)
-                if resp.status_code >= 400:
-                    raise RuntimeError(f"OpenAI API HTTP {resp.status_code}: {resp.text}")
-                data = resp.json()
-                return str(data["choices"][0]["message"]["content"])
-            except Exception as exc:  # noqa: BLE001
+                resp = self.session.post(
+                    url, headers=headers, json=payload, timeout=self.timeout_s, **kwargs
+                )
+            except requests.RequestException as exc:
+                _raise_if_cancelled(cancellation)
+                self.breaker.record_failure()
                 last_exc = exc
-                # Exponential backoff (bounded)
-                sleep_s = min(2.0 ** (attempt - 1), 8.0)
-                time.sleep(sleep_s)
+                # A completion has no server-side effect, so POST is safe to repeat.
+                if attempt == attempts or not self._retry.is_retryable_exception(
+                    "POST", exc, idempotent=True
+                ):
+                    break
+                delay = self._retry.next_delay(delay)
+                self._wait(delay, cancellation)
+                continue
 
-        raise RuntimeError(
-            f"OpenAI API call failed after {self.max_wiederholungen} attempts: {last_exc}"
-        )
+            if resp.status_code in UPSTREAM_FAILURE_STATUSES:
+                self.breaker.record_failure()
+            elif resp.status_code != 429:
+                # A rate limit says nothing about upstream health, so it leaves the breaker as is.
+                self.breaker.record_success()
+            if resp.status_code >= 400:
+                last_exc = RuntimeError(f"OpenAI API HTTP {resp.status_code}: {resp.text}")
+                if attempt == attempts or not self._retry.is_retryable_status(
+                    "POST", resp.status_code, idempotent=True
+                ):
+                    break
+                next_delay = self._retry.next_delay(delay, retry_after_from(resp))
+                if next_delay is None:
+                    break
+                delay = next_delay
+                self._wait(delay, cancellation)
+                continue
+
+            if cancellation is not None:
+                cancellation.attach(resp)
+            return resp
+
+        self._count("failures")
+        raise RuntimeError(f"OpenAI API call failed after {attempt} attempts: {last_exc}")
+
+    def _count(self, name: str):
+        with self._metrics_lock:
+            self._metrics[name] += 1
+
+    def _wait(self, delay: float, cancellation: cancellation_token | None):
+        if cancellation is None:
+            self._retry.wait(delay)
+        elif cancellation.wait(delay):
+            raise request_cancelled("Anfrage abgebrochen.")
+
+
+def _raise_if_cancelled(cancellation: cancellation_token | None):
+    if cancellation is not None:
+        cancellation.raise_if_cancelled()
+
+
+def iter_sse_deltas(lines: Iterable[bytes | str]) -> Iterator[str]:
+    """Yield content fragments from an OpenAI server-sent event stream.
+
+    Args:
+        lines (Iterable[bytes | str]): Raw response lines.
+
+    Returns:
+        Iterator[str]: Non-empty ``choices[0].delta.content`` values.
+
+    Raises:
+        RuntimeError: If an event carries an API error.
+    """
+    for raw in lines:
+        line = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        if not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        try:
+            event = json.loads(data)
+        except ValueError:
+            continue
+        if "error" in event:
+            raise RuntimeError(f"OpenAI API stream error: {event['error']}")
+        choices = event.get("choices") or []
+        if not choices:
+            continue
+        content = (choices[0].get("delta") or {}).get("content")
+        if content:
+            yield content
@@ -0,0 +1,181 @@
+"""PDF text extraction split into page ranges across a process pool."""
+
+import io
+import multiprocessing
+import os
+import threading
+import time
+
+from PyPDF2 import PdfReader
+
+DEFAULT_TIMEOUT_S = 120.0
+DEFAULT_MAX_PDF_BYTES = 200 * 1024 * 1024
+DEFAULT_WORKER_MEMORY_BYTES = 1024 * 1024 * 1024
+# Every task re-parses the whole document, so below this page count splitting costs more
+# than it saves; smaller documents run as a single task.
+MIN_PARALLEL_PAGES = 24
+
+_pool = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+# Documents currently waiting on each pool; a retired pool is terminated once its last one leaves.
+_pool_users: dict = {}
+_retired_pools: set = set()
+
+
+def extract_pdf_text(
+    content_bytes: bytes,
+    *,
+    max_workers: int | None = None,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+    max_pdf_bytes: int = DEFAULT_MAX_PDF_BYTES,
+    parallel: bool | None = None,
+) -> list[str]:
+    """Extract page texts, in page order, in memory-limited worker processes.
+
+    Every document runs in the pool, so the deadline and the worker memory
+    limit apply to small documents too; large ones are split into page ranges.
+
+    Args:
+        content_bytes (bytes): Raw PDF document.
+        max_workers (int | None): Pool size; defaults to the CPU count.
+        timeout_s (float): Deadline for the whole document.
+        max_pdf_bytes (int): Documents above this size are rejected.
+        parallel (bool | None): Split into page ranges or run one task; None
+            decides by page count.
+
+    Returns:
+        list[str]: Stripped text of every page.
+
+    Raises:
+        RuntimeError: If the document is too large, times out or exhausts worker memory.
+    """
+    if len(content_bytes) > max_pdf_bytes:
+        raise RuntimeError("PDF ist zu gross fuer die Textextraktion.")
+    page_count = len(PdfReader(io.BytesIO(content_bytes)).pages)
+    workers = max(1, int(max_workers or os.cpu_count() or 1))
+    if page_count == 0:
+        return []
+    if parallel is None:
+        parallel = workers > 1 and page_count >= MIN_PARALLEL_PAGES
+    ranges = page_ranges(page_count, workers * 2) if parallel else [(0, page_count)]
+    deadline = time.monotonic() + timeout_s
+    pool = _acquire_pool(workers)
+    timed_out = False
+    try:
+        pending = [
+            pool.apply_async(_extract_range, (content_bytes, start, stop))
+            for start, stop in ranges
+        ]
+        pages: list[str] = []
+        for result in pending:
+            pages.extend(result.get(timeout=max(0.0, deadline - time.monotonic())))
+    except multiprocessing.TimeoutError as exc:
+        timed_out = True
+        raise RuntimeError("PDF-Extraktion hat das Zeitlimit ueberschritten.") from exc
+    except MemoryError as exc:
+        raise RuntimeError("PDF-Extraktion hat das Speicherlimit ueberschritten.") from exc
+    finally:
+        # Running tasks cannot be cancelled. A timed-out document retires the pool, which
+        # is terminated only after the other documents using it have collected their pages.
+        _release_pool(pool, retire=timed_out)
+    return pages
+
+
+def page_ranges(page_count: int, parts: int) -> list[tuple[int, int]]:
+    """Split ``range(page_count)`` into at most ``parts`` contiguous ranges.
+
+    Args:
+        page_count (int): Number of pages.
+        parts (int): Desired number of ranges.
+
+    Returns:
+        list[tuple[int, int]]: Half-open ``(start, stop)`` ranges in order.
+    """
+    parts = max(1, min(parts, page_count))
+    base, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + base + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def shutdown_pool():
+    """Stop the worker processes; called once when the application exits.
+
+    Returns:
+        None
+    """
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool.join()
+        for pool in _retired_pools:
+            pool.terminate()
+        _retired_pools.clear()
+        _pool_users.clear()
+        _pool = None
+        _pool_size = 0
+
+
+def _extract_range(content_bytes: bytes, start: int, stop: int) -> list[str]:
+    reader = PdfReader(io.BytesIO(content_bytes))
+    return [(reader.pages[i].extract_text() or "").strip() for i in range(start, stop)]
+
+
+def _limit_worker_memory(max_bytes: int):
+    try:
+        import resource
+    except ImportError:
+        # No address-space limits on this platform; the document size cap still applies.
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+    except (ValueError, OSError):
+        pass
+
+
+def _acquire_pool(workers: int):
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size != workers:
+            if _pool is not None:
+                _retire(_pool)
+            # Spawned workers do not inherit the Qt event loop or its threads.
+            context = multiprocessing.get_context("spawn")
+            _pool = context.Pool(
+                workers,
+                initializer=_limit_worker_memory,
+                initargs=(DEFAULT_WORKER_MEMORY_BYTES,),
+            )
+            _pool_size = workers
+        _pool_users[_pool] = _pool_users.get(_pool, 0) + 1
+        return _pool
+
+
+def _release_pool(pool, *, retire: bool):
+    with _pool_lock:
+        _pool_users[pool] = _pool_users.get(pool, 1) - 1
+        if retire:
+            _retire(pool)
+        if pool in _retired_pools and _pool_users[pool] <= 0:
+            _retired_pools.discard(pool)
+            _pool_users.pop(pool, None)
+            pool.terminate()
+
+
+def _retire(pool):
+    """Stop handing ``pool`` to new documents. Caller holds ``_pool_lock``."""
+    global _pool, _pool_size
+    if pool is _pool:
+        _pool = None
+        _pool_size = 0
+    if _pool_users.get(pool, 0) > 0:
+        _retired_pools.add(pool)
+    else:
+        _pool_users.pop(pool, None)
+        pool.terminate()
@@ -0,0 +1,166 @@
+"""Token-budgeted assembly of chat prompts from system text, files and turns."""
+
+import logging
+import math
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+TRUNCATION_MARKER = "\n[... gekuerzt ...]"
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a text.
+
+    Uses the common four-characters-per-token heuristic, which is close
+    enough for budgeting without shipping a tokenizer.
+
+    Args:
+        text (str): Text to estimate.
+
+    Returns:
+        int: Estimated token count.
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def message_tokens(message: dict) -> int:
+    return estimate_tokens(str(message.get("content") or "")) + MESSAGE_OVERHEAD_TOKENS
+
+
+def file_context_message(name: str, content: str) -> dict:
+    return {"role": "user", "content": f"File name: {name}\n\nFile content:\n{content}"}
+
+
+@dataclass
+class prompt_plan:
+    messages: list[dict]
+    tokens: int
+    budget: int
+    files: list[str] = field(default_factory=list)
+    truncated_files: list[str] = field(default_factory=list)
+    dropped_files: list[str] = field(default_factory=list)
+    turns: int = 0
+    dropped_turns: int = 0
+
+
+class prompt_builder:
+    """Fits system prompt, file contexts and chat turns into a token budget.
+
+    The system prompt and the newest turn are always sent. Of the rest, up to
+    ``history_share`` goes to earlier turns (newest first) and the remainder
+    is split evenly across file contexts; budget a file does not need flows
+    back to older turns. File entries may carry a ``score``: when the budget
+    is too small for every file, the lowest-scored ones are dropped first.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int = 8000,
+        *,
+        history_share: float = 0.35,
+        min_file_tokens: int = 200,
+    ):
+        self.budget_tokens = max(1, int(budget_tokens))
+        self.history_share = min(1.0, max(0.0, float(history_share)))
+        self.min_file_tokens = max(1, int(min_file_tokens))
+
+    def build(self, system_prompt: str, file_contexts: list[dict], turns: list[dict]) -> prompt_plan:
+        """Assemble the request messages within the configured budget.
+
+        Args:
+            system_prompt (str): System message content.
+            file_contexts (list[dict]): Entries with ``name``, ``content`` and optional ``score``.
+            turns (list[dict]): Chat history in chronological order.
+
+        Returns:
+            prompt_plan: Selected messages plus a summary of what was cut.
+        """
+        system_msg = {"role": "system", "content": system_prompt}
+        latest = list(turns[-1:])
+        history = list(turns[:-1])
+        fixed = message_tokens(system_msg) + sum(message_tokens(m) for m in latest)
+        available = max(0, self.budget_tokens - fixed)
+
+        history_cap = int(available * self.history_share)
+        kept_history, history_used = self._take_recent(history, history_cap)
+
+        file_msgs, files_used, plan = self._fit_files(file_contexts, available - history_used)
+
+        # Whatever the files left over goes to turns that did not fit before.
+        older = history[: len(history) - len(kept_history)]
+        more, more_used = self._take_recent(older, available - history_used - files_used)
+        kept_history = more + kept_history
+
+        messages = [system_msg, *file_msgs, *kept_history, *latest]
+        plan.messages = messages
+        plan.tokens = fixed + history_used + more_used + files_used
+        plan.turns = len(kept_history) + len(latest)
+        plan.dropped_turns = len(history) - len(kept_history)
+        logger.info(
+            "Prompt: ~%d/%d tokens, files=%s (truncated=%s, dropped=%s), turns=%d (dropped=%d)",
+            plan.tokens,
+            plan.budget,
+            plan.files,
+            plan.truncated_files,
+            plan.dropped_files,
+            plan.turns,
+            plan.dropped_turns,
+        )
+        return plan
+
+    @staticmethod
+    def _take_recent(turns: list[dict], cap: int) -> tuple[list[dict], int]:
+        kept = []
+        used = 0
+        for msg in reversed(turns):
+            cost = message_tokens(msg)
+            if used + cost > cap:
+                break
+            kept.append(msg)
+            used += cost
+        kept.reverse()
+        return kept, used
+
+    def _fit_files(self, file_contexts: list[dict], budget: int) -> tuple[list[dict], int, prompt_plan]:
+        plan = prompt_plan(messages=[], tokens=0, budget=self.budget_tokens)
+        ranked = sorted(
+            range(len(file_contexts)),
+            key=lambda i: float(file_contexts[i].get("score") or 0.0),
+            reverse=True,
+        )
+        while ranked and budget // len(ranked) < self.min_file_tokens:
+            dropped = ranked.pop()
+            plan.dropped_files.append(self._name(file_contexts[dropped]))
+
+        # Smallest files first so their unused share is redistributed.
+        order = sorted(ranked, key=lambda i: len(str(file_contexts[i].get("content") or "")))
+        allotted: dict[int, dict] = {}
+        remaining = budget
+        for pos, idx in enumerate(order):
+            entry = file_contexts[idx]
+            name = self._name(entry)
+            share = remaining // (len(order) - pos)
+            content = str(entry.get("content") or "")
+            msg = file_context_message(name, content)
+            cost = message_tokens(msg)
+            if cost > share:
+                overhead = cost - estimate_tokens(content)
+                keep_chars = max(
+                    0, (share - overhead - 1) * CHARS_PER_TOKEN - len(TRUNCATION_MARKER)
+                )
+                msg = file_context_message(name, content[:keep_chars] + TRUNCATION_MARKER)
+                cost = message_tokens(msg)
+                plan.truncated_files.append(name)
+            allotted[idx] = msg
+            remaining -= cost
+
+        messages = [allotted[i] for i in sorted(allotted)]
+        plan.files = [self._name(file_contexts[i]) for i in sorted(allotted)]
+        return messages, budget - remaining, plan
+
+    @staticmethod
+    def _name(entry: dict) -> str:
+        return str(entry.get("name") or "Datei")
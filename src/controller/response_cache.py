@@ -0,0 +1,126 @@
+"""On-disk cache for deterministic chat completions with TTL and LRU eviction."""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from controller.disk_lru import disk_lru
+
+DEFAULT_TTL_S = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+
+
+def normalize_messages(messages: list[dict]) -> list[dict]:
+    """Reduce chat messages to the fields that influence the completion.
+
+    Args:
+        messages (list[dict]): Chat payload in OpenAI format.
+
+    Returns:
+        list[dict]: Messages with only ``role`` and whitespace-normalized ``content``.
+    """
+    normalized = []
+    for msg in messages:
+        content = str(msg.get("content") or "").replace("\r\n", "\n").strip()
+        normalized.append({"role": str(msg.get("role") or ""), "content": content})
+    return normalized
+
+
+def cache_key(model: str, temperature: float, messages: list[dict]) -> str:
+    """Hash model, temperature and normalized messages into a cache key.
+
+    Args:
+        model (str): Model identifier.
+        temperature (float): Sampling temperature.
+        messages (list[dict]): Chat payload in OpenAI format.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    raw = json.dumps(
+        {
+            "model": model,
+            "temperature": float(temperature),
+            "messages": normalize_messages(messages),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class response_cache:
+    """Caches assistant answers as JSON files with a TTL on top of ``disk_lru``.
+
+    The store is shared by concurrent chat workers; its lock also guards the
+    hit/miss counters.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        ttl_s: float = DEFAULT_TTL_S,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock=time.time,
+    ):
+        self.store = disk_lru(directory, suffix=".json", max_bytes=max_bytes)
+        self.ttl_s = float(ttl_s)
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response, or None on a miss or expired entry.
+
+        Args:
+            key (str): Key from ``cache_key``.
+
+        Returns:
+            str | None: Cached assistant text.
+        """
+        with self.store.lock:
+            raw = self.store.read(key)
+            try:
+                entry = json.loads(raw) if raw is not None else None
+                response = str(entry["response"]) if entry is not None else None
+                created_at = float(entry["created_at"]) if entry is not None else 0.0
+            except (ValueError, KeyError, TypeError):
+                self.store.drop(key)
+                response = None
+            if response is not None and self._clock() - created_at > self.ttl_s:
+                self.store.drop(key)
+                response = None
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return response
+
+    def put(self, key: str, response: str):
+        data = json.dumps(
+            {"created_at": self._clock(), "response": response}, ensure_ascii=False
+        ).encode("utf-8")
+        # A cache that cannot write is just a cache that misses.
+        self.store.write(key, data)
+
+    def clear(self):
+        self.store.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size.
+
+        Returns:
+            dict: hits, misses, evictions, entries and bytes.
+        """
+        with self.store.lock:
+            entries, size = self.store.size()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.store.evictions,
+                "entries": entries,
+                "bytes": size,
+            }
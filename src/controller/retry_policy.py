@@ -0,0 +1,251 @@
+"""Retry with decorrelated jitter, Retry-After handling, rate limiting and circuit breaking."""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+
+def parse_retry_after(value: str | None, *, now: float | None = None) -> float | None:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date.
+
+    Args:
+        value (str | None): Raw header value.
+        now (float | None): Current epoch time, defaults to ``time.time()``.
+
+    Returns:
+        float | None: Delay in seconds, or None when absent or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment is None:
+        return None
+    current = time.time() if now is None else now
+    return max(moment.timestamp() - current, 0.0)
+
+
+def retry_after_from(resp) -> float | None:
+    headers = getattr(resp, "headers", None) or {}
+    return parse_retry_after(headers.get("Retry-After"))
+
+
+class retry_policy:
+    """Decides whether a failed call is retried and how long to wait first.
+
+    Delays follow decorrelated jitter: each wait is drawn uniformly between
+    ``base_s`` and three times the previous wait, capped at ``cap_s``. A
+    server-provided ``Retry-After`` acts as a lower bound.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        base_s: float = 0.2,
+        cap_s: float = 8.0,
+        max_retry_after_s: float = 30.0,
+        rng: random.Random | None = None,
+        sleep=time.sleep,
+    ):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_s = max(float(base_s), 0.0)
+        self.cap_s = max(float(cap_s), self.base_s)
+        self.max_retry_after_s = float(max_retry_after_s)
+        self._rng = rng or random.Random()
+        self._sleep = sleep
+
+    def is_retryable_status(
+        self, method: str, status_code: int, *, idempotent: bool | None = None
+    ) -> bool:
+        return status_code in RETRYABLE_STATUSES and self._idempotent(method, idempotent)
+
+    def is_retryable_exception(
+        self, method: str, exc: Exception, *, idempotent: bool | None = None
+    ) -> bool:
+        return isinstance(exc, RETRYABLE_EXCEPTIONS) and self._idempotent(method, idempotent)
+
+    def next_delay(self, previous: float, retry_after: float | None = None) -> float | None:
+        """Return the next wait in seconds, or None when Retry-After is too long.
+
+        Args:
+            previous (float): Previous delay, ``0`` before the first retry.
+            retry_after (float | None): Server-provided minimum delay.
+
+        Returns:
+            float | None: Seconds to wait before the next attempt.
+        """
+        if retry_after is not None and retry_after > self.max_retry_after_s:
+            return None
+        upper = max(previous * 3.0, self.base_s)
+        delay = min(self.cap_s, self._rng.uniform(self.base_s, upper))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def wait(self, delay: float):
+        if delay > 0:
+            self._sleep(delay)
+
+    @staticmethod
+    def _idempotent(method: str, idempotent: bool | None) -> bool:
+        if idempotent is not None:
+            return idempotent
+        return method.upper() in IDEMPOTENT_METHODS
+
+
+class token_bucket:
+    """Thread-safe token bucket that blocks callers once the burst is spent."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        *,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.waited_s = 0.0
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens from the bucket, sleeping until they are available.
+
+        Args:
+            tokens (float): Number of tokens the call costs.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.waited_s += waited
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class circuit_breaker:
+    """Fails fast for a cool-down window after repeated upstream failures.
+
+    ``failure_threshold`` consecutive failures open the circuit. Once
+    ``cooldown_s`` has passed, a single trial call is let through; its
+    outcome closes the circuit again or restarts the cool-down.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        cooldown_s: float = 30.0,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_s = max(float(cooldown_s), 0.0)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_at: float | None = None
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Return whether a call may go upstream now.
+
+        Returns:
+            bool: False while the circuit is open or a half-open trial is running.
+        """
+        with self._lock:
+            now = self._clock()
+            if self._state == CIRCUIT_OPEN and now - self._opened_at >= self.cooldown_s:
+                self._state = CIRCUIT_HALF_OPEN
+                self._trial_at = None
+            if self._state == CIRCUIT_CLOSED:
+                return True
+            if self._state == CIRCUIT_HALF_OPEN:
+                # A trial that never reported back (e.g. cancelled) expires after one cool-down.
+                if self._trial_at is None or now - self._trial_at >= self.cooldown_s:
+                    self._trial_at = now
+                    return True
+            self.rejected += 1
+            return False
+
+    def retry_in(self) -> float:
+        """Return the seconds until the breaker lets the next call through.
+
+        Returns:
+            float: Rest of the cool-down while open, rest of the running trial's
+            window while half-open, otherwise 0.
+        """
+        with self._lock:
+            if self._state == CIRCUIT_OPEN:
+                started = self._opened_at
+            elif self._state == CIRCUIT_HALF_OPEN and self._trial_at is not None:
+                started = self._trial_at
+            else:
+                return 0.0
+            return max(0.0, self.cooldown_s - (self._clock() - started))
+
+    def record_success(self):
+        with self._lock:
+            self._state = CIRCUIT_CLOSED
+            self._failures = 0
+            self._trial_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == CIRCUIT_HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != CIRCUIT_OPEN:
+                    self.opened += 1
+                self._state = CIRCUIT_OPEN
+                self._opened_at = self._clock()
+                self._trial_at = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
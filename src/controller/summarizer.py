@@ -0,0 +1,210 @@
+"""Map-reduce summarization of long documents with cached partial summaries."""
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from controller.cancellation import cancellation_token
+from controller.context_index import chunk_text
+from controller.prompt_builder import estimate_tokens
+from controller.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+MAP_PROMPT = (
+    "You summarize one section of a longer document. Keep definitions, key facts, "
+    "numbers and the line of argument. Answer in the language of the document."
+)
+REDUCE_PROMPT = (
+    "You merge consecutive partial summaries of one or more documents into a single "
+    "coherent summary. Keep their order, drop repetition and keep the important details. "
+    "Answer in the language of the summaries."
+)
+
+
+class _progress:
+    def __init__(self, callback: Callable[[int, int], None] | None):
+        self.callback = callback
+        self.done = 0
+        self.total = 0
+
+    def plan(self, calls: int):
+        self.total += calls
+        self._report()
+
+    def advance(self):
+        self.done += 1
+        self._report()
+
+    def _report(self):
+        if self.callback is not None:
+            self.callback(self.done, self.total)
+
+
+class map_reduce_summarizer:
+    """Summarizes long text by summarizing chunks in parallel and merging the results.
+
+    The map step summarizes every chunk; the reduce step merges neighbouring
+    summaries in groups until one is left. Each partial summary is cached under
+    the hash of its request, so a retry after a failure or cancellation only
+    repeats the calls that had not finished.
+    """
+
+    def __init__(
+        self,
+        analyzer,
+        *,
+        cache: response_cache | None = None,
+        chunk_tokens: int = 3000,
+        reduce_tokens: int = 6000,
+        fan_in: int = 8,
+        max_workers: int = 4,
+    ):
+        self.analyzer = analyzer
+        self.cache = cache
+        self.chunk_tokens = max(200, int(chunk_tokens))
+        self.reduce_tokens = max(self.chunk_tokens, int(reduce_tokens))
+        self.fan_in = max(2, int(fan_in))
+        self.max_workers = max(1, int(max_workers))
+
+    def summarize(
+        self,
+        documents: list[dict],
+        *,
+        on_progress: Callable[[int, int], None] | None = None,
+        cancellation: cancellation_token | None = None,
+    ) -> str:
+        """Summarize the full text of all documents.
+
+        Args:
+            documents (list[dict]): Entries with ``name`` and ``content``.
+            on_progress (Callable[[int, int], None] | None): Called with finished
+                and planned model calls; the total grows as reduce levels are planned.
+            cancellation (cancellation_token | None): Aborts outstanding calls.
+
+        Returns:
+            str: Final summary.
+
+        Raises:
+            RuntimeError: If the documents contain no text or a model call fails.
+            request_cancelled: If ``cancellation`` was triggered.
+        """
+        sections = self.map_requests(documents)
+        if not sections:
+            raise RuntimeError("Keine Inhalte zum Zusammenfassen.")
+        progress = _progress(on_progress)
+        progress.plan(len(sections))
+        parts = self._complete_all(sections, progress, cancellation)
+        level = 0
+        while len(parts) > 1:
+            level += 1
+            groups = self.group_parts(parts)
+            logger.info("Summary reduce level %d: %d parts -> %d", level, len(parts), len(groups))
+            progress.plan(len(groups))
+            parts = self._complete_all(
+                [self.reduce_request(group) for group in groups], progress, cancellation
+            )
+        return parts[0]
+
+    def map_requests(self, documents: list[dict]) -> list[list[dict]]:
+        """Build one summarization request per chunk of every document.
+
+        Args:
+            documents (list[dict]): Entries with ``name`` and ``content``.
+
+        Returns:
+            list[list[dict]]: Chat payloads in document order.
+        """
+        requests = []
+        for doc in documents:
+            name = doc.get("name") or "Dokument"
+            content = str(doc.get("content") or "")
+            chunks = chunk_text(content, size=self.chunk_tokens * 4, overlap=0)
+            for index, chunk in enumerate(chunks, start=1):
+                requests.append(
+                    [
+                        {"role": "system", "content": MAP_PROMPT},
+                        {
+                            "role": "user",
+                            "content": f"Document: {name}\nSection {index}/{len(chunks)}\n\n{chunk}",
+                        },
+                    ]
+                )
+        return requests
+
+    def group_parts(self, parts: list[str]) -> list[list[str]]:
+        """Split summaries into ordered groups that fit one reduce request.
+
+        Every group holds at least two parts, so each level shrinks the list.
+
+        Args:
+            parts (list[str]): Partial summaries in order.
+
+        Returns:
+            list[list[str]]: Consecutive groups.
+        """
+        groups: list[list[str]] = []
+        current: list[str] = []
+        tokens = 0
+        for part in parts:
+            size = estimate_tokens(part)
+            full = len(current) >= self.fan_in or tokens + size > self.reduce_tokens
+            if current and full and len(current) >= 2:
+                groups.append(current)
+                current, tokens = [], 0
+            current.append(part)
+            tokens += size
+        if len(current) == 1 and groups:
+            # Never leave a part alone; borrow from or join the previous group.
+            if len(groups[-1]) > 2:
+                current.insert(0, groups[-1].pop())
+            else:
+                groups[-1].extend(current)
+                current = []
+        if current:
+            groups.append(current)
+        return groups
+
+    @staticmethod
+    def reduce_request(group: list[str]) -> list[dict]:
+        body = "\n\n".join(f"Part {index}:\n{part}" for index, part in enumerate(group, start=1))
+        return [
+            {"role": "system", "content": REDUCE_PROMPT},
+            {"role": "user", "content": body},
+        ]
+
+    def _complete_all(
+        self,
+        batch: list[list[dict]],
+        progress: _progress,
+        cancellation: cancellation_token | None,
+    ) -> list[str]:
+        results: list[str] = [""] * len(batch)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batch))) as pool:
+            futures = {
+                pool.submit(self._complete, messages, cancellation): index
+                for index, messages in enumerate(batch)
+            }
+            try:
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    progress.advance()
+            except BaseException:
+                # Calls already running finish and land in the cache for the retry.
+                for future in futures:
+                    future.cancel()
+                raise
+        return results
+
+    def _complete(self, messages: list[dict], cancellation: cancellation_token | None) -> str:
+        if cancellation is not None:
+            cancellation.raise_if_cancelled()
+        key = self.analyzer.request_key(messages) if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        text = self.analyzer.chat(messages, cancellation=cancellation)
+        if key is not None:
+            self.cache.put(key, text)
+        return text
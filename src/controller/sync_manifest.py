@@ -0,0 +1,266 @@
+"""Persistent record of which local files mirror which remote file records."""
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class sync_plan:
+    add: list[tuple[dict, Path]] = field(default_factory=list)
+    update: list[tuple[dict, Path]] = field(default_factory=list)
+    adopt: list[tuple[dict, Path]] = field(default_factory=list)
+    delete: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def jobs(self) -> list[tuple[dict, Path]]:
+        return self.add + self.update
+
+
+class sync_manifest:
+    """Maps remote file ids to local copies with size, timestamp and hash."""
+    FILE_NAME = ".swe_dhbw_sync.json"
+
+    _registry: dict[Path, "sync_manifest"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, target_dir: Path):
+        self.target_dir = Path(target_dir)
+        self.path = self.target_dir / self.FILE_NAME
+        self._lock = threading.RLock()
+        self._entries: dict[str, dict] = {}
+        self._download_locks: dict[str, threading.Lock] = {}
+        self.load()
+
+    @classmethod
+    def for_directory(cls, target_dir: Path) -> "sync_manifest":
+        """Return the shared manifest for a download directory.
+
+        Args:
+            target_dir (Path): Download directory the manifest describes.
+
+        Returns:
+            sync_manifest: One instance per directory so threads share state.
+        """
+        key = Path(target_dir).resolve()
+        with cls._registry_lock:
+            manifest = cls._registry.get(key)
+            if manifest is None:
+                manifest = cls(key)
+                cls._registry[key] = manifest
+            return manifest
+
+    def load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # A missing or corrupted manifest only costs a re-check of the cache.
+            data = {}
+        files = data.get("files") if isinstance(data, dict) else None
+        with self._lock:
+            self._entries = dict(files) if isinstance(files, dict) else {}
+
+    def save(self):
+        # Chat context loading and sync save from worker threads; the lock
+        # keeps them from interleaving writes to the shared temp file.
+        with self._lock:
+            payload = json.dumps({"version": 1, "files": self._entries}, indent=2)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            try:
+                tmp.write_text(payload, encoding="utf-8")
+                os.replace(tmp, self.path)
+            except OSError:
+                pass
+
+    def get(self, file_id) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(str(file_id))
+            return dict(entry) if entry is not None else None
+
+    def local_path(self, file_id) -> Path | None:
+        entry = self.get(file_id)
+        if entry is None:
+            return None
+        return self.target_dir / entry["name"]
+
+    @staticmethod
+    def is_current(record: dict, entry: dict | None) -> bool:
+        if entry is None:
+            return False
+        return (
+            entry.get("size") == record.get("size")
+            and entry.get("updated_at") == record.get("updated_at")
+        )
+
+    def plan(self, records: list[dict]) -> sync_plan:
+        """Split remote records into files to add, update, delete or keep.
+
+        Unchanged entries are decided from the manifest alone, without
+        touching the filesystem. The manifest itself is not changed; files
+        found on disk are only listed in ``adopt``.
+
+        Args:
+            records (list[dict]): Normalized remote file records.
+
+        Returns:
+            sync_plan: Download jobs, local files to adopt and ids whose local
+            copies are obsolete.
+        """
+        result = sync_plan()
+        with self._lock:
+            taken = self._taken_names()
+            remote_ids = set()
+            for record in records:
+                file_id = record.get("id")
+                if file_id is None or str(file_id) in remote_ids:
+                    continue
+                remote_ids.add(str(file_id))
+                dest, state = self._classify(record, taken)
+                if state == "add":
+                    result.add.append((record, dest))
+                elif state == "update":
+                    result.update.append((record, dest))
+                elif state == "adopt":
+                    result.adopt.append((record, dest))
+                else:
+                    result.unchanged += 1
+            result.delete = [key for key in self._entries if key not in remote_ids]
+        return result
+
+    def resolve(self, record: dict) -> tuple[Path, str]:
+        """Return the local path for one record and whether it must be fetched.
+
+        Args:
+            record (dict): Normalized remote file record.
+
+        Returns:
+            tuple[Path, str]: Local path and one of ``"current"``, ``"adopt"``,
+            ``"update"`` or ``"add"``.
+        """
+        with self._lock:
+            return self._classify(record, self._taken_names())
+
+    def download_lock(self, dest: Path) -> threading.Lock:
+        """Return the lock that serializes writers of one local file.
+
+        The sync worker and chat context loading may fetch the same record at
+        once; both write through the same ``.part`` file.
+
+        Args:
+            dest (Path): Local path of the download.
+
+        Returns:
+            threading.Lock: The same lock for every caller of this directory.
+        """
+        with self._lock:
+            return self._download_locks.setdefault(Path(dest).name, threading.Lock())
+
+    def record_download(self, record: dict, dest: Path, sha256: str | None):
+        with self._lock:
+            self._entries[str(record.get("id"))] = {
+                "name": dest.name,
+                "size": record.get("size"),
+                "updated_at": record.get("updated_at"),
+                "sha256": sha256,
+                "owned": True,
+            }
+
+    def adopt(self, pairs: list[tuple[dict, Path]]):
+        """Register local files that already match their remote records.
+
+        Files cached before the manifest existed are kept, but never deleted by sync.
+
+        Args:
+            pairs (list[tuple[dict, Path]]): Records and paths from ``sync_plan.adopt``.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for record, dest in pairs:
+                self._entries.setdefault(
+                    str(record.get("id")),
+                    {
+                        "name": dest.name,
+                        "size": record.get("size"),
+                        "updated_at": record.get("updated_at"),
+                        "sha256": None,
+                        "owned": False,
+                    },
+                )
+
+    def remove_obsolete(self, file_ids: list[str]) -> int:
+        """Drop entries for deleted remote files and delete the copies we own.
+
+        Args:
+            file_ids (list[str]): Ids returned in ``sync_plan.delete``.
+
+        Returns:
+            int: Number of local files removed.
+        """
+        removed = 0
+        with self._lock:
+            for key in file_ids:
+                entry = self._entries.pop(str(key), None)
+                if entry is None or not entry.get("owned"):
+                    continue
+                try:
+                    (self.target_dir / entry["name"]).unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    continue
+                except OSError:
+                    continue
+        return removed
+
+    def _taken_names(self) -> dict[str, str]:
+        return {entry["name"]: file_id for file_id, entry in self._entries.items()}
+
+    def _classify(self, record: dict, taken: dict[str, str]) -> tuple[Path, str]:
+        key = str(record.get("id"))
+        entry = self._entries.get(key)
+        if entry is not None:
+            state = "current" if self.is_current(record, entry) else "update"
+            return self.target_dir / entry["name"], state
+        name = self._assign_name(record, taken)
+        dest = self.target_dir / name
+        state = self._existing_state(record, dest)
+        if state == "conflict":
+            # Never overwrite an unrelated local file that happens to share the name.
+            name = self._suffixed_name(name, record.get("id"), taken)
+            dest = self.target_dir / name
+            state = "add"
+        taken[name] = key
+        return dest, state
+
+    def _assign_name(self, record: dict, taken: dict[str, str]) -> str:
+        file_id = record.get("id")
+        name = record.get("name") or f"file_{file_id}"
+        safe_name = Path(name).name or f"file_{file_id}"
+        if safe_name not in taken:
+            return safe_name
+        # Another remote record already owns this name; disambiguate by id.
+        return self._suffixed_name(safe_name, file_id, taken)
+
+    def _suffixed_name(self, name: str, file_id, taken: dict[str, str]) -> str:
+        """Return a name derived from ``name`` that no record and no local file uses."""
+        path = Path(name)
+        candidate = f"{path.stem}_{file_id}{path.suffix}"
+        counter = 2
+        while candidate in taken or (self.target_dir / candidate).exists():
+            candidate = f"{path.stem}_{file_id}_{counter}{path.suffix}"
+            counter += 1
+        return candidate
+
+    def _existing_state(self, record: dict, dest: Path) -> str:
+        try:
+            stat = dest.stat()
+        except OSError:
+            return "add"
+        size = record.get("size")
+        if size is not None and str(size).isdigit() and int(size) != stat.st_size:
+            return "conflict"
+        return "adopt"
@@ -0,0 +1,104 @@
+"""Background worker that mirrors remote files into the local download folder."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from controller.atomic_writer import FSYNC_FILE
+from controller.backend_client import backend_client
+from controller.download_service import download_file
+from controller.sync_manifest import sync_manifest
+
+
+class sync_worker(QObject):
+    """Downloads new or changed files with a bounded thread pool off the UI thread."""
+    file_finished = pyqtSignal(dict)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(dict)
+
+    def __init__(
+        self,
+        *,
+        api_client: backend_client,
+        auth_token: str,
+        jobs: list[tuple[dict, Path]],
+        max_workers: int,
+        manifest: sync_manifest | None = None,
+        fsync_policy: str = FSYNC_FILE,
+    ):
+        super().__init__()
+        self.api_client = api_client
+        self.auth_token = auth_token
+        self.jobs = list(jobs)
+        self.max_workers = max(1, int(max_workers))
+        self.manifest = manifest
+        self.fsync_policy = fsync_policy
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        """Download all jobs and emit per-file and total progress.
+
+        Returns:
+            None
+        """
+        total = len(self.jobs)
+        summary = {"total": total, "downloaded": 0, "errors": [], "session_expired": False}
+        self.progress.emit(0, total)
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self._sync_job, record, dest) for record, dest in self.jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                done += 1
+                if result.get("status_code") == 401:
+                    summary["session_expired"] = True
+                elif result.get("ok"):
+                    summary["downloaded"] += 1
+                elif result.get("error"):
+                    summary["errors"].append(result["error"])
+                self.file_finished.emit(result)
+                self.progress.emit(done, total)
+        if self.manifest is not None:
+            self.manifest.save()
+        summary["cancelled"] = self._cancel.is_set()
+        self.finished.emit(summary)
+
+    def _sync_job(self, record: dict, dest: Path) -> dict:
+        result = {"id": record.get("id"), "name": dest.name, "ok": False, "error": ""}
+        if self._cancel.is_set():
+            return result
+
+        if self.manifest is None:
+            return self._download(record, dest, result)
+        with self.manifest.download_lock(dest):
+            if self.manifest.resolve(record) == (dest, "current"):
+                # Fetched for the chat context while this job was waiting.
+                result["ok"] = True
+                return result
+            return self._download(record, dest, result)
+
+    def _download(self, record: dict, dest: Path, result: dict) -> dict:
+        outcome = download_file(
+            self.api_client,
+            token=self.auth_token,
+            file_id=record.get("id"),
+            dest=dest,
+            timeout=60,
+            fsync_policy=self.fsync_policy,
+        )
+        result["status_code"] = outcome.status_code
+        if outcome.status_code == 401:
+            # Further requests would fail the same way; stop the remaining jobs early.
+            self._cancel.set()
+            return result
+
+        result["ok"] = outcome.ok
+        result["error"] = outcome.msg
+        if outcome.ok and self.manifest is not None:
+            self.manifest.record_download(record, dest, outcome.sha256)
+        return result
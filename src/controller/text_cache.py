@@ -0,0 +1,97 @@
+"""Compressed on-disk cache of extracted file text keyed by file id and version."""
+
+import gzip
+import hashlib
+import re
+from pathlib import Path
+
+from controller.disk_lru import disk_lru
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_]")
+
+
+def file_version(record: dict | None) -> str | None:
+    """Build a version tag from the remote ``updated_at`` and ``size``.
+
+    Args:
+        record (dict | None): File record from the backend listing.
+
+    Returns:
+        str | None: Version tag, or None if the record carries neither field.
+    """
+    if not record:
+        return None
+    updated_at = record.get("updated_at")
+    size = record.get("size")
+    if not updated_at and size is None:
+        return None
+    return f"{updated_at}:{size}"
+
+
+class text_cache:
+    """Keeps gzip-compressed extracted text so reopening a chat skips download and parsing.
+
+    Only the newest version of each file is kept; storing a new version drops
+    the older ones.
+    """
+
+    def __init__(self, directory: Path, *, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.store = disk_lru(directory, suffix=".txt.gz", max_bytes=max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_id, version: str) -> str | None:
+        with self.store.lock:
+            raw = self.store.read(self._key(file_id, version))
+            text = None
+            if raw is not None:
+                try:
+                    text = gzip.decompress(raw).decode("utf-8")
+                except (OSError, EOFError, UnicodeDecodeError):
+                    self.store.drop(self._key(file_id, version))
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return text
+
+    def put(self, file_id, version: str, text: str):
+        """Store extracted text and forget older versions of the same file.
+
+        Args:
+            file_id: Backend file identifier.
+            version (str): Tag from ``file_version``.
+            text (str): Extracted text.
+
+        Returns:
+            None
+        """
+        key = self._key(file_id, version)
+        prefix = f"{self._file_part(file_id)}-"
+        data = gzip.compress(text.encode("utf-8"), compresslevel=6)
+        with self.store.lock:
+            for existing in self.store.keys():
+                if existing.startswith(prefix) and existing != key:
+                    self.store.drop(existing)
+            self.store.write(key, data)
+
+    def stats(self) -> dict:
+        with self.store.lock:
+            entries, size = self.store.size()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.store.evictions,
+                "entries": entries,
+                "bytes": size,
+            }
+
+    @staticmethod
+    def _file_part(file_id) -> str:
+        return _UNSAFE_CHARS.sub("_", str(file_id))
+
+    def _key(self, file_id, version: str) -> str:
+        digest = hashlib.sha1(version.encode("utf-8")).hexdigest()[:16]
+        return f"{self._file_part(file_id)}-{digest}"
@@ -0,0 +1,154 @@
+"""Streaming multipart uploads that read file bodies from disk in chunks."""
+
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import requests
+
+from controller.backend_client import backend_client, status_error_message
+from controller.file_utils import normalize_file_records
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class upload_result:
+    ok: bool
+    record: dict | None = None
+    status_code: int | None = None
+    msg: str = ""
+
+
+class multipart_file_body:
+    """File-like multipart/form-data body with a known length.
+
+    ``requests`` streams objects that expose ``read`` and ``__len__`` without
+    loading them into memory, so only one chunk of the file is held at a time.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        field: str = "file",
+        on_read: Callable[[int], None] | None = None,
+    ):
+        self.path = Path(path)
+        self.boundary = uuid.uuid4().hex
+        filename = self.path.name.replace('"', "%22")
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("utf-8")
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("ascii")
+        self._file_size = os.path.getsize(self.path)
+        self._on_read = on_read
+        self._handle = None
+        self._stage = 0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return len(self._head) + self._file_size + len(self._tail)
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = CHUNK_SIZE
+        if self._stage == 0:
+            self._stage = 1
+            return self._head
+        if self._stage == 1:
+            if self._handle is None:
+                self._handle = open(self.path, "rb")
+            chunk = self._handle.read(size)
+            if chunk:
+                if self._on_read is not None:
+                    self._on_read(len(chunk))
+                return chunk
+            self.close()
+            self._stage = 2
+            return self._tail
+        return b""
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def upload_file(
+    api_client: backend_client,
+    *,
+    token: str | None,
+    path: Path,
+    timeout: float,
+    on_read: Callable[[int], None] | None = None,
+) -> upload_result:
+    """Upload one file as a streamed multipart body.
+
+    Args:
+        api_client (backend_client): Shared backend client.
+        token (str | None): Bearer token for the request.
+        path (Path): Local file to upload.
+        timeout (float): Request timeout in seconds.
+        on_read (Callable[[int], None] | None): Called with each sent file chunk size.
+
+    Returns:
+        upload_result: Outcome with the created record when the backend returns one.
+    """
+    try:
+        body = multipart_file_body(path, on_read=on_read)
+    except OSError as exc:
+        return upload_result(False, None, None, f"Datei konnte nicht gelesen werden: {exc}")
+
+    try:
+        resp = api_client.post(
+            "/files/upload",
+            token=token,
+            data=body,
+            headers={"Content-Type": body.content_type},
+            timeout=timeout,
+        )
+    except requests.RequestException as exc:
+        return upload_result(False, None, None, f"Upload fehlgeschlagen: {exc}")
+    except OSError as exc:
+        return upload_result(False, None, None, f"Datei konnte nicht gelesen werden: {exc}")
+    finally:
+        body.close()
+
+    if resp.status_code >= 400:
+        return upload_result(
+            False,
+            None,
+            resp.status_code,
+            status_error_message(
+                resp.status_code, f"Upload fehlgeschlagen (HTTP {resp.status_code})."
+            ),
+        )
+    return upload_result(True, _record_from_response(resp), resp.status_code)
+
+
+def _record_from_response(resp) -> dict | None:
+    try:
+        data = resp.json()
+    except ValueError:
+        return None
+    if isinstance(data, dict) and isinstance(data.get("file"), dict):
+        data = data["file"]
+    if not isinstance(data, dict) or data.get("id") is None:
+        return None
+    records = normalize_file_records([data])
+    return records[0] if records else None
@@ -0,0 +1,119 @@
+"""Background worker that uploads a queue of local files."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from controller.backend_client import backend_client
+from controller.upload_service import upload_file
+
+PROGRESS_INTERVAL_S = 0.1
+
+
+class upload_worker(QObject):
+    """Streams several uploads in parallel and reports transfer rate."""
+    file_finished = pyqtSignal(dict)
+    progress = pyqtSignal(object, object, float)
+    finished = pyqtSignal(dict)
+
+    def __init__(
+        self,
+        *,
+        api_client: backend_client,
+        auth_token: str,
+        paths: list[str],
+        max_workers: int,
+    ):
+        super().__init__()
+        self.api_client = api_client
+        self.auth_token = auth_token
+        self.paths = [Path(path) for path in paths]
+        self.max_workers = max(1, int(max_workers))
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._sent = 0
+        self._total = 0
+        self._started = 0.0
+        self._last_emit = 0.0
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        """Upload all queued files and emit per-file results and a summary.
+
+        Returns:
+            None
+        """
+        summary = {
+            "total": len(self.paths),
+            "uploaded": 0,
+            "missing_records": 0,
+            "errors": [],
+            "session_expired": False,
+        }
+        for path in self.paths:
+            try:
+                self._total += path.stat().st_size
+            except OSError:
+                continue
+        self._started = time.monotonic()
+        self.progress.emit(0, self._total, 0.0)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self._upload_job, path) for path in self.paths]
+            for future in as_completed(futures):
+                result = future.result()
+                if result.get("status_code") == 401:
+                    summary["session_expired"] = True
+                elif result.get("ok"):
+                    summary["uploaded"] += 1
+                    if result.get("record") is None:
+                        summary["missing_records"] += 1
+                elif result.get("error"):
+                    summary["errors"].append(result["error"])
+                self.file_finished.emit(result)
+
+        self._emit_progress(force=True)
+        summary["cancelled"] = self._cancel.is_set()
+        self.finished.emit(summary)
+
+    def _upload_job(self, path: Path) -> dict:
+        result = {"name": path.name, "ok": False, "error": "", "record": None}
+        if self._cancel.is_set():
+            return result
+
+        outcome = upload_file(
+            self.api_client,
+            token=self.auth_token,
+            path=path,
+            timeout=60,
+            on_read=self._on_bytes_sent,
+        )
+        result["status_code"] = outcome.status_code
+        if outcome.status_code == 401:
+            self._cancel.set()
+            return result
+        result["ok"] = outcome.ok
+        result["error"] = outcome.msg
+        result["record"] = outcome.record
+        return result
+
+    def _on_bytes_sent(self, count: int):
+        with self._lock:
+            self._sent += count
+        self._emit_progress()
+
+    def _emit_progress(self, force: bool = False):
+        # Throttle cross-thread signals; a chunk arrives every few microseconds on fast links.
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_emit < PROGRESS_INTERVAL_S:
+                return
+            self._last_emit = now
+            sent = self._sent
+        elapsed = max(now - self._started, 1e-6)
+        self.progress.emit(sent, self._total, sent / elapsed)
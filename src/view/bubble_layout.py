@@ -0,0 +1,178 @@
+"""Sizing of chat bubbles, batched into one layout pass per frame."""
+
+import itertools
+import math
+
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWidgets import QTextBrowser
+
+FRAME_MS = 16
+# Bubble widths snap to this grid so a growing line does not resize the bubble on every character.
+WIDTH_BUCKET_PX = 16
+# Dynamic property holding a view's cache key; unlike id(), it is never reused by a later view.
+KEY_PROPERTY = "bubbleLayoutKey"
+_keys = itertools.count(1)
+
+
+class bubble_layout_scheduler(QObject):
+    """Marks message bubbles dirty and resizes them together on the next frame.
+
+    The unwrapped width of a document only has to be measured again when its
+    content changed. Once a document is as wide as its bubble allows, text
+    appended at the end cannot narrow it, so appending only costs the wrapped
+    layout; any removal or rewrite, such as ``setMarkdown``, measures again.
+    """
+
+    def __init__(self, parent: QObject | None = None, *, frame_ms: int = FRAME_MS):
+        super().__init__(parent)
+        self._dirty: dict[int, QTextBrowser] = {}
+        # Per view key: (revision, unwrapped width, bubble width) of the last layout.
+        self._cache: dict[int, tuple[int, int, int]] = {}
+        # Keys of views whose text was removed or replaced since they were last measured.
+        self._rewritten: set[int] = set()
+        # Keys whose document changes this scheduler listens to.
+        self._watched: set[int] = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(frame_ms)
+        self._timer.timeout.connect(self.flush)
+        self.requested = 0
+        self.passes = 0
+        self.layouts = 0
+        self.skipped = 0
+
+    def mark_dirty(self, view: QTextBrowser):
+        self.requested += 1
+        self._dirty[self._key(view)] = view
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Resize every bubble marked since the last pass.
+
+        Returns:
+            None
+        """
+        self._timer.stop()
+        dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+        self.passes += 1
+        for view in dirty.values():
+            if not sip.isdeleted(view):
+                self.sync(view)
+
+    def forget(self, view: QTextBrowser):
+        key = self._key(view)
+        self._dirty.pop(key, None)
+        self._cache.pop(key, None)
+        self._rewritten.discard(key)
+        self._watched.discard(key)
+
+    def clear(self):
+        self._timer.stop()
+        self._dirty = {}
+        self._cache = {}
+        self._rewritten = set()
+        self._watched = set()
+
+    def _key(self, view: QTextBrowser) -> int:
+        key = view.property(KEY_PROPERTY)
+        if key is None:
+            key = next(_keys)
+            view.setProperty(KEY_PROPERTY, key)
+        if key not in self._watched:
+            self._watched.add(key)
+            view.document().contentsChange.connect(
+                lambda position, removed, added, key=key: self._on_contents_change(key, removed)
+            )
+        return key
+
+    def _on_contents_change(self, key: int, removed: int):
+        if removed:
+            self._rewritten.add(key)
+
+    def sync(self, view: QTextBrowser):
+        """Keep bubbles aligned and bounded for readability and layout stability.
+
+        Args:
+            view (QTextBrowser): Message widget to size and clamp.
+
+        Returns:
+            None
+        """
+        doc = view.document()
+        role = view.property("role")
+        is_loading = bool(view.property("loading"))
+        if role == "assistant":
+            min_width = 0 if is_loading else 220
+            max_width = 700
+        else:
+            min_width = 0
+            max_width = 520
+
+        key = self._key(view)
+        revision = doc.revision()
+        cached = self._cache.get(key)
+        rewritten = key in self._rewritten
+        self._rewritten.discard(key)
+        if cached is not None and cached[0] == revision:
+            doc_width = cached[1]
+        elif cached is not None and cached[1] >= max_width and not rewritten:
+            # Already at full width and only appended to since: the unwrapped width is not needed.
+            doc_width = cached[1]
+        else:
+            doc.setTextWidth(-1)
+            doc_width = int(doc.idealWidth())
+
+        bucket = math.ceil((doc_width + 2) / WIDTH_BUCKET_PX) * WIDTH_BUCKET_PX
+        target_width = max(min_width, min(max_width, bucket))
+        self._cache[key] = (revision, doc_width, target_width)
+        if cached is not None and cached[0] == revision and cached[2] == target_width:
+            self.skipped += 1
+            return
+        self.layouts += 1
+        view.setMinimumWidth(target_width)
+        view.setMaximumWidth(target_width)
+        if doc.textWidth() != target_width:
+            # Setting the width relays out the whole document, even when it is unchanged.
+            doc.setTextWidth(target_width)
+
+        view_margins = view.contentsMargins()
+        padding = view_margins.top() + view_margins.bottom()
+        extra = view.frameWidth() * 2
+        doc_height = math.ceil(doc.documentLayout().documentSize().height())
+        target_height = doc_height + padding + extra
+        view.setMinimumHeight(target_height)
+        view.setMaximumHeight(target_height)
+
+        bubble = view.parentWidget()
+        if bubble is not None:
+            layout = bubble.layout()
+            if layout is not None:
+                margins = layout.contentsMargins()
+                bubble_horizontal_padding = margins.left() + margins.right()
+                bubble_padding = margins.top() + margins.bottom()
+            else:
+                bubble_horizontal_padding = 24
+                bubble_padding = 16
+            bubble_height = target_height + bubble_padding
+            bubble.setMinimumHeight(bubble_height)
+            bubble.setMaximumHeight(bubble_height)
+            bubble.setMinimumWidth(target_width + bubble_horizontal_padding)
+            bubble.setMaximumWidth(target_width + bubble_horizontal_padding)
+
+    def stats(self) -> dict:
+        """Return layout counters for instrumentation.
+
+        Returns:
+            dict: Dirty marks, coalesced passes, bubble layouts run and skipped.
+        """
+        return {
+            "requested": self.requested,
+            "passes": self.passes,
+            "layouts": self.layouts,
+            "skipped": self.skipped,
+            "pending": len(self._dirty),
+        }
@@ -1,6 +1,8 @@
-"""Chat UI with streaming assistant responses and sizing logic."""
+"""Chat UI with streaming assistant responses and a virtualized transcript."""
 
+import bisect
 import math
+from dataclasses import dataclass
 
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import (
@@ -11,12 +13,31 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QScrollArea,
     QSizePolicy,
+    QSpacerItem,
     QTextBrowser,
     QVBoxLayout,
     QWidget,
 )
 
+from view.bubble_layout import bubble_layout_scheduler
 from view.hauptoberflaeche import hauptoberflaeche
+from view.markdown_stream import markdown_stream
+
+# Messages within this distance of the viewport keep their widgets.
+OVERSCAN_PX = 600
+
+
+@dataclass
+class _transcript_entry:
+    """One chat message; ``row`` and ``view`` are only set while it is materialized.
+
+    ``height`` is the last measured (or estimated) row height.
+    """
+    role: str
+    text: str
+    height: int | None = None
+    row: QWidget | None = None
+    view: QTextBrowser | None = None
 
 
 class chat_view(hauptoberflaeche):
@@ -32,6 +53,8 @@ class chat_view(hauptoberflaeche):
         self.btn_select_files.setObjectName("GhostButton")
         self.btn_clear_files = QPushButton("Auswahl loeschen")
         self.btn_clear_files.setObjectName("GhostButton")
+        self.btn_summarize = QPushButton("Zusammenfassen")
+        self.btn_summarize.setObjectName("GhostButton")
         self.selected_files_label = QLabel("Keine Dateien ausgewaehlt.")
         self.selected_files_label.setObjectName("HelperText")
         self.selected_files_label.setWordWrap(True)
@@ -42,6 +65,11 @@ class chat_view(hauptoberflaeche):
         self.chat_layout = QVBoxLayout(self.chat_container)
         self.chat_layout.setSpacing(10)
         self.chat_layout.setContentsMargins(4, 4, 4, 4)
+        # Stands in for the released messages between the window and the pinned live row.
+        self._tail_gap = QSpacerItem(
+            0, 0, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed
+        )
+        self.chat_layout.addSpacerItem(self._tail_gap)
         self.chat_layout.addStretch()
         self.chat_scroll.setWidget(self.chat_container)
         self.chat_scroll.setMinimumHeight(260)
@@ -49,17 +77,43 @@ class chat_view(hauptoberflaeche):
         self.chat_input.setPlaceholderText("Nachricht an die KI...")
         self.btn_send = QPushButton("Senden")
         self.btn_send.setObjectName("PrimaryButton")
+        self.btn_cancel = QPushButton("Abbrechen")
+        self.btn_cancel.setObjectName("SecondaryButton")
+        self.btn_cancel.setEnabled(False)
+        self.queue_label = QLabel("")
+        self.queue_label.setObjectName("HelperText")
+        self.queue_label.setVisible(False)
         self._typing_timer = QTimer(self)
         self._typing_timer.timeout.connect(self._on_typing_tick)
         self._typing_label = None
         self._typing_text = ""
         self._typing_index = 0
-        self._typing_markdown = False
+        self._typing_renderer = None
         self._loading_timer = QTimer(self)
         self._loading_timer.timeout.connect(self._on_loading_tick)
         self._loading_label = None
         self._loading_dots = 0
-        self._refresh_pending = False
+        self._loading_status = ""
+        self._stream_label = None
+        self._stream_renderer = None
+        self._bubble_layout = bubble_layout_scheduler(self)
+        # Transcript; only entries[_first:_last] and the pinned entry have widgets.
+        self._entries: list[_transcript_entry] = []
+        # _offsets[i] is the height of entries[:i] including spacing.
+        self._offsets = [0]
+        # First entry whose height changed since _offsets was last brought up to date.
+        self._stale_from: int | None = None
+        # Assistant entry whose bubble is still loading, streaming or typing.
+        self._live_entry: _transcript_entry | None = None
+        self._first = 0
+        self._last = 0
+        # Live entry kept below the window while the user reads further up.
+        self._pinned: int | None = None
+        self._follow_tail = True
+        self._window_updating = False
+        scroll_bar = self.chat_scroll.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._on_scrolled)
+        scroll_bar.rangeChanged.connect(self._on_scroll_range_changed)
         self.__fenster_erstellen()
         self.btn_temp_chat.toggled.connect(self.__update_temp_chat_label)
         self.__update_temp_chat_label(self.btn_temp_chat.isChecked())
@@ -75,12 +129,15 @@ class chat_view(hauptoberflaeche):
         files_row.setSpacing(10)
         files_row.addWidget(self.btn_select_files)
         files_row.addWidget(self.btn_clear_files)
+        files_row.addWidget(self.btn_summarize)
         files_row.addWidget(self.selected_files_label, stretch=1)
 
         input_row = QHBoxLayout()
         input_row.setSpacing(10)
         input_row.addWidget(self.chat_input)
+        input_row.addWidget(self.queue_label)
         input_row.addWidget(self.btn_send)
+        input_row.addWidget(self.btn_cancel)
 
         self.root.addLayout(actions)
         self.root.addLayout(files_row)
@@ -90,34 +147,141 @@ class chat_view(hauptoberflaeche):
 
     def add_message(self, role: str, text: str, *, stream: bool = False):
         self._stop_typing(finalize=True)
+        self._stop_stream(finalize=True)
         self._stop_loading(finalize=False)
-        label = self._create_message_row(role)
+        typing = stream and role == "assistant"
+        entry = self._append_entry(role, "" if typing else text)
 
-        if stream and role == "assistant":
-            self._start_typing(label, text, markdown=True)
+        if typing:
+            self._live_entry = entry
+            self._start_typing(entry.view, text)
         else:
-            label.setMarkdown(text)
             self._scroll_to_bottom()
 
+    def add_messages(self, messages: list[tuple[str, str]]):
+        """Append finished messages, creating widgets only for those near the viewport.
+
+        Args:
+            messages (list[tuple[str, str]]): ``(role, markdown)`` pairs in order.
+
+        Returns:
+            None
+        """
+        self._stop_typing(finalize=True)
+        self._stop_stream(finalize=True)
+        self._stop_loading(finalize=False)
+        self._entries.extend(_transcript_entry(role, text) for role, text in messages)
+        self._sync_offsets()
+        self._follow_tail = True
+        self._update_window()
+        self._scroll_to_bottom()
+
+    def message_count(self) -> int:
+        return len(self._entries)
+
+    def materialized_count(self) -> int:
+        return self._last - self._first + (self._pinned is not None)
+
     def start_loading(self):
         self._stop_typing(finalize=True)
+        self._stop_stream(finalize=True)
         self._stop_loading(finalize=False)
-        label = self._create_message_row("assistant")
+        self._live_entry = self._append_entry("assistant", "")
+        label = self._live_entry.view
         label.setProperty("loading", True)
         self._loading_label = label
         self._loading_dots = 0
+        self._loading_status = ""
         label.setPlainText("...")
         self._loading_timer.start(300)
         self._scroll_to_bottom()
 
     def stop_loading_and_stream(self, text: str):
+        if self._stream_label is not None:
+            self.finish_stream(text or self._stream_renderer.text)
+            return
         if self._loading_label is None:
             self.add_message("assistant", text, stream=True)
             return
         label = self._loading_label
         label.setProperty("loading", False)
         self._stop_loading(finalize=False)
-        self._start_typing(label, text, markdown=True)
+        self._start_typing(label, text)
+
+    def append_stream_delta(self, text: str):
+        """Append a streamed response fragment to the current assistant bubble.
+
+        The first fragment takes over the loading bubble. Fragments are
+        inserted as plain text and each finished markdown block is rendered in
+        place; ``finish_stream`` renders the whole answer once more.
+
+        Args:
+            text (str): Content fragment received from the model.
+
+        Returns:
+            None
+        """
+        if self._stream_label is None:
+            self._stop_typing(finalize=True)
+            label = self._loading_label
+            self._stop_loading(finalize=False)
+            if label is None:
+                self._live_entry = self._append_entry("assistant", "")
+                label = self._live_entry.view
+            self._stream_label = label
+            self._stream_renderer = markdown_stream(label)
+        self._stream_renderer.append(text)
+        self._scroll_to_bottom()
+
+    def finish_stream(self, text: str):
+        """Render the completed streamed answer as markdown.
+
+        Args:
+            text (str): Full assistant response text.
+
+        Returns:
+            None
+        """
+        if self._stream_label is None:
+            self.stop_loading_and_stream(text)
+            return
+        self._stream_renderer.text = text
+        self._stop_stream(finalize=True)
+        self._scroll_to_bottom()
+
+    def set_loading_progress(self, text: str):
+        """Show a status line in the loading bubble, e.g. summary progress.
+
+        Args:
+            text (str): Status shown before the animated dots.
+
+        Returns:
+            None
+        """
+        if self._loading_label is None:
+            return
+        self._loading_status = text
+        self._render_loading()
+
+    def mark_cancelled(self):
+        """Close the pending assistant bubble with a cancellation note.
+
+        Text streamed so far stays visible above the note.
+
+        Returns:
+            None
+        """
+        note = "*Abgebrochen.*"
+        if self._stream_label is not None:
+            partial = self._stream_renderer.text.rstrip()
+            self.finish_stream(f"{partial}\n\n{note}" if partial else note)
+            return
+        if self._loading_label is not None:
+            label = self._loading_label
+            self._stop_loading(finalize=False)
+            label.setMarkdown(note)
+            self._finish_live_entry(note)
+            self._scroll_to_bottom()
 
     def get_chat_input(self) -> str:
         return self.chat_input.text()
@@ -127,9 +291,25 @@ class chat_view(hauptoberflaeche):
 
     def clear_chat(self):
         self._stop_typing(finalize=False)
+        self._stop_stream(finalize=False)
         self._stop_loading(finalize=False)
-        while self.chat_layout.count() > 1:
-            item = self.chat_layout.takeAt(0)
+        self._entries = []
+        self._offsets = [0]
+        self._stale_from = None
+        self._live_entry = None
+        self._first = 0
+        self._last = 0
+        self._pinned = None
+        self._follow_tail = True
+        self._bubble_layout.clear()
+        self.chat_layout.setContentsMargins(4, 4, 4, 4)
+        self._tail_gap.changeSize(0, 0, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
+        index = 0
+        while index < self.chat_layout.count():
+            if self.chat_layout.itemAt(index).spacerItem() is not None:
+                index += 1
+                continue
+            item = self.chat_layout.takeAt(index)
             if item is not None:
                 widget = item.widget()
                 layout = item.layout()
@@ -143,32 +323,18 @@ class chat_view(hauptoberflaeche):
                     layout.deleteLater()
 
     def refresh_message_sizes(self):
-        self._refresh_all_message_sizes()
-        if not self._refresh_pending:
-            self._refresh_pending = True
-            QTimer.singleShot(0, self._refresh_all_message_sizes)
-
-    def _refresh_all_message_sizes(self):
-        for i in range(self.chat_layout.count() - 1):
-            item = self.chat_layout.itemAt(i)
-            if item is None:
-                continue
-            row_layout = item.layout()
-            if row_layout is None:
-                continue
-            for j in range(row_layout.count()):
-                bubble_item = row_layout.itemAt(j)
-                bubble = bubble_item.widget() if bubble_item else None
-                if bubble is None:
-                    continue
-                view = bubble.findChild(QTextBrowser)
-                if view is not None:
-                    self._sync_message_size(view)
-        self._refresh_pending = False
+        for index in self._materialized_indices():
+            self._bubble_layout.mark_dirty(self._entries[index].view)
+
+    def layout_stats(self) -> dict:
+        return self._bubble_layout.stats()
 
     def get_btn_send(self):
         return self.btn_send
 
+    def get_btn_cancel(self):
+        return self.btn_cancel
+
     def get_btn_back(self):
         return self.btn_back
 
@@ -178,6 +344,9 @@ class chat_view(hauptoberflaeche):
     def get_btn_clear_files(self):
         return self.btn_clear_files
 
+    def get_btn_summarize(self):
+        return self.btn_summarize
+
     def get_btn_temp_chat(self):
         return self.btn_temp_chat
 
@@ -196,18 +365,200 @@ class chat_view(hauptoberflaeche):
             "Temp Chat aktiv" if checked else "Temp Chat aus"
         )
 
-    def set_selected_files(self, names: list[str]):
+    def set_selected_files(self, names: list[str], *, loading: set[str] | None = None):
         if not names:
             self.selected_files_label.setText("Keine Dateien ausgewaehlt.")
             return
-        label = ", ".join(names)
+        loading = loading or set()
+        label = ", ".join(f"{name} (laedt...)" if name in loading else name for name in names)
         self.selected_files_label.setText(f"Ausgewaehlt: {label}")
 
     def set_send_enabled(self, enabled: bool):
         self.btn_send.setEnabled(enabled)
         self.chat_input.setEnabled(enabled)
 
-    def _create_message_row(self, role: str) -> QTextBrowser:
+    def set_cancel_enabled(self, enabled: bool):
+        self.btn_cancel.setEnabled(enabled)
+
+    def set_queue_depth(self, depth: int):
+        self.queue_label.setText(f"{depth} in Warteschlange" if depth else "")
+        self.queue_label.setVisible(depth > 0)
+
+    def _append_entry(self, role: str, text: str) -> _transcript_entry:
+        entry = _transcript_entry(role, text)
+        self._entries.append(entry)
+        self._sync_offsets()
+        self._follow_tail = True
+        self._update_window()
+        return entry
+
+    def _finish_live_entry(self, text: str):
+        """Store the final text of the live bubble so it survives being released."""
+        if self._live_entry is not None:
+            self._live_entry.text = text
+            self._live_entry = None
+
+    def _is_live(self) -> bool:
+        return (
+            self._typing_label is not None
+            or self._stream_label is not None
+            or self._loading_label is not None
+        )
+
+    def _on_scrolled(self, value: int):
+        if self._window_updating:
+            return
+        self._follow_tail = value >= self.chat_scroll.verticalScrollBar().maximum() - 4
+        self._update_window()
+
+    def _on_scroll_range_changed(self, minimum: int, maximum: int):
+        if self._follow_tail and not self._window_updating:
+            self.chat_scroll.verticalScrollBar().setValue(maximum)
+
+    def _update_window(self):
+        """Materialize the messages in or near the viewport and release the rest.
+
+        Window bounds come from the height prefix sums, so a frame only
+        measures the rows that have widgets. A reply that is still being
+        written keeps its widget as a pinned row below the window instead of
+        widening the window down to it.
+
+        Returns:
+            None
+        """
+        if self._window_updating:
+            return
+        for index in self._materialized_indices():
+            self._note_height(index)
+        self._sync_offsets()
+        count = len(self._entries)
+        offsets = self._offsets
+        viewport = self.chat_scroll.viewport().height()
+        if self._follow_tail:
+            budget = viewport + OVERSCAN_PX
+            lo = bisect.bisect_right(offsets, offsets[count] - budget) - 1
+            lo = min(max(lo, 0), count)
+            hi = count
+        else:
+            value = self.chat_scroll.verticalScrollBar().value()
+            # Rows start below the 4px top margin.
+            top, bottom = value - OVERSCAN_PX - 4, value + viewport + OVERSCAN_PX - 4
+            lo = max(bisect.bisect_right(offsets, top) - 1, 0)
+            hi = min(bisect.bisect_left(offsets, bottom), count)
+            lo = min(lo, max(0, hi - 1))
+        pinned = None
+        if count and self._is_live() and not lo <= count - 1 < hi:
+            # The live bubble is the last entry; it must keep its widget.
+            pinned = count - 1
+        self._set_window(lo, hi, pinned)
+
+    def _set_window(self, lo: int, hi: int, pinned: int | None):
+        self._window_updating = True
+        try:
+            first, last, was_pinned = self._first, self._last, self._pinned
+            if was_pinned is not None and was_pinned != pinned:
+                if lo <= was_pinned < hi:
+                    self._detach(was_pinned)
+                else:
+                    self._release(was_pinned)
+            keep_lo, keep_hi = max(first, lo), min(last, hi)
+            if keep_lo >= keep_hi:
+                keep_lo = keep_hi = hi
+            for index in range(first, last):
+                if keep_lo <= index < keep_hi:
+                    continue
+                if index == pinned:
+                    self._detach(index)
+                else:
+                    self._release(index)
+            for index in range(keep_lo - 1, lo - 1, -1):
+                self._place(index, 0)
+            for index in range(max(keep_hi, lo), hi):
+                self._place(index, index - lo)
+            if pinned is not None and pinned != was_pinned:
+                # After the tail gap, before the closing stretch.
+                self._place(pinned, self.chat_layout.count() - 1)
+            self._first, self._last, self._pinned = lo, hi, pinned
+            self._sync_offsets()
+            end = pinned if pinned is not None else len(self._entries)
+            above = self._offsets[lo]
+            below = self._offsets[end] - self._offsets[hi]
+            self.chat_layout.setContentsMargins(4, 4 + above, 4, 4)
+            self._tail_gap.changeSize(
+                0, below, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed
+            )
+            self.chat_layout.invalidate()
+        finally:
+            self._window_updating = False
+
+    def _materialized_indices(self) -> list[int]:
+        indices = list(range(self._first, self._last))
+        if self._pinned is not None:
+            indices.append(self._pinned)
+        return indices
+
+    def _place(self, index: int, position: int):
+        """Insert an entry's row at ``position``, creating it unless it was only detached."""
+        entry = self._entries[index]
+        if entry.row is not None:
+            self.chat_layout.insertWidget(position, entry.row)
+            return
+        row, view = self._create_message_row(entry.role)
+        self.chat_layout.insertWidget(position, row)
+        entry.row, entry.view = row, view
+        if entry.text:
+            view.setMarkdown(entry.text)
+        # Sized right away; the window margins need the real height.
+        self._bubble_layout.sync(view)
+        self._note_height(index)
+
+    def _detach(self, index: int):
+        """Take a row out of the layout but keep its widget, e.g. to move the live bubble."""
+        self.chat_layout.removeWidget(self._entries[index].row)
+
+    def _release(self, index: int):
+        entry = self._entries[index]
+        self._note_height(index)
+        self._bubble_layout.forget(entry.view)
+        self.chat_layout.removeWidget(entry.row)
+        entry.row.deleteLater()
+        entry.row = None
+        entry.view = None
+
+    def _note_height(self, index: int):
+        """Store a materialized row's height; a change marks the prefix sums stale."""
+        entry = self._entries[index]
+        height = entry.row.sizeHint().height()
+        if height != entry.height:
+            entry.height = height
+            if self._stale_from is None or index < self._stale_from:
+                self._stale_from = index
+
+    def _sync_offsets(self):
+        """Recompute prefix sums from the first changed entry and extend them to new entries."""
+        start = len(self._offsets) - 1
+        if self._stale_from is not None:
+            start = min(start, self._stale_from)
+            self._stale_from = None
+        offsets = self._offsets
+        del offsets[start + 1 :]
+        spacing = self.chat_layout.spacing()
+        for entry in self._entries[start:]:
+            offsets.append(offsets[-1] + self._entry_height(entry) + spacing)
+
+    def _entry_height(self, entry: _transcript_entry) -> int:
+        if entry.height is None:
+            entry.height = self._estimate_height(entry)
+        return entry.height
+
+    def _estimate_height(self, entry: _transcript_entry) -> int:
+        metrics = self.fontMetrics()
+        max_width = 700 if entry.role == "assistant" else 520
+        columns = max(20, max_width // max(1, metrics.averageCharWidth()))
+        lines = sum(max(1, math.ceil(len(line) / columns)) for line in entry.text.split("\n"))
+        return math.ceil(lines * metrics.lineSpacing() * 1.5) + 16
+
+    def _create_message_row(self, role: str) -> tuple[QWidget, QTextBrowser]:
         bubble = QFrame()
         bubble.setObjectName("chatBubble")
         bubble.setProperty("role", role)
@@ -239,81 +590,26 @@ class chat_view(hauptoberflaeche):
         )
         bubble_layout.addWidget(view)
 
-        row = QHBoxLayout()
-        row.setSpacing(8)
+        row = QWidget()
+        row_layout = QHBoxLayout(row)
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        row_layout.setSpacing(8)
         if role == "assistant":
-            row.addWidget(bubble, stretch=0)
-            row.addStretch()
+            row_layout.addWidget(bubble, stretch=0)
+            row_layout.addStretch()
         else:
-            row.addStretch()
-            row.addWidget(bubble, stretch=0)
-
-        self.chat_layout.insertLayout(self.chat_layout.count() - 1, row)
-        self._sync_message_size(view)
-        return view
+            row_layout.addStretch()
+            row_layout.addWidget(bubble, stretch=0)
+        return row, view
 
     def _on_message_contents_changed(self, view: QTextBrowser):
-        self._sync_message_size(view)
-        QTimer.singleShot(0, lambda v=view: self._sync_message_size(v))
-
-    @staticmethod
-    def _sync_message_size(view: QTextBrowser):
-        """Keep bubbles aligned and bounded for readability and layout stability.
-
-        Args:
-            view (QTextBrowser): Message widget to size and clamp.
+        self._bubble_layout.mark_dirty(view)
 
-        Returns:
-            None
-        """
-        doc = view.document()
-        doc.setTextWidth(-1)
-        doc_width = int(doc.idealWidth())
-        view_margins = view.contentsMargins()
-        padding = view_margins.top() + view_margins.bottom()
-        extra = view.frameWidth() * 2
-
-        role = view.property("role")
-        is_loading = bool(view.property("loading"))
-        if role == "assistant":
-            min_width = 0 if is_loading else 220
-            max_width = 700
-        else:
-            min_width = 0
-            max_width = 520
-
-        target_width = max(min_width, min(max_width, doc_width + 2))
-        view.setMinimumWidth(target_width)
-        view.setMaximumWidth(target_width)
-        doc.setTextWidth(target_width)
-
-        doc_height = math.ceil(doc.documentLayout().documentSize().height())
-        target_height = doc_height + padding + extra
-        view.setMinimumHeight(target_height)
-        view.setMaximumHeight(target_height)
-
-        bubble = view.parentWidget()
-        if bubble is not None:
-            layout = bubble.layout()
-            if layout is not None:
-                margins = layout.contentsMargins()
-                bubble_horizontal_padding = margins.left() + margins.right()
-                bubble_padding = margins.top() + margins.bottom()
-            else:
-                bubble_horizontal_padding = 24
-                bubble_padding = 16
-            bubble_height = target_height + bubble_padding
-            bubble.setMinimumHeight(bubble_height)
-            bubble.setMaximumHeight(bubble_height)
-            bubble.setMinimumWidth(target_width + bubble_horizontal_padding)
-            bubble.setMaximumWidth(target_width + bubble_horizontal_padding)
-
-    def _start_typing(self, label: QTextBrowser, text: str, *, markdown: bool):
+    def _start_typing(self, label: QTextBrowser, text: str):
         self._typing_label = label
         self._typing_text = text
         self._typing_index = 0
-        self._typing_markdown = markdown
-        label.setPlainText("")
+        self._typing_renderer = markdown_stream(label)
         self._typing_timer.start(12)
 
     def _on_typing_tick(self):
@@ -321,39 +617,45 @@ class chat_view(hauptoberflaeche):
             self._typing_timer.stop()
             return
         step = 3
-        self._typing_index = min(self._typing_index + step, len(self._typing_text))
-        chunk = self._typing_text[: self._typing_index]
-        if self._typing_markdown:
-            self._typing_label.setMarkdown(chunk)
-        else:
-            self._typing_label.setPlainText(chunk)
+        start = self._typing_index
+        self._typing_index = min(start + step, len(self._typing_text))
+        self._typing_renderer.append(self._typing_text[start : self._typing_index])
         self._scroll_to_bottom()
         if self._typing_index >= len(self._typing_text):
-            self._typing_timer.stop()
-            if self._typing_markdown:
-                self._typing_label.setMarkdown(self._typing_text)
-            self._typing_label = None
+            self._stop_typing(finalize=True)
 
     def _stop_typing(self, *, finalize: bool):
         if self._typing_label is None:
             return
         self._typing_timer.stop()
         if finalize:
-            if self._typing_markdown:
-                self._typing_label.setMarkdown(self._typing_text)
-            else:
-                self._typing_label.setPlainText(self._typing_text)
+            self._typing_renderer.finish(self._typing_text)
+            self._finish_live_entry(self._typing_text)
         self._typing_label = None
+        self._typing_renderer = None
+
+    def _stop_stream(self, *, finalize: bool):
+        if self._stream_label is None:
+            return
+        if finalize:
+            self._stream_renderer.finish()
+            self._finish_live_entry(self._stream_renderer.text)
+        self._stream_label = None
+        self._stream_renderer = None
 
     def _on_loading_tick(self):
         if self._loading_label is None:
             self._loading_timer.stop()
             return
         self._loading_dots = (self._loading_dots + 1) % 4
-        dots = "." * max(1, self._loading_dots)
-        self._loading_label.setPlainText(dots)
+        self._render_loading()
         self._scroll_to_bottom()
 
+    def _render_loading(self):
+        dots = "." * max(1, self._loading_dots)
+        text = f"{self._loading_status} {dots}" if self._loading_status else dots
+        self._loading_label.setPlainText(text)
+
     def _stop_loading(self, *, finalize: bool):
         if self._loading_label is None:
             return
@@ -364,5 +666,6 @@ class chat_view(hauptoberflaeche):
         self._loading_label = None
 
     def _scroll_to_bottom(self):
+        self._follow_tail = True
         scroll_bar = self.chat_scroll.verticalScrollBar()
         scroll_bar.setValue(scroll_bar.maximum())
@@ -9,10 +9,12 @@ from PyQt6.QtWidgets import (
     QFileDialog,
     QFrame,
     QHBoxLayout,
+    QLabel,
     QLineEdit,
     QListWidget,
     QListWidgetItem,
     QMenu,
+    QProgressBar,
     QPushButton,
     QVBoxLayout,
 )
@@ -42,6 +44,24 @@ class datei_liste_view(hauptoberflaeche):
         self.sort_combo = QComboBox()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Datei suchen...")
+        self.sync_progress = QProgressBar()
+        self.sync_progress.setObjectName("SyncProgress")
+        self.sync_progress.setTextVisible(False)
+        self.sync_progress.setVisible(False)
+        self.sync_label = QLabel("")
+        self.sync_label.setObjectName("HelperText")
+        self.upload_progress = QProgressBar()
+        self.upload_progress.setObjectName("UploadProgress")
+        self.upload_progress.setTextVisible(False)
+        self.upload_progress.setVisible(False)
+        self.upload_label = QLabel("")
+        self.upload_label.setObjectName("HelperText")
+        self.delete_progress = QProgressBar()
+        self.delete_progress.setObjectName("DeleteProgress")
+        self.delete_progress.setTextVisible(False)
+        self.delete_progress.setVisible(False)
+        self.delete_label = QLabel("")
+        self.delete_label.setObjectName("HelperText")
         self.sort_combo.addItems(
             [
                 "Name (A-Z)",
@@ -89,10 +109,20 @@ class datei_liste_view(hauptoberflaeche):
         sidebar.addWidget(self.btn_settings)
         sidebar.addWidget(self.btn_logout)
 
+        list_column = QVBoxLayout()
+        list_column.setSpacing(6)
+        list_column.addWidget(self.list_widget, stretch=1)
+        list_column.addWidget(self.sync_progress)
+        list_column.addWidget(self.sync_label)
+        list_column.addWidget(self.upload_progress)
+        list_column.addWidget(self.upload_label)
+        list_column.addWidget(self.delete_progress)
+        list_column.addWidget(self.delete_label)
+
         content = QHBoxLayout()
         content.setSpacing(16)
         content.addWidget(sidebar_frame, stretch=0)
-        content.addWidget(self.list_widget, stretch=1)
+        content.addLayout(list_column, stretch=1)
 
         self.root.addLayout(content)
         self.mittig_auf_bildschirm()
@@ -105,6 +135,31 @@ class datei_liste_view(hauptoberflaeche):
             item.setCheckState(Qt.CheckState.Unchecked)
             self.list_widget.addItem(item)
 
+    def set_sync_progress(self, done: int, total: int):
+        self.__show_progress(self.sync_progress, done, total)
+
+    def set_sync_status(self, text: str):
+        self.sync_label.setText(text)
+
+    def set_upload_progress(self, done: int, total: int):
+        self.__show_progress(self.upload_progress, done, total)
+
+    def set_upload_status(self, text: str):
+        self.upload_label.setText(text)
+
+    def set_delete_progress(self, done: int, total: int):
+        self.__show_progress(self.delete_progress, done, total)
+
+    def set_delete_status(self, text: str):
+        self.delete_label.setText(text)
+
+    @staticmethod
+    def __show_progress(bar: QProgressBar, done: int, total: int):
+        active = total > 0 and done < total
+        bar.setRange(0, max(total, 1))
+        bar.setValue(done)
+        bar.setVisible(active)
+
     def get_btn_refresh(self):
         return self.btn_refresh
 
@@ -192,10 +247,10 @@ class datei_liste_view(hauptoberflaeche):
         )
         return path
 
-    def prompt_open_file(self, default_dir: str = "") -> str:
-        path, _ = QFileDialog.getOpenFileName(
+    def prompt_open_files(self, default_dir: str = "") -> list[str]:
+        paths, _ = QFileDialog.getOpenFileNames(
             self,
-            "Datei hochladen",
+            "Dateien hochladen",
             default_dir,
         )
-        return path
+        return paths
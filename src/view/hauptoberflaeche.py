@@ -131,14 +131,16 @@ class hauptoberflaeche(QWidget):
                 font-size: 12px;
             }}
 
-            /* Splash progress */
-            QProgressBar#SplashProgress {{
+            /* Splash and sync progress */
+            QProgressBar#SplashProgress,
+            QProgressBar#SyncProgress {{
                 background: {colors['surface_alt']};
                 border: 1px solid {colors['border']};
                 border-radius: 8px;
                 min-height: 10px;
             }}
-            QProgressBar#SplashProgress::chunk {{
+            QProgressBar#SplashProgress::chunk,
+            QProgressBar#SyncProgress::chunk {{
                 border-radius: 8px;
                 background: qlineargradient(
                     x1: 0, y1: 0, x2: 1, y2: 0,
@@ -0,0 +1,101 @@
+"""Incremental markdown rendering for chat bubbles that grow while they are shown."""
+
+from PyQt6.QtGui import (
+    QTextBlockFormat,
+    QTextCharFormat,
+    QTextCursor,
+    QTextDocument,
+    QTextDocumentFragment,
+)
+from PyQt6.QtWidgets import QTextBrowser
+
+
+class markdown_stream:
+    """Appends text to a message view and renders markdown one finished block at a time.
+
+    New text is inserted as plain text. Once a blank line outside a code
+    fence closes a block, only that block is replaced by its rendered
+    markdown, so the cost of an append does not grow with the length of the
+    message. ``finish`` renders the whole text once, which fixes constructs
+    that span blocks, such as loose lists.
+    """
+
+    def __init__(self, view: QTextBrowser):
+        self.view = view
+        self.text = ""
+        self.renders = 0
+        self._committed = 0
+        self._scanned = 0
+        self._in_fence = False
+        self._tail_start = 0
+        view.setPlainText("")
+
+    def append(self, fragment: str):
+        """Show more text, rendering every block it completes.
+
+        Args:
+            fragment (str): Text to append.
+
+        Returns:
+            None
+        """
+        if not fragment:
+            return
+        self.text += fragment
+        boundary = self._find_boundary()
+        cursor = QTextCursor(self.view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if boundary <= self._committed:
+            cursor.insertText(fragment)
+            return
+        cursor.setPosition(self._tail_start, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        if self._insert_markdown(cursor, self.text[self._committed : boundary]):
+            cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+            self._tail_start = cursor.position()
+        self._committed = boundary
+        cursor.insertText(self.text[boundary:])
+
+    def finish(self, text: str | None = None):
+        """Render the complete text as one markdown document.
+
+        Args:
+            text (str | None): Final text; defaults to everything appended so far.
+
+        Returns:
+            None
+        """
+        if text is not None:
+            self.text = text
+        self.view.setMarkdown(self.text)
+        self.renders += 1
+
+    def _find_boundary(self) -> int:
+        """Return the end of the last complete block in ``text``."""
+        boundary = self._committed
+        while True:
+            end = self.text.find("\n", self._scanned)
+            if end < 0:
+                return boundary
+            line = self.text[self._scanned : end].strip()
+            self._scanned = end + 1
+            if line.startswith("```") or line.startswith("~~~"):
+                self._in_fence = not self._in_fence
+            elif not line and not self._in_fence and self._scanned - 1 > self._committed:
+                boundary = self._scanned
+
+    def _insert_markdown(self, cursor: QTextCursor, markdown: str) -> bool:
+        if not markdown.strip():
+            return False
+        block = QTextDocument()
+        block.setMarkdown(markdown)
+        first_format = block.firstBlock().blockFormat()
+        start = cursor.position()
+        cursor.insertFragment(QTextDocumentFragment(block))
+        if block.firstBlock().textList() is None:
+            # The first block merges into the current one and would lose heading or code formatting.
+            restore = QTextCursor(self.view.document())
+            restore.setPosition(start)
+            restore.setBlockFormat(first_format)
+        self.renders += 1
+        return True
@@ -1,3 +1,4 @@
+from controller.backend_client import backend_client
 from controller.file_list_flow import file_list_flow
 
 
@@ -38,10 +39,19 @@ class FakeFileMutationFlow:
         self.called = True
 
 
+class FakeChatCoreFlow:
+    def __init__(self):
+        self.resets = 0
+
+    def reset_session(self):
+        self.resets += 1
+
+
 class FakeController:
     def __init__(self):
         self.auth_token = "token"
         self.api_base_url = "http://example"
+        self.api_client = backend_client(self.api_base_url)
         self.file_records = []
         self.visible_file_records = []
         self.file_sort_mode = "Name (A-Z)"
@@ -55,6 +65,7 @@ class FakeController:
         self.chat_view = FakeView()
         self.stack = FakeStack()
         self.file_mutation_flow = FakeFileMutationFlow()
+        self.chat_core_flow = FakeChatCoreFlow()
 
 
 def test_acceptance_load_files_and_reset_chat(monkeypatch):
@@ -63,12 +74,14 @@ def test_acceptance_load_files_and_reset_chat(monkeypatch):
 
     class FakeResponse:
         status_code = 200
+        headers = {}
 
         def json(self):
             return [{"id": 1, "name": "report.pdf"}]
 
     monkeypatch.setattr(
-        "controller.file_list_flow.requests.get",
+        controller.api_client.session,
+        "request",
         lambda *args, **kwargs: FakeResponse(),
     )
 
@@ -77,5 +90,6 @@ def test_acceptance_load_files_and_reset_chat(monkeypatch):
     assert controller.datei_liste_view.items == ["1: report.pdf"]
     assert controller.chat_messages == []
     assert controller.current_chat_id is None
+    assert controller.chat_core_flow.resets == 1
     assert controller.file_mutation_flow.called is True
     assert controller.stack.current == controller.datei_liste_view
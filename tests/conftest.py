@@ -57,7 +57,7 @@ class DummyView:
         self._checked_indices = []
         self._all_checked = False
         self.prompt_save_path_value = ""
-        self.prompt_open_file_value = ""
+        self.prompt_open_files_value = []
 
     def show_error(self, message):
         self.errors.append(message)
@@ -83,8 +83,8 @@ class DummyView:
     def prompt_save_path(self, suggested_name: str, default_dir: str = "") -> str:
         return self.prompt_save_path_value
 
-    def prompt_open_file(self, default_dir: str = "") -> str:
-        return self.prompt_open_file_value
+    def prompt_open_files(self, default_dir: str = "") -> list[str]:
+        return list(self.prompt_open_files_value)
 
 
 class DummyChatView(DummyView):
@@ -156,3 +156,17 @@ def fake_backend():
         yield server
     finally:
         server.stop()
+
+
+@pytest.fixture()
+def fake_openai(monkeypatch):
+    from fake_openai import FakeOpenAIServer
+
+    server = FakeOpenAIServer()
+    server.start()
+    monkeypatch.setenv("OPENAI_API_KEY", server.api_key)
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    try:
+        yield server
+    finally:
+        server.stop()
@@ -1,3 +1,6 @@
+from PyQt6.QtWidgets import QTextBrowser
+
+from view.bubble_layout import KEY_PROPERTY, bubble_layout_scheduler
 from view.chat_view import chat_view
 
 
@@ -24,7 +27,8 @@ def test_chat_view_message_flow(qtbot):
     assert "a.txt" in view.selected_files_label.text()
 
     view.clear_chat()
-    assert view.chat_layout.count() == 1
+    # Only the tail gap and the closing stretch are left.
+    assert view.chat_layout.count() == 2
 
 
 def test_chat_view_refresh_sizes(qtbot):
@@ -34,3 +38,186 @@ def test_chat_view_refresh_sizes(qtbot):
     view.add_message("user", "Hello")
     view.add_message("assistant", "World")
     view.refresh_message_sizes()
+
+
+def test_chat_view_streams_deltas_into_loading_bubble(qtbot):
+    view = chat_view()
+    qtbot.addWidget(view)
+
+    view.start_loading()
+    view.append_stream_delta("**Hal")
+    view.append_stream_delta("lo**")
+    rows = view.chat_layout.count()
+
+    assert view._loading_label is None
+    assert view._stream_label.toPlainText() == "**Hallo**"
+
+    view.finish_stream("**Hallo**")
+
+    assert view._stream_label is None
+    assert view.chat_layout.count() == rows
+
+
+def test_chat_view_mark_cancelled_keeps_streamed_text(qtbot):
+    view = chat_view()
+    qtbot.addWidget(view)
+
+    view.start_loading()
+    view.append_stream_delta("Teilantwort")
+    view.mark_cancelled()
+
+    assert view._stream_label is None
+    text = view.chat_container.findChildren(QTextBrowser)[-1].toPlainText()
+    assert "Teilantwort" in text
+    assert "Abgebrochen." in text
+
+
+def test_chat_view_materializes_only_messages_near_the_viewport(qtbot):
+    view = chat_view()
+    qtbot.addWidget(view)
+    view.resize(900, 700)
+    view.show()
+    view.add_messages([("user" if i % 2 else "assistant", f"Nachricht {i}") for i in range(500)])
+    scroll_bar = view.chat_scroll.verticalScrollBar()
+    qtbot.waitUntil(lambda: scroll_bar.maximum() > 0)
+
+    assert view.message_count() == 500
+    assert 0 < view.materialized_count() < 60
+    assert view.chat_layout.count() == view.materialized_count() + 2
+
+    scroll_bar.setValue(0)
+    texts = [browser.toPlainText() for browser in view.chat_container.findChildren(QTextBrowser)]
+    assert "Nachricht 0" in texts
+
+    view.add_message("user", "Neu")
+    assert view.materialized_count() < 60
+    assert view._entries[-1].view.toPlainText() == "Neu"
+
+
+def test_chat_view_keeps_live_replies_after_scrolling_away(qtbot):
+    view = chat_view()
+    qtbot.addWidget(view)
+    view.resize(900, 700)
+    view.show()
+    view.start_loading()
+    view.append_stream_delta("**Gestreamte")
+    view.append_stream_delta(" Antwort**")
+    view.finish_stream("**Gestreamte Antwort**")
+    view.start_loading()
+    view.stop_loading_and_stream("Getippte Antwort")
+    qtbot.waitUntil(lambda: view._typing_label is None)
+
+    view.add_messages([("user", f"Nachricht {i}") for i in range(300)])
+    scroll_bar = view.chat_scroll.verticalScrollBar()
+    qtbot.waitUntil(lambda: scroll_bar.maximum() > 0)
+    assert view._entries[0].view is None
+
+    scroll_bar.setValue(0)
+
+    assert view._entries[0].view.toPlainText() == "Gestreamte Antwort"
+    assert view._entries[1].view.toPlainText() == "Getippte Antwort"
+
+
+def test_chat_view_pins_live_reply_while_scrolled_to_the_top(qtbot):
+    view = chat_view()
+    qtbot.addWidget(view)
+    view.resize(900, 700)
+    view.show()
+    view.add_messages([("user", f"Nachricht {i}") for i in range(500)])
+    view.start_loading()
+    view.append_stream_delta("Teil")
+    scroll_bar = view.chat_scroll.verticalScrollBar()
+    qtbot.waitUntil(lambda: scroll_bar.maximum() > 0)
+    live = view._entries[-1]
+
+    scroll_bar.setValue(0)
+    view.append_stream_delta("antwort")
+    scroll_bar.setValue(0)
+
+    assert view._entries[0].view.toPlainText() == "Nachricht 0"
+    assert 0 < view.materialized_count() < 60
+    assert view._pinned == view.message_count() - 1
+    assert live.view is view._stream_label
+    assert "Teilantwort" in live.view.toPlainText()
+
+    view.finish_stream("Teilantwort")
+    scroll_bar.setValue(scroll_bar.maximum())
+    qtbot.waitUntil(lambda: view._pinned is None)
+
+    assert live.view.toPlainText() == "Teilantwort"
+    assert view.chat_layout.count() == view.materialized_count() + 2
+
+
+def test_chat_view_keeps_height_prefix_sums_in_step(qtbot):
+    view = chat_view()
+    qtbot.addWidget(view)
+    view.resize(900, 700)
+    view.show()
+    view.add_messages([("assistant", "Zeile\n" * (i % 7 + 1)) for i in range(200)])
+    scroll_bar = view.chat_scroll.verticalScrollBar()
+    qtbot.waitUntil(lambda: scroll_bar.maximum() > 0)
+    for value in (0, scroll_bar.maximum() // 2, scroll_bar.maximum()):
+        scroll_bar.setValue(value)
+    spacing = view.chat_layout.spacing()
+
+    expected = [0]
+    for entry in view._entries:
+        expected.append(expected[-1] + entry.height + spacing)
+    assert view._offsets == expected
+
+
+def test_chat_view_coalesces_bubble_layout_into_one_pass(qtbot):
+    view = chat_view()
+    qtbot.addWidget(view)
+    view.start_loading()
+    before = view.layout_stats()
+
+    for _ in range(50):
+        view.append_stream_delta("Wort ")
+    qtbot.waitUntil(lambda: view.layout_stats()["pending"] == 0)
+    stats = view.layout_stats()
+
+    assert stats["requested"] - before["requested"] >= 50
+    assert stats["passes"] - before["passes"] == 1
+
+    view.refresh_message_sizes()
+    qtbot.waitUntil(lambda: view.layout_stats()["pending"] == 0)
+    # Nothing changed since the last pass, so the cached sizes are reused.
+    assert view.layout_stats()["layouts"] == stats["layouts"]
+    assert view.layout_stats()["skipped"] == stats["skipped"] + 1
+
+
+def test_bubble_narrows_when_markdown_is_replaced(qtbot):
+    view = chat_view()
+    qtbot.addWidget(view)
+    _, browser = view._create_message_row("assistant")
+    scheduler = bubble_layout_scheduler()
+    browser.setMarkdown("ein langer Satz " * 80)
+    scheduler.sync(browser)
+    assert browser.maximumWidth() == 700
+
+    # More characters than before, but every line is short.
+    browser.setMarkdown("\n\n".join(["kurz"] * 400))
+    scheduler.sync(browser)
+
+    assert browser.maximumWidth() < 700
+
+
+def test_bubble_cache_is_not_shared_with_later_views(qtbot):
+    view = chat_view()
+    qtbot.addWidget(view)
+    scheduler = bubble_layout_scheduler()
+    row, first = view._create_message_row("user")
+    first.setMarkdown("ein langer Satz " * 80)
+    scheduler.sync(first)
+    first_key = first.property(KEY_PROPERTY)
+    scheduler.forget(first)
+    row.deleteLater()
+    qtbot.wait(10)
+
+    _, second = view._create_message_row("user")
+    second.setMarkdown("kurz")
+    scheduler.sync(second)
+
+    assert second.property(KEY_PROPERTY) != first_key
+    assert second.maximumWidth() < 520
@@ -0,0 +1,34 @@
+from PyQt6.QtWidgets import QTextBrowser
+
+from view.markdown_stream import markdown_stream
+
+
+def _stream(qtbot, text, step=3):
+    view = QTextBrowser()
+    qtbot.addWidget(view)
+    renderer = markdown_stream(view)
+    for index in range(0, len(text), step):
+        renderer.append(text[index : index + step])
+    return view, renderer
+
+
+def test_markdown_stream_renders_finished_blocks_and_keeps_tail_plain(qtbot):
+    view, renderer = _stream(qtbot, "## Titel\n\nSatz mit **fett**.\n\nNoch **offen")
+
+    assert view.document().firstBlock().blockFormat().headingLevel() == 2
+    assert view.toPlainText().split("\n") == ["Titel", "Satz mit fett.", "Noch **offen"]
+    assert renderer.renders == 2
+
+
+def test_markdown_stream_keeps_code_fences_with_blank_lines_together(qtbot):
+    text = "```\nerste\n\nzweite\n```\n\nDanach"
+    view, renderer = _stream(qtbot, text)
+
+    assert renderer.renders == 1
+    assert "erste\n\nzweite" in view.toMarkdown()
+
+    renderer.finish()
+    reference = QTextBrowser()
+    qtbot.addWidget(reference)
+    reference.setMarkdown(text)
+    assert view.toMarkdown() == reference.toMarkdown()
@@ -0,0 +1,75 @@
+from controller.backend_client import backend_client
+from controller.chat_file_flow import chat_file_flow
+from controller.file_access_flow import file_access_flow
+from controller.text_cache import text_cache
+
+
+class FakeSettings:
+    def __init__(self, store):
+        self.store = dict(store)
+
+    def value(self, key, default=None, type=str):
+        return type(self.store.get(key, default))
+
+
+class FakeView:
+    def __init__(self):
+        self.errors = []
+
+    def show_error(self, msg: str):
+        self.errors.append(msg)
+
+
+class FakeController:
+    def __init__(self, base_url, tmp_path):
+        self.download_dir = tmp_path / "downloads"
+        self.download_dir.mkdir()
+        self.settings = FakeSettings({"files/default_dir": str(self.download_dir)})
+        self.api_client = backend_client(base_url)
+        self.auth_token = "token"
+        self.file_records = []
+        self.text_cache = text_cache(tmp_path / "text_cache")
+        self.datei_liste_view = FakeView()
+        self.chat_view = FakeView()
+        self.login_view = object()
+        self.stack = type("Stack", (), {"setCurrentWidget": lambda *a, **k: None})()
+
+
+def test_chat_context_and_open_file_share_one_local_copy(fake_backend, tmp_path):
+    record = fake_backend._add_file("kapitel.txt", "Lineare Algebra Grundlagen".encode("utf-8"))
+    controller = FakeController(fake_backend.base_url, tmp_path)
+    controller.file_records = [record]
+    chat_flow = chat_file_flow(controller)
+
+    entry = chat_flow.load_file_context({"id": record["id"], "name": "kapitel.txt"})
+
+    assert entry["content"] == "Lineare Algebra Grundlagen"
+    assert (controller.download_dir / "kapitel.txt").exists()
+    assert fake_backend.download_requests == 1
+
+    opened = file_access_flow(controller).ensure_local_file(record)
+    assert opened == controller.download_dir / "kapitel.txt"
+    assert fake_backend.download_requests == 1
+
+    # Without the extracted-text cache the synced copy still avoids the network.
+    controller.text_cache = text_cache(tmp_path / "fresh_text_cache")
+    again = chat_flow.load_file_context(record)
+    assert again["content"] == entry["content"]
+    assert fake_backend.download_requests == 1
+
+
+def test_stale_local_copy_is_refreshed(fake_backend, tmp_path):
+    record = fake_backend._add_file("blatt.txt", b"alt")
+    controller = FakeController(fake_backend.base_url, tmp_path)
+    controller.file_records = [record]
+    chat_flow = chat_file_flow(controller)
+    chat_flow.load_file_context(record)
+
+    fake_backend.file_bytes[str(record["id"])] = b"neuer Inhalt"
+    updated = dict(record, size=len(b"neuer Inhalt"), updated_at="2024-02-01T00:00:00")
+
+    entry = chat_flow.load_file_context(updated)
+
+    assert entry["content"] == "neuer Inhalt"
+    assert (controller.download_dir / "blatt.txt").read_bytes() == b"neuer Inhalt"
+    assert fake_backend.download_requests == 2
@@ -1,5 +1,8 @@
+import threading
+import time
 from pathlib import Path
 
+from controller.backend_client import backend_client
 from controller.file_mutation_flow import file_mutation_flow
 
 
@@ -19,13 +22,29 @@ class FakeDateiManager:
         return self.target
 
 
+class FakeSettings:
+    def __init__(self, store=None):
+        self.store = dict(store or {})
+
+    def value(self, key, default=None, type=str):
+        return type(self.store.get(key, default))
+
+
 class FakeView:
     def __init__(self):
         self.errors = []
+        self.progress = []
+        self.status = ""
 
     def show_error(self, msg: str):
         self.errors.append(msg)
 
+    def set_sync_progress(self, done: int, total: int):
+        self.progress.append((done, total))
+
+    def set_sync_status(self, text: str):
+        self.status = text
+
 
 class FakeStack:
     def __init__(self):
@@ -37,26 +56,40 @@ class FakeStack:
 
 class FakeController:
     def __init__(self, target: Path):
-        self.settings = object()
+        self.settings = FakeSettings()
         self.datei_liste_view = FakeView()
         self.login_view = object()
         self.stack = FakeStack()
         self.auth_token = "token"
         self.api_base_url = "http://example"
+        self.api_client = backend_client(self.api_base_url)
         self.file_records = []
         self.datei_manager = FakeDateiManager(target)
+        self._sync_thread = None
+        self._sync_worker = None
 
 
 class FakeResponse:
     def __init__(self, status_code=200, content=b"data"):
         self.status_code = status_code
+        self.headers = {}
         self._content = content
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.closed = True
 
     def iter_content(self, chunk_size=8192):
         yield self._content
 
 
-def test_sync_files_to_folder_writes_files(monkeypatch, tmp_path):
+def test_sync_files_to_folder_writes_files(qtbot, monkeypatch, tmp_path):
     controller = FakeController(tmp_path)
     controller.file_records = [{"id": 1, "name": "note.txt"}]
     flow = file_mutation_flow(controller)
@@ -66,15 +99,18 @@ def test_sync_files_to_folder_writes_files(monkeypatch, tmp_path):
         lambda settings, view: tmp_path,
     )
     monkeypatch.setattr(
-        "controller.file_mutation_flow.requests.get",
+        controller.api_client.session,
+        "request",
         lambda *args, **kwargs: FakeResponse(200, b"hello"),
     )
 
     flow.sync_files_to_folder()
+    qtbot.waitUntil(lambda: controller._sync_thread is None, timeout=5000)
     assert (tmp_path / "note.txt").read_bytes() == b"hello"
+    assert controller.datei_liste_view.progress[-1] == (1, 1)
 
 
-def test_sync_files_to_folder_handles_unauthorized(monkeypatch, tmp_path):
+def test_sync_files_to_folder_handles_unauthorized(qtbot, monkeypatch, tmp_path):
     controller = FakeController(tmp_path)
     controller.file_records = [{"id": 1, "name": "note.txt"}]
     flow = file_mutation_flow(controller)
@@ -84,10 +120,87 @@ def test_sync_files_to_folder_handles_unauthorized(monkeypatch, tmp_path):
         lambda settings, view: tmp_path,
     )
     monkeypatch.setattr(
-        "controller.file_mutation_flow.requests.get",
+        controller.api_client.session,
+        "request",
         lambda *args, **kwargs: FakeResponse(401, b""),
     )
 
     flow.sync_files_to_folder()
+    qtbot.waitUntil(lambda: controller._sync_thread is None, timeout=5000)
     assert controller.datei_liste_view.errors
     assert controller.stack.current == controller.login_view
+
+
+def test_sync_files_to_folder_runs_in_parallel(qtbot, monkeypatch, tmp_path):
+    controller = FakeController(tmp_path)
+    controller.settings = FakeSettings({"files/sync_concurrency": 4})
+    controller.file_records = [{"id": i, "name": f"file_{i}.txt"} for i in range(8)]
+    flow = file_mutation_flow(controller)
+
+    monkeypatch.setattr(
+        "controller.file_mutation_flow.resolve_download_dir",
+        lambda settings, view: tmp_path,
+    )
+
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def slow_request(*args, **kwargs):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return FakeResponse(200, b"x")
+
+    monkeypatch.setattr(controller.api_client.session, "request", slow_request)
+
+    flow.sync_files_to_folder()
+    assert controller._sync_thread is not None
+    qtbot.waitUntil(lambda: controller._sync_thread is None, timeout=5000)
+
+    assert len(list(tmp_path.glob("file_*.txt"))) == 8
+    assert 1 < active["peak"] <= 4
+    assert not controller.datei_liste_view.errors
+
+
+def test_sync_files_to_folder_uses_manifest(qtbot, monkeypatch, tmp_path):
+    controller = FakeController(tmp_path)
+    controller.file_records = [
+        {"id": 1, "name": "note.txt", "size": 5, "updated_at": "2024-01-01"},
+        {"id": 2, "name": "note.txt", "size": 5, "updated_at": "2024-01-01"},
+    ]
+    flow = file_mutation_flow(controller)
+
+    monkeypatch.setattr(
+        "controller.file_mutation_flow.resolve_download_dir",
+        lambda settings, view: tmp_path,
+    )
+    calls = []
+
+    def fake_request(method, url, **kwargs):
+        calls.append(url)
+        return FakeResponse(200, b"hello")
+
+    monkeypatch.setattr(controller.api_client.session, "request", fake_request)
+
+    flow.sync_files_to_folder()
+    qtbot.waitUntil(lambda: controller._sync_thread is None, timeout=5000)
+    assert (tmp_path / "note.txt").exists()
+    assert (tmp_path / "note_2.txt").exists()
+    assert len(calls) == 2
+
+    # Unchanged records must not start another pass.
+    flow.sync_files_to_folder()
+    assert controller._sync_thread is None
+    assert len(calls) == 2
+
+    controller.file_records = [
+        {"id": 1, "name": "note.txt", "size": 5, "updated_at": "2024-02-01"},
+    ]
+    flow.sync_files_to_folder()
+    qtbot.waitUntil(lambda: controller._sync_thread is None, timeout=5000)
+    assert calls[-1].endswith("/files/1/download")
+    assert len(calls) == 3
+    assert not (tmp_path / "note_2.txt").exists()
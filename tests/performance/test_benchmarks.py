@@ -1,5 +1,7 @@
 import pytest
 
+from controller.backend_client import backend_client
+from controller.file_list_flow import file_list_flow
 from controller.file_utils import normalize_file_records
 
 pytest.importorskip("pytest_benchmark")
@@ -12,3 +14,87 @@ def test_benchmark_normalize_file_records(benchmark):
     ]
     result = benchmark(normalize_file_records, payload)
     assert len(result) == 1000
+
+
+def _listing_controller(base_url):
+    view = type(
+        "View",
+        (),
+        {
+            "set_items": lambda self, items: None,
+            "show_error": lambda self, msg: None,
+            "clear_chat": lambda self: None,
+            "clear_chat_input": lambda self: None,
+            "set_selected_files": lambda self, names: None,
+        },
+    )()
+    controller = type("Controller", (), {})()
+    controller.api_client = backend_client(base_url)
+    controller.auth_token = "token"
+    controller.file_records = []
+    controller.visible_file_records = []
+    controller.file_sort_mode = "Name (A-Z)"
+    controller.file_search_query = ""
+    controller.datei_liste_view = view
+    controller.login_view = view
+    controller.chat_view = view
+    controller.stack = type("Stack", (), {"setCurrentWidget": lambda self, w: None})()
+    controller.file_mutation_flow = type(
+        "Sync", (), {"sync_files_to_folder": lambda self: None}
+    )()
+    controller.chat_core_flow = type("ChatCore", (), {"reset_session": lambda self: None})()
+    return controller
+
+
+def _large_listing_backend(fake_backend):
+    fake_backend.files = [
+        {"id": i, "name": f"file_{i}.pdf", "size": i, "created_at": "2024-01-01T00:00:00"}
+        for i in range(2000)
+    ]
+
+
+def test_benchmark_listing_refresh_full(benchmark, fake_backend):
+    _large_listing_backend(fake_backend)
+    flow = file_list_flow(_listing_controller(fake_backend.base_url))
+
+    def full_refresh():
+        flow._listing_cache = None
+        flow.load_files_and_show()
+
+    benchmark(full_refresh)
+    assert set(fake_backend.listing_statuses) == {200}
+
+
+def test_benchmark_listing_refresh_not_modified(benchmark, fake_backend):
+    _large_listing_backend(fake_backend)
+    flow = file_list_flow(_listing_controller(fake_backend.base_url))
+    flow.load_files_and_show()
+
+    benchmark(flow.load_files_and_show)
+    assert set(fake_backend.listing_statuses[1:]) == {304}
+
+
+def _generated_pdf(pages: int) -> bytes:
+    from pdf_factory import make_pdf
+
+    return make_pdf([f"Kapitel {i} Beispieltext" for i in range(pages)])
+
+
+# "serial" runs the document as one pool task. Each page-range task of "process_pool"
+# re-parses the full PDF from its bytes, so parse time bounds the speed-up.
+@pytest.mark.parametrize("parallel", [False, True], ids=["serial", "process_pool"])
+def test_benchmark_pdf_extraction_300_pages(benchmark, parallel):
+    from controller import pdf_extractor
+
+    pdf = _generated_pdf(300)
+    try:
+        pages = benchmark.pedantic(
+            pdf_extractor.extract_pdf_text,
+            args=(pdf,),
+            kwargs={"parallel": parallel},
+            rounds=3,
+            warmup_rounds=1,
+        )
+    finally:
+        pdf_extractor.shutdown_pool()
+    assert len(pages) == 300
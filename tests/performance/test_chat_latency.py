@@ -0,0 +1,147 @@
+import statistics
+import time
+
+import pytest
+
+from controller.chat_core_flow import chat_core_flow
+from controller.chat_request_queue import chat_request_queue
+from controller.chat_worker_pool import chat_worker_pool
+from controller.context_index import context_index
+from controller.ki_analyzer import ki_analyzer
+
+pytest.importorskip("pytest_benchmark")
+
+TURNS = 20
+
+
+class TimingChatView:
+    """Chat view stand-in that timestamps the first delta and the end of each reply."""
+
+    def __init__(self):
+        self.sent_at = 0.0
+        self.first_delta_at = None
+        self.done_at = None
+
+    def add_message(self, role, text, stream=False):
+        if role == "user":
+            self.sent_at = time.perf_counter()
+            self.first_delta_at = None
+            self.done_at = None
+
+    def append_stream_delta(self, text):
+        if self.first_delta_at is None:
+            self.first_delta_at = time.perf_counter()
+
+    def finish_stream(self, text):
+        self.done_at = time.perf_counter()
+
+    def stop_loading_and_stream(self, text):
+        if self.first_delta_at is None:
+            self.first_delta_at = time.perf_counter()
+        self.done_at = time.perf_counter()
+
+    def is_temp_chat_checked(self):
+        return True
+
+    def show_error(self, message):
+        raise AssertionError(message)
+
+    def set_cancel_enabled(self, enabled):
+        pass
+
+    def set_queue_depth(self, depth):
+        pass
+
+    def set_temp_chat_enabled(self, enabled):
+        pass
+
+    def start_loading(self):
+        pass
+
+
+class _Settings:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def value(self, key, default=None, type=str):
+        return self.stream if key == "ai/stream" else default
+
+
+class _SettingsFlow:
+    def build_ai_preferences(self):
+        return "Tone: Neutral"
+
+
+def _chat_controller(stream):
+    controller = type("Controller", (), {})()
+    controller.auth_token = "token"
+    controller.api_base_url = ""
+    controller.settings = _Settings(stream)
+    controller.settings_flow = _SettingsFlow()
+    controller.chat_view = TimingChatView()
+    controller.datei_liste_view = controller.chat_view
+    controller.chat_started = False
+    controller.is_temp_chat = True
+    controller.current_chat_id = None
+    controller.chat_messages = []
+    controller.chat_file_context = []
+    controller.chat_file_meta = []
+    controller.chat_context_index = context_index()
+    controller.chat_files_loading = {}
+    controller.pending_chat_files = None
+    controller.pending_chat_mode = "chat"
+    controller.unanswered_chat_sessions = {}
+    controller.chat_request_queue = chat_request_queue()
+    controller.ki_analyzer = ki_analyzer()
+    controller.summarizer = None
+    flow = chat_core_flow(controller)
+    controller.chat_workers = chat_worker_pool(
+        make_worker=flow.make_chat_worker,
+        on_delta=flow.on_request_delta,
+        on_finished=flow.on_request_finished,
+        on_failed=flow.on_request_failed,
+    )
+    return controller, flow
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+@pytest.mark.parametrize("stream", [True, False], ids=["stream", "blocking"])
+def test_benchmark_chat_turn_latency(benchmark, qtbot, fake_openai, stream):
+    fake_openai.ttft_s = 0.05
+    fake_openai.tokens_per_s = 400
+    fake_openai.set_reply_tokens(40)
+    controller, flow = _chat_controller(stream)
+    view = controller.chat_view
+    ttft, total = [], []
+
+    def turn():
+        flow.send_text("Wie lautet die Antwort?")
+        qtbot.waitUntil(lambda: view.done_at is not None, timeout=5000)
+        ttft.append(view.first_delta_at - view.sent_at)
+        total.append(view.done_at - view.sent_at)
+
+    try:
+        benchmark.pedantic(turn, rounds=TURNS, iterations=1, warmup_rounds=1)
+    finally:
+        controller.ki_analyzer.close()
+    ttft, total = ttft[1:], total[1:]
+
+    benchmark.extra_info.update(
+        {
+            "ttft_p50_s": statistics.median(ttft),
+            "ttft_p95_s": _percentile(ttft, 95),
+            "turn_p50_s": statistics.median(total),
+            "turn_p95_s": _percentile(total, 95),
+        }
+    )
+    assert len(controller.chat_messages) == 2 * (TURNS + 1)
+    generation_s = 39 / fake_openai.tokens_per_s
+    if stream:
+        # The first token shows up well before generation is over.
+        assert statistics.median(ttft) < fake_openai.ttft_s + generation_s / 2
+    else:
+        assert statistics.median(ttft) >= fake_openai.ttft_s + generation_s
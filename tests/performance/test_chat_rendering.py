@@ -0,0 +1,110 @@
+import statistics
+import time
+
+import pytest
+from PyQt6.QtWidgets import QTextBrowser
+
+from view.markdown_stream import markdown_stream
+
+pytest.importorskip("pytest_benchmark")
+
+PARAGRAPH = "Ein Absatz mit **fett** und `code` sowie genug Text fuer mehrere Zeilen. " * 3
+ANSWER = "\n\n".join(
+    f"## Abschnitt {i}\n\n{PARAGRAPH}\n\n- Punkt a\n- Punkt b" for i in range(40)
+)[:6000]
+STEP = 3
+
+
+def _frame_times(qtbot, render_step):
+    view = QTextBrowser()
+    qtbot.addWidget(view)
+    view.document().setTextWidth(600)
+    step = render_step(view)
+    layout = view.document().documentLayout()
+    times = []
+    for index in range(0, len(ANSWER), STEP):
+        started = time.perf_counter()
+        step(index)
+        layout.documentSize()
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def _incremental(view):
+    renderer = markdown_stream(view)
+    return lambda index: renderer.append(ANSWER[index : index + STEP])
+
+
+def _full_prefix(view):
+    return lambda index: view.setMarkdown(ANSWER[: index + STEP])
+
+
+@pytest.mark.parametrize(
+    "render_step", [_incremental, _full_prefix], ids=["incremental", "full_prefix"]
+)
+def test_benchmark_typing_frame_time(benchmark, qtbot, render_step):
+    frames = benchmark.pedantic(
+        _frame_times, args=(qtbot, render_step), rounds=1, iterations=1
+    )
+    first = statistics.median(frames[:200])
+    last = statistics.median(frames[-200:])
+    benchmark.extra_info.update({"first_frames_ms": first * 1000, "last_frames_ms": last * 1000})
+    if render_step is _incremental:
+        # Frame time must not grow with the length of the message.
+        assert last < first * 3 + 0.0005
+
+
+@pytest.mark.parametrize("count", [100, 1000])
+def test_benchmark_open_long_chat(benchmark, qtbot, count):
+    from view.chat_view import chat_view
+
+    messages = [
+        ("user" if i % 2 else "assistant", f"Nachricht {i} mit **etwas** Text. " * (1 + i % 5))
+        for i in range(count)
+    ]
+    view = chat_view()
+    qtbot.addWidget(view)
+    view.resize(900, 700)
+    view.show()
+
+    def open_chat():
+        view.clear_chat()
+        view.add_messages(messages)
+
+    benchmark.pedantic(open_chat, rounds=5, iterations=1, warmup_rounds=1)
+    # Only the tail near the viewport gets widgets, whatever the length of the chat.
+    assert view.materialized_count() < 40
+
+
+def test_benchmark_chat_view_typing_frames(benchmark, qtbot):
+    from view.chat_view import chat_view
+
+    view = chat_view()
+    qtbot.addWidget(view)
+    view.resize(900, 700)
+    view.show()
+
+    def type_answer():
+        view.clear_chat()
+        view.add_message("assistant", ANSWER, stream=True)
+        view._typing_timer.stop()
+        frames = []
+        while view._typing_label is not None:
+            started = time.perf_counter()
+            view._on_typing_tick()
+            # One coalesced layout pass per frame, as the scheduler timer would run it.
+            view._bubble_layout.flush()
+            frames.append(time.perf_counter() - started)
+        return frames
+
+    frames = benchmark.pedantic(type_answer, rounds=1, iterations=1)
+    first = statistics.median(frames[:200])
+    last = statistics.median(frames[-200:])
+    benchmark.extra_info.update(
+        {
+            "first_frames_ms": first * 1000,
+            "last_frames_ms": last * 1000,
+            "layout_passes": view.layout_stats()["passes"],
+        }
+    )
+    assert last < first * 3 + 0.0005
@@ -1,6 +1,9 @@
+import hashlib
 import json
+import re
+from email.utils import formatdate
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from threading import Thread
+from threading import Lock, Thread
 from urllib.parse import parse_qs, urlparse
 
 
@@ -27,6 +30,20 @@ class FakeBackendServer:
             "1": b"PDF-DATA",
             "2": b"Notes",
         }
+        self.connections = 0
+        self.range_requests = []
+        self.listing_statuses = []
+        self.listing_last_modified = formatdate(usegmt=True)
+        # file id -> byte count after which the next download drops the connection
+        self.drop_after_bytes = {}
+        # Path advertised for batch deletes; None hides the endpoint.
+        self.bulk_delete_path = None
+        # Queued (status, retry_after) answers served before normal handling.
+        self.injected_failures = []
+        self.delete_requests = 0
+        self.download_requests = 0
+        self.bulk_delete_requests = 0
+        self._lock = Lock()
         self.httpd = None
         self.thread = None
         self.port = None
@@ -49,10 +66,46 @@ class FakeBackendServer:
         if self.thread is not None:
             self.thread.join(timeout=2)
 
+    def _add_file(self, name: str, data: bytes) -> dict:
+        with self._lock:
+            file_id = max((int(f.get("id") or 0) for f in self.files), default=0) + 1
+            record = {
+                "id": file_id,
+                "name": name,
+                "size": len(data),
+                "created_at": "2024-01-03T00:00:00",
+            }
+            self.files = [*self.files, record]
+            self.file_bytes[str(file_id)] = data
+            self.listing_last_modified = formatdate(usegmt=True)
+            return dict(record)
+
+    def _remove_file(self, file_id: str) -> bool:
+        with self._lock:
+            if file_id not in self.file_bytes:
+                return False
+            self.file_bytes.pop(file_id, None)
+            self.files = [f for f in self.files if str(f.get("id")) != file_id]
+            self.listing_last_modified = formatdate(usegmt=True)
+            return True
+
     def _build_handler(self):
         server = self
 
         class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps connections alive so client pooling is observable.
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def _read_body(self):
+                length = int(self.headers.get("Content-Length", "0") or 0)
+                return self.rfile.read(length) if length else b""
+
             def log_message(self, format, *args):
                 return
 
@@ -77,6 +130,10 @@ class FakeBackendServer:
 
             def do_POST(self):
                 parsed = urlparse(self.path)
+                if server.injected_failures:
+                    self._read_body()
+                    if self._inject_failure():
+                        return
                 if parsed.path == "/token":
                     length = int(self.headers.get("Content-Length", "0"))
                     body = self.rfile.read(length).decode("utf-8")
@@ -102,20 +159,28 @@ class FakeBackendServer:
                     self._send_json(201, {"status": "created"})
                     return
                 if parsed.path == "/files/upload":
+                    body = self._read_body()
                     if not self._is_authorized():
                         self._send_json(401, {"detail": "unauthorized"})
                         return
-                    self._send_json(201, {"status": "uploaded"})
+                    name, data = self._parse_upload(body)
+                    self._send_json(201, server._add_file(name, data))
+                    return
+                if server.bulk_delete_path and parsed.path == server.bulk_delete_path:
+                    self._send_bulk_delete()
                     return
+                self._read_body()
                 self._send_json(404, {"detail": "not found"})
 
             def do_GET(self):
+                if self._inject_failure():
+                    return
                 parsed = urlparse(self.path)
                 if parsed.path == "/files/":
                     if not self._is_authorized():
                         self._send_json(401, {"detail": "unauthorized"})
                         return
-                    self._send_json(200, list(server.files))
+                    self._send_listing()
                     return
                 if parsed.path.startswith("/files/") and parsed.path.endswith("/download"):
                     if not self._is_authorized():
@@ -127,22 +192,130 @@ class FakeBackendServer:
                     if data is None:
                         self._send_json(404, {"detail": "not found"})
                         return
-                    self._send_bytes(200, data, content_type="application/octet-stream")
+                    with server._lock:
+                        server.download_requests += 1
+                    self._send_download(file_id, data)
                     return
                 self._send_json(404, {"detail": "not found"})
 
+            def _parse_upload(self, body):
+                content_type = self.headers.get("Content-Type", "")
+                match = re.search(r"boundary=([^;]+)", content_type)
+                if match is None:
+                    return "upload.bin", body
+                delimiter = b"--" + match.group(1).strip().encode("ascii")
+                for part in body.split(delimiter)[1:]:
+                    head, _, data = part.partition(b"\r\n\r\n")
+                    name = re.search(rb'filename="([^"]*)"', head)
+                    if name is not None:
+                        return name.group(1).decode("utf-8"), data[: -len(b"\r\n")]
+                return "upload.bin", body
+
+            def _inject_failure(self) -> bool:
+                with server._lock:
+                    if not server.injected_failures:
+                        return False
+                    status, retry_after = server.injected_failures.pop(0)
+                body = json.dumps({"detail": "injected"}).encode("utf-8")
+                self.send_response(status)
+                if retry_after is not None:
+                    self.send_header("Retry-After", str(retry_after))
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return True
+
+            def _send_bulk_delete(self):
+                body = self._read_body()
+                if not self._is_authorized():
+                    self._send_json(401, {"detail": "unauthorized"})
+                    return
+                with server._lock:
+                    server.bulk_delete_requests += 1
+                ids = [str(file_id) for file_id in json.loads(body or b"{}").get("ids", [])]
+                deleted, failed = [], []
+                for file_id in ids:
+                    if server._remove_file(file_id):
+                        deleted.append(file_id)
+                    else:
+                        failed.append({"id": file_id, "detail": "not found"})
+                self._send_json(200, {"deleted": deleted, "failed": failed})
+
+            def _send_listing(self):
+                body = json.dumps(list(server.files)).encode("utf-8")
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                if_none_match = self.headers.get("If-None-Match")
+                if_modified_since = self.headers.get("If-Modified-Since")
+                if if_none_match is not None:
+                    not_modified = if_none_match == etag
+                else:
+                    not_modified = if_modified_since == server.listing_last_modified
+                status = 304 if not_modified else 200
+                server.listing_statuses.append(status)
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", server.listing_last_modified)
+                if server.bulk_delete_path:
+                    self.send_header("X-Bulk-Delete", server.bulk_delete_path)
+                if not_modified:
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_download(self, file_id, data):
+                total = len(data)
+                start, end = 0, total - 1
+                status = 200
+                range_header = self.headers.get("Range", "")
+                match = re.match(r"bytes=(\d+)-(\d*)$", range_header)
+                if match:
+                    server.range_requests.append((file_id, range_header))
+                    start = int(match.group(1))
+                    end = int(match.group(2)) if match.group(2) else total - 1
+                    if start >= total:
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{total}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    end = min(end, total - 1)
+                    status = 206
+                body = data[start : end + 1]
+                self.send_response(status)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+                self.end_headers()
+                drop_after = server.drop_after_bytes.pop(file_id, None)
+                if drop_after is not None and drop_after < len(body):
+                    self.wfile.write(body[:drop_after])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(body)
+
             def do_DELETE(self):
+                if self._inject_failure():
+                    return
                 parsed = urlparse(self.path)
                 if parsed.path.startswith("/files/"):
                     if not self._is_authorized():
                         self._send_json(401, {"detail": "unauthorized"})
                         return
+                    with server._lock:
+                        server.delete_requests += 1
                     parts = parsed.path.strip("/").split("/")
                     file_id = parts[1] if len(parts) > 1 else ""
-                    if file_id in server.file_bytes:
-                        server.file_bytes.pop(file_id, None)
-                        server.files = [f for f in server.files if str(f.get("id")) != file_id]
+                    if server._remove_file(file_id):
                         self.send_response(204)
+                        self.send_header("Content-Length", "0")
                         self.end_headers()
                         return
                     self._send_json(404, {"detail": "not found"})
@@ -0,0 +1,193 @@
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+
+
+class FakeOpenAIServer:
+    """OpenAI-compatible /chat/completions stand-in with optional SSE streaming.
+
+    Latency, throughput, failures and reply size are configurable so chat
+    latency can be measured end to end without the real API.
+    """
+
+    def __init__(self, reply="Hallo, wie kann ich helfen?", api_key="test", seed=0):
+        self.api_key = api_key
+        self.reply = reply
+        # Characters per streamed delta and pauses before the first / between deltas.
+        self.chunk_chars = 4
+        self.ttft_s = 0.0
+        self.delta_delay_s = 0.0
+        # Generation speed; one delta counts as one token. Overrides delta_delay_s when set.
+        self.tokens_per_s = 0.0
+        # Share of requests answered with error_status instead of a completion.
+        self.error_rate = 0.0
+        self.error_status = 503
+        self.requests = []
+        self.request_bytes = []
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = Lock()
+        self.httpd = None
+        self.thread = None
+        self.port = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def start(self, port=0):
+        handler = self._build_handler()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def set_reply_tokens(self, tokens: int):
+        """Replace the reply with generated text of about ``tokens`` deltas."""
+        words = [f"Wort{i % 100:02d}" for i in range(max(1, int(tokens)))]
+        self.chunk_chars = 7
+        self.reply = "".join(f"{word} " for word in words).rstrip() + "."
+
+    def token_delay(self):
+        if self.tokens_per_s > 0:
+            return 1.0 / self.tokens_per_s
+        return self.delta_delay_s
+
+    def should_fail(self):
+        with self._lock:
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return failed
+
+    def chunks(self):
+        text = self.reply
+        return [text[i : i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+
+    def _build_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                return
+
+            def _send_json(self, status, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", "0") or 0)
+                body = self.rfile.read(length) if length else b""
+                if self.path.rstrip("/") != "/v1/chat/completions":
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                if self.headers.get("Authorization") != f"Bearer {server.api_key}":
+                    self._send_json(401, {"error": {"message": "invalid api key"}})
+                    return
+                payload = json.loads(body or b"{}")
+                with server._lock:
+                    server.requests.append(payload)
+                    server.request_bytes.append(len(body))
+                if server.should_fail():
+                    time.sleep(server.ttft_s)
+                    self._send_json(
+                        server.error_status, {"error": {"message": "simulated failure"}}
+                    )
+                    return
+                if payload.get("stream"):
+                    self._send_stream(payload)
+                    return
+                # Without streaming the client waits for the whole generation.
+                time.sleep(server.ttft_s + server.token_delay() * max(0, len(server.chunks()) - 1))
+                self._send_json(
+                    200,
+                    {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion",
+                        "model": payload.get("model"),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": server.reply},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                    },
+                )
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send_stream(self, payload):
+                # Chunked encoding like the real API, so clients see each event immediately.
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                time.sleep(server.ttft_s)
+                for index, text in enumerate(server.chunks()):
+                    if index:
+                        time.sleep(server.token_delay())
+                    event = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "model": payload.get("model"),
+                        "choices": [{"index": 0, "delta": {"content": text}}],
+                    }
+                    self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                done = {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+                self._write_chunk(f"data: {json.dumps(done)}\n\n".encode("utf-8"))
+                self._write_chunk(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in server.")
+    parser.add_argument("--ttft", type=float, default=0.3, help="seconds to first token")
+    parser.add_argument("--tps", type=float, default=50.0, help="tokens per second")
+    parser.add_argument("--tokens", type=int, default=200, help="reply length in tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--api-key", default="test")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(api_key=args.api_key)
+    server.ttft_s = args.ttft
+    server.tokens_per_s = args.tps
+    server.error_rate = args.error_rate
+    server.error_status = args.error_status
+    server.set_reply_tokens(args.tokens)
+    server.start(args.port)
+    print(f"OPENAI_BASE_URL={server.base_url} OPENAI_API_KEY={server.api_key}")
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
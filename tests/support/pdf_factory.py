@@ -0,0 +1,57 @@
+"""Generates simple multi-page text PDFs for extraction tests and benchmarks."""
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: list[str], lines_per_page: int = 40) -> bytes:
+    """Build a valid PDF with one Helvetica text block per page.
+
+    Args:
+        pages (list[str]): Text per page; repeated over ``lines_per_page`` lines.
+        lines_per_page (int): Lines drawn per page to give the extractor work.
+
+    Returns:
+        bytes: PDF document.
+    """
+    objects: list[bytes] = []
+    page_ids = []
+    font_id = 3
+    next_id = 4
+    for text in pages:
+        lines = [f"BT /F1 10 Tf 40 {800 - 18 * i} Td ({_escape(text)} {i}) Tj ET" for i in range(lines_per_page)]
+        stream = "\n".join(lines).encode("latin-1")
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        objects.append(
+            (content_id, b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        )
+        objects.append(
+            (
+                page_id,
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id),
+            )
+        )
+        page_ids.append(page_id)
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids).encode("ascii")
+    objects = [
+        (1, b"<< /Type /Catalog /Pages 2 0 R >>"),
+        (2, b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)),
+        (font_id, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"),
+        *objects,
+    ]
+    objects.sort()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id, body in objects:
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n" % obj_id + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for obj_id, _ in objects:
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
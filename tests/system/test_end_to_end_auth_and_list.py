@@ -1,4 +1,5 @@
 from controller.auth_flow import auth_flow
+from controller.backend_client import backend_client
 from controller.file_list_flow import file_list_flow
 from view.datei_liste_view import datei_liste_view
 from view.login_view import login_view
@@ -57,6 +58,14 @@ class FakeFileMutationFlow:
         pass
 
 
+class FakeChatCoreFlow:
+    def __init__(self):
+        self.resets = 0
+
+    def reset_session(self):
+        self.resets += 1
+
+
 class Controller:
     pass
 
@@ -76,6 +85,7 @@ def test_end_to_end_login_and_list(qtbot, fake_backend):
 
     controller = Controller()
     controller.api_base_url = fake_backend.base_url
+    controller.api_client = backend_client(fake_backend.base_url)
     controller.auth_token = None
     controller.current_username = None
     controller.settings = DummySettings()
@@ -93,6 +103,7 @@ def test_end_to_end_login_and_list(qtbot, fake_backend):
     controller.chat_view = DummyChatView()
     controller.stack = DummyStack()
     controller.file_mutation_flow = FakeFileMutationFlow()
+    controller.chat_core_flow = FakeChatCoreFlow()
 
     controller.file_list_flow = file_list_flow(controller)
     flow = auth_flow(controller)
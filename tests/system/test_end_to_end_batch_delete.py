@@ -0,0 +1,121 @@
+import pytest
+from PyQt6.QtWidgets import QMessageBox
+
+from controller.backend_client import backend_client
+from controller.file_list_flow import file_list_flow
+from controller.file_mutation_flow import file_mutation_flow
+
+
+class FakeSettings:
+    def value(self, key, default=None, type=str):
+        return default
+
+
+class FakeView:
+    def __init__(self):
+        self.errors = []
+
+    def show_error(self, msg: str):
+        self.errors.append(msg)
+
+    def set_items(self, items):
+        self.items = items
+
+    def get_checked_indices(self):
+        return list(range(len(self.items)))
+
+    def get_selected_indices(self):
+        return []
+
+    def clear_chat(self):
+        pass
+
+    def clear_chat_input(self):
+        pass
+
+    def set_selected_files(self, names):
+        pass
+
+    def set_delete_progress(self, done, total):
+        pass
+
+    def set_delete_status(self, text):
+        pass
+
+
+class FakeStack:
+    def __init__(self):
+        self.current = None
+
+    def setCurrentWidget(self, widget):
+        self.current = widget
+
+
+class FakeChatCoreFlow:
+    def __init__(self):
+        self.resets = 0
+
+    def reset_session(self):
+        self.resets += 1
+
+
+class Controller:
+    pass
+
+
+def _build_controller(fake_backend):
+    controller = Controller()
+    controller.api_client = backend_client(fake_backend.base_url)
+    controller.auth_token = "token"
+    controller.settings = FakeSettings()
+    controller.file_records = []
+    controller.visible_file_records = []
+    controller.file_sort_mode = "Name (A-Z)"
+    controller.file_search_query = ""
+    controller.bulk_delete_path = None
+    controller.datei_liste_view = FakeView()
+    controller.login_view = FakeView()
+    controller.chat_view = FakeView()
+    controller.stack = FakeStack()
+    controller.chat_core_flow = FakeChatCoreFlow()
+    controller._delete_thread = None
+    controller._delete_worker = None
+    controller.file_list_flow = file_list_flow(controller)
+    controller.file_mutation_flow = file_mutation_flow(controller)
+    controller.file_mutation_flow.sync_files_to_folder = lambda: None
+    return controller
+
+
+@pytest.fixture
+def many_files(fake_backend):
+    fake_backend.files = [
+        {"id": i, "name": f"file_{i}.txt", "size": 1, "created_at": "2024-01-01T00:00:00"}
+        for i in range(1, 31)
+    ]
+    fake_backend.file_bytes = {str(i): b"x" for i in range(1, 31)}
+    return fake_backend
+
+
+@pytest.mark.parametrize("bulk_path", [None, "/files/bulk-delete"])
+def test_batch_delete_refreshes_listing_once(qtbot, monkeypatch, many_files, bulk_path):
+    many_files.bulk_delete_path = bulk_path
+    monkeypatch.setattr(
+        "controller.file_mutation_flow.QMessageBox.question",
+        lambda *a, **k: QMessageBox.StandardButton.Yes,
+    )
+    controller = _build_controller(many_files)
+    controller.file_list_flow.load_files_and_show()
+    assert controller.bulk_delete_path == bulk_path
+
+    controller.file_mutation_flow.on_delete_clicked()
+    qtbot.waitUntil(lambda: controller._delete_thread is None, timeout=5000)
+
+    assert many_files.listing_statuses == [200, 200]
+    assert controller.file_records == []
+    assert not controller.datei_liste_view.errors
+    if bulk_path:
+        assert many_files.bulk_delete_requests == 1
+        assert many_files.delete_requests == 0
+    else:
+        assert many_files.bulk_delete_requests == 0
+        assert many_files.delete_requests == 30
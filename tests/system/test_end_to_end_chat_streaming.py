@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from controller.cancellation import cancellation_token, request_cancelled
+from controller.chat_worker import chat_worker
+from controller.ki_analyzer import iter_sse_deltas, ki_analyzer
+
+
+MESSAGES = [{"role": "user", "content": "Hallo"}]
+
+
+def test_chat_stream_delivers_deltas_before_completion(fake_openai):
+    fake_openai.reply = "Das ist eine gestreamte Antwort."
+    fake_openai.delta_delay_s = 0.02
+    arrivals = []
+    started = time.perf_counter()
+
+    text = ki_analyzer().chat_stream(
+        MESSAGES, on_delta=lambda delta: arrivals.append((time.perf_counter(), delta))
+    )
+    finished = time.perf_counter()
+
+    assert text == fake_openai.reply
+    assert "".join(delta for _, delta in arrivals) == fake_openai.reply
+    assert len(arrivals) > 1
+    # The first fragment is visible long before the whole answer is in.
+    assert arrivals[0][0] - started < finished - started - 0.05
+    assert fake_openai.requests[-1]["stream"] is True
+
+
+def test_chat_worker_emits_deltas_then_result(qtbot, fake_openai):
+    fake_openai.reply = "Antwort in Teilen"
+    worker = chat_worker(
+        mode="chat",
+        payload={"messages": MESSAGES},
+        analyzer=ki_analyzer(),
+        api_base_url="",
+        auth_token="",
+        ai_prefs="",
+        stream=True,
+    )
+    deltas = []
+    worker.delta.connect(deltas.append)
+
+    with qtbot.waitSignal(worker.finished, timeout=5000) as blocker:
+        worker.run()
+
+    assert blocker.args[0] == {"mode": "chat", "assistant": "Antwort in Teilen", "streamed": True}
+    assert "".join(deltas) == "Antwort in Teilen"
+
+
+def test_iter_sse_deltas_raises_on_error_event():
+    lines = [
+        b'data: {"choices":[{"delta":{"content":"a"}}]}',
+        b"",
+        b'data: {"error":{"message":"boom"}}',
+    ]
+    with pytest.raises(RuntimeError, match="boom"):
+        list(iter_sse_deltas(lines))
+
+
+def test_cancel_closes_running_stream_immediately(fake_openai):
+    fake_openai.reply = "x" * 200
+    fake_openai.delta_delay_s = 0.5
+    token = cancellation_token()
+    deltas = []
+
+    def on_delta(delta):
+        deltas.append(delta)
+        token.cancel()
+
+    started = time.perf_counter()
+    with pytest.raises(request_cancelled):
+        ki_analyzer().chat_stream(MESSAGES, on_delta=on_delta, cancellation=token)
+
+    # The remaining ~25 s of deltas are never waited for.
+    assert time.perf_counter() - started < 2.0
+    assert len(deltas) == 1
+
+
+def test_cancel_interrupts_retry_backoff(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    analyzer = ki_analyzer(max_wiederholungen=3)
+    monkeypatch.setattr(analyzer._retry, "next_delay", lambda *args: 30.0)
+    token = cancellation_token()
+
+    def failing_post(*args, **kwargs):
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(analyzer.session, "post", failing_post)
+    threading.Timer(0.1, token.cancel).start()
+    started = time.perf_counter()
+    with pytest.raises(request_cancelled):
+        analyzer.chat(MESSAGES, cancellation=token)
+    assert time.perf_counter() - started < 1.0
+
+
+def test_consecutive_chats_reuse_one_connection(fake_openai):
+    analyzer = ki_analyzer()
+    for _ in range(3):
+        assert analyzer.chat(MESSAGES) == fake_openai.reply
+    metrics = analyzer.metrics()
+    analyzer.close()
+
+    assert metrics["connections_opened"] == 1
+    assert metrics["connections_reused"] == 2
+
+
+def test_simulated_server_errors_are_retried(monkeypatch, fake_openai):
+    fake_openai.error_rate = 1.0
+    analyzer = ki_analyzer(max_wiederholungen=2)
+    monkeypatch.setattr(analyzer._retry, "_sleep", lambda s: None)
+
+    with pytest.raises(RuntimeError, match="503"):
+        analyzer.chat(MESSAGES)
+
+    assert fake_openai.errors == 2
+    assert analyzer.metrics()["retries"] == 1
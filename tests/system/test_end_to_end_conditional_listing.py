@@ -0,0 +1,155 @@
+from controller.backend_client import backend_client
+from controller.file_list_flow import file_list_flow
+from controller.retry_policy import retry_policy
+
+
+class FakeView:
+    def __init__(self):
+        self.errors = []
+        self.set_items_calls = 0
+
+    def show_error(self, msg: str):
+        self.errors.append(msg)
+
+    def set_items(self, items):
+        self.set_items_calls += 1
+
+    def clear_chat(self):
+        pass
+
+    def clear_chat_input(self):
+        pass
+
+    def set_selected_files(self, names):
+        pass
+
+
+class FakeStack:
+    def __init__(self):
+        self.current = None
+
+    def setCurrentWidget(self, widget):
+        self.current = widget
+
+
+class FakeFileMutationFlow:
+    def __init__(self):
+        self.sync_calls = 0
+
+    def sync_files_to_folder(self):
+        self.sync_calls += 1
+
+
+class FakeChatCoreFlow:
+    def __init__(self):
+        self.resets = 0
+
+    def reset_session(self):
+        self.resets += 1
+
+
+class Controller:
+    pass
+
+
+def _build_controller(base_url: str):
+    controller = Controller()
+    controller.api_client = backend_client(base_url)
+    controller.auth_token = "token"
+    controller.file_records = []
+    controller.visible_file_records = []
+    controller.file_sort_mode = "Name (A-Z)"
+    controller.file_search_query = ""
+    controller.datei_liste_view = FakeView()
+    controller.login_view = FakeView()
+    controller.chat_view = FakeView()
+    controller.stack = FakeStack()
+    controller.file_mutation_flow = FakeFileMutationFlow()
+    controller.chat_core_flow = FakeChatCoreFlow()
+    return controller
+
+
+def test_unchanged_listing_is_served_from_cache(fake_backend):
+    controller = _build_controller(fake_backend.base_url)
+    flow = file_list_flow(controller)
+
+    flow.load_files_and_show()
+    first_records = controller.file_records
+    flow.load_files_and_show()
+
+    assert fake_backend.listing_statuses == [200, 304]
+    assert controller.file_records is first_records
+    assert controller.datei_liste_view.set_items_calls == 1
+    assert controller.file_mutation_flow.sync_calls == 1
+    assert controller.stack.current == controller.datei_liste_view
+
+
+def test_changed_listing_is_reloaded(fake_backend):
+    controller = _build_controller(fake_backend.base_url)
+    flow = file_list_flow(controller)
+
+    flow.load_files_and_show()
+    controller.api_client.delete("/files/2", token="token", timeout=5)
+    flow.load_files_and_show()
+
+    assert fake_backend.listing_statuses == [200, 200]
+    assert [record["id"] for record in controller.file_records] == [1]
+    assert controller.file_mutation_flow.sync_calls == 2
+
+
+def test_cached_listing_is_restored_after_logout(fake_backend):
+    controller = _build_controller(fake_backend.base_url)
+    flow = file_list_flow(controller)
+
+    flow.load_files_and_show()
+    controller.file_records = []
+    flow.load_files_and_show()
+
+    assert fake_backend.listing_statuses == [200, 304]
+    assert len(controller.file_records) == 2
+    assert controller.datei_liste_view.set_items_calls == 2
+
+
+class StaleProxyClient:
+    """Answers the first listing with 304 although no validators were sent."""
+
+    def __init__(self, client):
+        self.client = client
+        self.sent_headers = []
+
+    def get(self, path, *, headers=None, **kwargs):
+        self.sent_headers.append(dict(headers or {}))
+        resp = self.client.get(path, headers=headers, **kwargs)
+        if len(self.sent_headers) == 1:
+            resp.status_code = 304
+        return resp
+
+
+def test_unexpected_not_modified_without_cache_fetches_listing_again(fake_backend):
+    controller = _build_controller(fake_backend.base_url)
+    controller.api_client = StaleProxyClient(controller.api_client)
+    flow = file_list_flow(controller)
+
+    flow.load_files_and_show()
+
+    assert controller.api_client.sent_headers == [{}, {"Cache-Control": "no-cache"}]
+    assert len(controller.file_records) == 2
+    assert controller.login_view.errors == []
+    assert controller.stack.current == controller.datei_liste_view
+
+
+def test_listing_on_the_ui_thread_never_sleeps(fake_backend):
+    controller = _build_controller(fake_backend.base_url)
+    sleeps = []
+    controller.api_client = backend_client(
+        fake_backend.base_url, retry=retry_policy(sleep=sleeps.append)
+    )
+    fake_backend.injected_failures = [(503, 30)]
+    flow = file_list_flow(controller)
+
+    flow.load_files_and_show()
+
+    assert sleeps == []
+    assert controller.login_view.errors == [
+        "Dateiliste konnte nicht geladen werden (HTTP 503)."
+    ]
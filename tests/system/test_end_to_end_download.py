@@ -1,3 +1,4 @@
+from controller.backend_client import backend_client
 from controller.file_access_flow import file_access_flow
 
 
@@ -46,6 +47,7 @@ def test_end_to_end_download(qtbot, fake_backend, tmp_path, monkeypatch):
 
     controller = Controller()
     controller.api_base_url = fake_backend.base_url
+    controller.api_client = backend_client(fake_backend.base_url)
     controller.auth_token = "token"
     controller.settings = DummySettings()
     controller.datei_liste_view = view
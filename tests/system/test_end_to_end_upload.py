@@ -0,0 +1,48 @@
+from controller.backend_client import backend_client
+from controller.upload_service import multipart_file_body, upload_file
+
+
+def test_upload_file_streams_body_and_returns_record(fake_backend, tmp_path):
+    path = tmp_path / "daten.bin"
+    payload = bytes(range(256)) * 1024
+    path.write_bytes(payload)
+    sent = []
+
+    result = upload_file(
+        backend_client(fake_backend.base_url),
+        token="token",
+        path=path,
+        timeout=5,
+        on_read=sent.append,
+    )
+
+    assert result.ok is True
+    assert result.record["name"] == "daten.bin"
+    assert result.record["size"] == len(payload)
+    assert fake_backend.file_bytes[str(result.record["id"])] == payload
+    assert sum(sent) == len(payload)
+    # The body is produced chunk by chunk, never as one buffer.
+    assert max(sent) < len(payload)
+
+
+def test_upload_file_reports_unauthorized(fake_backend, tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("x", encoding="utf-8")
+
+    result = upload_file(
+        backend_client(fake_backend.base_url), token="wrong", path=path, timeout=5
+    )
+
+    assert result.ok is False
+    assert result.status_code == 401
+
+
+def test_multipart_body_length_matches_content(tmp_path):
+    path = tmp_path / 'quote".txt'
+    path.write_bytes(b"hello")
+    body = multipart_file_body(path)
+
+    data = b"".join(body)
+
+    assert len(data) == len(body)
+    assert b'filename="quote%22.txt"' in data
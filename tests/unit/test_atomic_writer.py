@@ -0,0 +1,75 @@
+import hashlib
+
+import pytest
+
+from controller.atomic_writer import (
+    FSYNC_FILE,
+    FSYNC_FULL,
+    FSYNC_NONE,
+    atomic_writer,
+    fsync_policy,
+)
+
+
+class FakeSettings:
+    def __init__(self, store=None):
+        self.store = dict(store or {})
+
+    def value(self, key, default=None, type=str):
+        return type(self.store.get(key, default))
+
+
+@pytest.mark.parametrize("policy", [FSYNC_NONE, FSYNC_FILE, FSYNC_FULL])
+def test_commit_renames_and_hashes(tmp_path, policy):
+    dest = tmp_path / "out.bin"
+    with atomic_writer(dest, fsync_policy=policy) as writer:
+        writer.write(b"abc")
+        writer.write(b"def")
+        result = writer.commit()
+
+    assert dest.read_bytes() == b"abcdef"
+    assert result.sha256 == hashlib.sha256(b"abcdef").hexdigest()
+    assert result.size == 6
+    assert list(tmp_path.iterdir()) == [dest]
+
+
+def test_error_discards_temp_and_keeps_destination(tmp_path):
+    dest = tmp_path / "out.bin"
+    dest.write_bytes(b"old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_writer(dest) as writer:
+            writer.write(b"partial")
+            raise RuntimeError("crash")
+
+    assert dest.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [dest]
+
+
+def test_resume_hashes_existing_partial(tmp_path):
+    dest = tmp_path / "out.bin"
+    temp = tmp_path / "out.bin.part"
+    temp.write_bytes(b"hello ")
+
+    with atomic_writer(dest, temp=temp, resume=True) as writer:
+        writer.write(b"world")
+        result = writer.commit()
+
+    assert dest.read_bytes() == b"hello world"
+    assert result.sha256 == hashlib.sha256(b"hello world").hexdigest()
+
+
+def test_explicit_temp_survives_error(tmp_path):
+    temp = tmp_path / "out.bin.part"
+    with pytest.raises(RuntimeError):
+        with atomic_writer(tmp_path / "out.bin", temp=temp) as writer:
+            writer.write(b"abc")
+            raise RuntimeError("connection lost")
+
+    assert temp.read_bytes() == b"abc"
+
+
+def test_fsync_policy_from_settings():
+    assert fsync_policy(FakeSettings()) == FSYNC_FILE
+    assert fsync_policy(FakeSettings({"files/fsync_policy": "FULL"})) == FSYNC_FULL
+    assert fsync_policy(FakeSettings({"files/fsync_policy": "bogus"})) == FSYNC_FILE
@@ -3,6 +3,7 @@ import types
 import requests
 
 from controller.auth_flow import auth_flow
+from controller.backend_client import backend_client
 
 
 class DummySettings:
@@ -85,6 +86,7 @@ class DummySettingsFlow:
 class DummyController:
     def __init__(self):
         self.api_base_url = "http://example"
+        self.api_client = backend_client(self.api_base_url)
         self.auth_token = None
         self.current_username = None
         self.settings = DummySettings()
@@ -122,7 +124,7 @@ def test_login_success_sets_token(monkeypatch):
     def fake_post(*args, **kwargs):
         return FakeResponse(200, {"access_token": "token"})
 
-    monkeypatch.setattr("controller.auth_flow.requests.post", fake_post)
+    monkeypatch.setattr(controller.api_client.session, "request", fake_post)
     flow = auth_flow(controller)
     flow.on_login_clicked()
 
@@ -138,7 +140,7 @@ def test_login_invalid_credentials(monkeypatch):
     controller.login_view.set_username("user")
     controller.login_view.set_password("bad")
 
-    monkeypatch.setattr("controller.auth_flow.requests.post", lambda *a, **k: FakeResponse(401))
+    monkeypatch.setattr(controller.api_client.session, "request", lambda *a, **k: FakeResponse(401))
     flow = auth_flow(controller)
     flow.on_login_clicked()
     assert any("Login fehlgeschlagen" in msg for msg in controller.login_view.errors)
@@ -149,7 +151,7 @@ def test_register_success(monkeypatch):
     controller.login_view.set_username("user")
     controller.login_view.set_password("pass")
 
-    monkeypatch.setattr("controller.auth_flow.requests.post", lambda *a, **k: FakeResponse(201))
+    monkeypatch.setattr(controller.api_client.session, "request", lambda *a, **k: FakeResponse(201))
     messages = []
     monkeypatch.setattr("controller.auth_flow.QMessageBox.information", lambda *a, **k: messages.append("ok"))
 
@@ -163,7 +165,7 @@ def test_register_existing_user(monkeypatch):
     controller.login_view.set_username("existing")
     controller.login_view.set_password("pass")
 
-    monkeypatch.setattr("controller.auth_flow.requests.post", lambda *a, **k: FakeResponse(400))
+    monkeypatch.setattr(controller.api_client.session, "request", lambda *a, **k: FakeResponse(400))
     flow = auth_flow(controller)
     flow.on_register_clicked()
     assert controller.login_view.errors
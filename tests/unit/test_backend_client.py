@@ -0,0 +1,116 @@
+import pytest
+import requests
+
+from controller.backend_client import (
+    SESSION_EXPIRED_MESSAGE,
+    backend_client,
+    endpoint_key,
+    status_error_message,
+)
+from controller.retry_policy import retry_policy, token_bucket
+
+
+def test_status_error_message_mapping():
+    assert status_error_message(401, "fallback") == SESSION_EXPIRED_MESSAGE
+    assert status_error_message(403, "fallback") == "Kein Zugriff auf diese Datei."
+    assert status_error_message(404, "fallback") == "Datei nicht gefunden."
+    assert status_error_message(500, "fallback") == "fallback"
+
+
+def test_endpoint_key_collapses_ids():
+    assert endpoint_key("get", "/files/12/download") == "GET /files/{id}/download"
+    assert endpoint_key("DELETE", "/files/7") == "DELETE /files/{id}"
+    assert endpoint_key("GET", "/files/?page=2") == "GET /files/"
+
+
+def test_request_sends_cached_auth_header(monkeypatch):
+    client = backend_client("http://example/")
+    seen = []
+
+    def fake_request(method, url, headers=None, **kwargs):
+        seen.append((method, url, dict(headers)))
+        return type("Resp", (), {"status_code": 200})()
+
+    monkeypatch.setattr(client.session, "request", fake_request)
+    client.get("/files/", token="abc", timeout=5)
+    client.get("/files/", token=None, timeout=5)
+
+    assert seen[0] == ("GET", "http://example/files/", {"Authorization": "Bearer abc"})
+    assert seen[1][2] == {}
+
+
+def test_request_records_failures(monkeypatch):
+    client = backend_client("http://example")
+
+    def raise_request(*args, **kwargs):
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(client.session, "request", raise_request)
+    with pytest.raises(requests.RequestException):
+        client.delete("/files/3", token="t")
+
+    stats = client.latency_stats()["DELETE /files/{id}"]
+    assert stats["count"] == 1
+    assert stats["errors"] == 1
+
+
+def test_pooled_session_reuses_connections(fake_backend):
+    client = backend_client(fake_backend.base_url, pool_size=2)
+    for _ in range(20):
+        resp = client.get("/files/1/download", token=fake_backend.token, timeout=5)
+        assert resp.status_code == 200
+        assert resp.content == b"PDF-DATA"
+
+    assert fake_backend.connections == 1
+    assert client.latency_stats()["GET /files/{id}/download"]["count"] == 20
+    client.close()
+
+
+def test_request_retries_transient_status_with_retry_after(fake_backend):
+    fake_backend.injected_failures = [(503, 0), (429, 0)]
+    sleeps = []
+    client = backend_client(
+        fake_backend.base_url, retry=retry_policy(base_s=0.01, cap_s=0.02, sleep=sleeps.append)
+    )
+
+    resp = client.get("/files/", token="token", timeout=5)
+
+    assert resp.status_code == 200
+    assert len(sleeps) == 2
+    assert client.latency_stats()["GET /files/"]["retries"] == 2
+
+
+def test_request_does_not_retry_post_or_client_errors(fake_backend):
+    sleeps = []
+    client = backend_client(fake_backend.base_url, retry=retry_policy(sleep=sleeps.append))
+
+    fake_backend.injected_failures = [(503, None)]
+    assert client.post("/files/upload", token="token", timeout=5).status_code == 503
+    assert client.get("/files/9/download", token="token", timeout=5).status_code == 404
+    assert sleeps == []
+
+
+def test_request_gives_up_after_max_attempts(fake_backend):
+    fake_backend.injected_failures = [(503, None)] * 5
+    client = backend_client(
+        fake_backend.base_url, retry=retry_policy(max_attempts=3, sleep=lambda s: None)
+    )
+
+    assert client.get("/files/", token="token", timeout=5).status_code == 503
+    assert len(fake_backend.injected_failures) == 2
+
+
+def test_interactive_request_skips_retries_and_rate_limit(fake_backend):
+    sleeps = []
+    client = backend_client(
+        fake_backend.base_url,
+        retry=retry_policy(sleep=sleeps.append),
+        limiter=token_bucket(rate=0.001, capacity=1, sleep=sleeps.append),
+    )
+    fake_backend.injected_failures = [(503, 0)] * 3
+
+    for _ in range(2):
+        assert client.get("/files/", token="token", timeout=5, interactive=True).status_code == 503
+
+    assert sleeps == []
+    assert len(fake_backend.injected_failures) == 1
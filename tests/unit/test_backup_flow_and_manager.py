@@ -1,5 +1,7 @@
+import hashlib
 from pathlib import Path
 
+from controller.atomic_writer import write_result
 from controller.backup_flow import backup_flow
 from controller.backup_manager import backup_manager
 
@@ -13,10 +15,11 @@ class DummyDateiManager:
             raise RuntimeError("missing")
         return self.target
 
-    def speichere_datei(self, rel_name: str, data: bytes) -> Path:
+    def schreibe_datei(self, rel_name: str, chunks) -> write_result:
+        data = b"".join(chunks)
         path = self.target / rel_name
         path.write_bytes(data)
-        return path
+        return write_result(path, hashlib.sha256(data).hexdigest(), len(data))
 
 
 class DummyPfadView:
@@ -50,6 +53,7 @@ def test_backup_manager_success(tmp_path):
     assert result.ok is True
     assert result.ziel_datei is not None
     assert result.ziel_datei.exists()
+    assert result.sha256 == hashlib.sha256(result.ziel_datei.read_bytes()).hexdigest()
 
 
 def test_backup_flow_shows_error():
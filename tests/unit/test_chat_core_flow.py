@@ -1,4 +1,5 @@
 from controller.chat_core_flow import chat_core_flow
+from controller.context_index import context_index
 
 
 class FakeSettingsFlow:
@@ -6,9 +7,19 @@ class FakeSettingsFlow:
         return "Tone: Friendly"
 
 
+class FakeSettings:
+    def __init__(self, values=None):
+        self.values = values or {}
+
+    def value(self, key, default=None, type=str):
+        return self.values.get(key, default)
+
+
 class FakeController:
     def __init__(self):
+        self.settings = FakeSettings()
         self.settings_flow = FakeSettingsFlow()
+        self.chat_context_index = context_index()
         self.chat_file_context = [
             {"id": 1, "name": "doc.txt", "content": "Hello"}
         ]
@@ -23,3 +34,37 @@ def test_build_chat_request_messages_includes_context():
     assert "Tone: Friendly" in messages[0]["content"]
     assert any("File name: doc.txt" in m["content"] for m in messages)
     assert messages[-1]["content"] == "Hi"
+
+
+def test_build_chat_request_messages_respects_token_budget():
+    controller = FakeController()
+    controller.settings = FakeSettings({"ai/context_tokens": 1000})
+    controller.chat_file_context = [{"id": 1, "name": "big.txt", "content": "x" * 40000}]
+    controller.chat_messages = [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"turn {i} " + "y" * 400}
+        for i in range(20)
+    ]
+    flow = chat_core_flow(controller)
+
+    messages = flow.build_chat_request_messages()
+
+    total_chars = sum(len(m["content"]) for m in messages)
+    assert total_chars <= 1000 * 4
+    assert messages[-1] == controller.chat_messages[-1]
+    assert any("File name: big.txt" in m["content"] for m in messages)
+    assert controller.chat_messages[0] not in messages
+
+
+def test_build_chat_request_messages_sends_relevant_file_only():
+    controller = FakeController()
+    controller.chat_file_context = [
+        {"id": 1, "name": "kochen.txt", "content": "Rezept fuer Pfannkuchen mit Mehl und Eiern"},
+        {"id": 2, "name": "auto.txt", "content": "Der Reifendruck sollte monatlich geprueft werden"},
+    ]
+    controller.chat_messages = [{"role": "user", "content": "Wie oft Reifendruck pruefen?"}]
+    flow = chat_core_flow(controller)
+
+    messages = flow.build_chat_request_messages()
+
+    assert any("File name: auto.txt" in m["content"] for m in messages)
+    assert not any("File name: kochen.txt" in m["content"] for m in messages)
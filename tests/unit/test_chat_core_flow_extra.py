@@ -1,4 +1,6 @@
 from controller.chat_core_flow import chat_core_flow
+from controller.chat_request_queue import chat_request_queue
+from controller.chat_worker_pool import chat_request, chat_worker_pool
 
 
 class DummyChatView:
@@ -9,6 +11,8 @@ class DummyChatView:
         self.send_enabled = None
         self.temp_checked = None
         self.temp_enabled = None
+        self.cancel_enabled = False
+        self.queue_depth = 0
 
     def clear_chat(self):
         self.cleared = True
@@ -19,6 +23,12 @@ class DummyChatView:
     def set_selected_files(self, names):
         self.selected = list(names)
 
+    def set_cancel_enabled(self, enabled: bool):
+        self.cancel_enabled = bool(enabled)
+
+    def set_queue_depth(self, depth: int):
+        self.queue_depth = depth
+
     def set_send_enabled(self, enabled: bool):
         self.send_enabled = enabled
 
@@ -59,6 +69,13 @@ class DummyController:
         self.chat_file_meta = []
         self.history_service = DummyHistoryService()
         self.settings_flow = DummySettingsFlow()
+        self.pending_chat_files = None
+        self.pending_chat_mode = "chat"
+        self.unanswered_chat_sessions = {}
+        self.chat_request_queue = chat_request_queue()
+        self.chat_workers = chat_worker_pool(
+            make_worker=None, on_delta=None, on_finished=None, on_failed=None
+        )
 
 
 def test_on_ai_summary_clicked_resets_state():
@@ -96,3 +113,17 @@ def test_on_chat_worker_finished_persists(monkeypatch):
 
     assert controller.chat_messages[-1]["role"] == "assistant"
     assert called["persist"] is True
+
+
+def test_streamed_result_finishes_stream():
+    controller = DummyController()
+    calls = []
+    controller.chat_view.append_stream_delta = lambda text: calls.append(("delta", text))
+    controller.chat_view.finish_stream = lambda text: calls.append(("finish", text))
+
+    flow = chat_core_flow(controller)
+    flow.on_chat_delta("Hal")
+    flow.on_chat_worker_finished({"assistant": "Hallo", "streamed": True})
+
+    assert calls == [("delta", "Hal"), ("finish", "Hallo")]
+    assert controller.chat_messages[-1] == {"role": "assistant", "content": "Hallo"}
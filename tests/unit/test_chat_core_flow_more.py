@@ -1,4 +1,9 @@
+import pytest
+
 from controller.chat_core_flow import chat_core_flow
+from controller.chat_request_queue import chat_request_queue
+from controller.chat_worker_pool import chat_request, chat_worker_pool
+from controller.context_index import context_index
 
 
 class DummyChatView:
@@ -8,6 +13,9 @@ class DummyChatView:
         self.send_enabled = True
         self.temp_chat_checked = False
         self.temp_chat_enabled = True
+        self.cancel_enabled = False
+        self.queue_depth = 0
+        self.errors = []
 
     def get_chat_input(self):
         return self.chat_input
@@ -18,6 +26,18 @@ class DummyChatView:
     def add_message(self, role, text, stream=False):
         self.messages.append((role, text, stream))
 
+    def add_messages(self, messages):
+        self.messages.extend((role, text, False) for role, text in messages)
+
+    def show_error(self, message: str):
+        self.errors.append(message)
+
+    def set_cancel_enabled(self, enabled: bool):
+        self.cancel_enabled = bool(enabled)
+
+    def set_queue_depth(self, depth: int):
+        self.queue_depth = depth
+
     def set_send_enabled(self, enabled: bool):
         self.send_enabled = bool(enabled)
 
@@ -49,13 +69,14 @@ class DummyChatView:
 class DummyHistoryService:
     def __init__(self):
         self.created = False
+        self.updated = []
 
     def create_chat_session(self, *, title: str, files: list[dict]):
         self.created = True
         return "chat-1"
 
     def update_chat_session(self, *, chat_id: str, messages: list[dict], files: list[dict]):
-        pass
+        self.updated.append((chat_id, messages))
 
 
 class DummySettingsFlow:
@@ -63,9 +84,15 @@ class DummySettingsFlow:
         return "Tone: Neutral"
 
 
+class DummySettings:
+    def value(self, key, default=None, type=str):
+        return default
+
+
 class DummyController:
     def __init__(self):
         self.auth_token = "token"
+        self.settings = DummySettings()
         self.chat_view = DummyChatView()
         self.datei_liste_view = DummyChatView()
         self.stack = type("Stack", (), {"setCurrentWidget": lambda *a, **k: None})()
@@ -77,8 +104,16 @@ class DummyController:
         self.chat_file_meta = []
         self.history_service = DummyHistoryService()
         self.settings_flow = DummySettingsFlow()
-        self._chat_thread = None
-        self._chat_worker = None
+        self.chat_context_index = context_index()
+        self.chat_files_loading = {}
+        self.pending_chat_files = None
+        self._context_worker = None
+        self.pending_chat_mode = "chat"
+        self.unanswered_chat_sessions = {}
+        self.chat_request_queue = chat_request_queue()
+        self.chat_workers = chat_worker_pool(
+            make_worker=None, on_delta=None, on_finished=None, on_failed=None
+        )
 
 
 def test_on_chat_send_starts_session(monkeypatch):
@@ -99,7 +134,7 @@ def test_on_chat_send_starts_session(monkeypatch):
     assert controller.chat_started is True
     assert controller.current_chat_id == "chat-1"
     assert controller.chat_messages
-    assert controller.chat_view.send_enabled is False
+    assert controller.chat_view.cancel_enabled is True
     assert captured["mode"] == "chat"
 
 
@@ -117,3 +152,279 @@ def test_on_chat_back_resets_temp_chat():
     assert controller.chat_messages == []
     assert controller.chat_file_meta == []
     assert controller.chat_started is False
+
+
+def test_send_waits_only_for_files_the_question_needs(monkeypatch):
+    controller = DummyController()
+    controller.chat_file_meta = [
+        {"id": 1, "name": "skript.pdf"},
+        {"id": 2, "name": "uebung.pdf"},
+        {"id": 3, "name": "notizen.txt"},
+    ]
+    controller.chat_files_loading = {"2": "uebung.pdf", "3": "notizen.txt"}
+    flow = chat_core_flow(controller)
+
+    assert flow.files_needed_for("Was steht in uebung.pdf?") == {"2"}
+    assert flow.files_needed_for("Erklaere das Skript") == set()
+    assert flow.files_needed_for("Fasse alles zusammen") == {"2", "3"}
+
+    started = []
+    monkeypatch.setattr(flow, "start_chat_worker", lambda **kwargs: started.append(kwargs))
+    controller.chat_view.chat_input = "Loesung zu Uebung 3?"
+    flow.on_chat_send_clicked()
+
+    assert started == []
+    assert controller.pending_chat_files == {"2"}
+
+    flow.on_context_file_settled("3")
+    assert started == []
+    flow.on_context_file_settled("2")
+    assert len(started) == 1
+    assert controller.pending_chat_files is None
+
+
+def test_question_waiting_for_files_is_answered_when_chat_reopens(monkeypatch):
+    controller = DummyController()
+    controller.chat_file_meta = [{"id": 2, "name": "uebung.pdf"}]
+    controller.chat_files_loading = {"2": "uebung.pdf"}
+    flow = chat_core_flow(controller)
+    started = []
+    monkeypatch.setattr(flow, "start_chat_worker", lambda **kwargs: started.append(kwargs))
+    controller.chat_view.chat_input = "Was steht in uebung.pdf?"
+    flow.on_chat_send_clicked()
+
+    flow.leave_session()
+
+    assert controller.pending_chat_files is None
+    assert controller.history_service.updated[-1] == ("chat-1", controller.chat_messages)
+    assert started == []
+
+    # Reopening the chat loads its files again; the reply waits for them.
+    flow.on_session_shown()
+
+    assert started == []
+    assert controller.pending_chat_files == {"2"}
+
+    controller.chat_files_loading = {}
+    flow.on_context_file_settled("2")
+
+    assert len(started) == 1
+    assert started[0]["mode"] == "chat"
+    assert controller.chat_view.cancel_enabled is True
+    assert controller.unanswered_chat_sessions == {}
+
+
+def test_reset_session_drops_queued_and_waiting_work(monkeypatch):
+    controller = DummyController()
+    controller.chat_file_meta = [{"id": 2, "name": "uebung.pdf"}]
+    controller.chat_files_loading = {"2": "uebung.pdf"}
+    controller._context_worker = DummyWorker()
+    flow = chat_core_flow(controller)
+    started = []
+    monkeypatch.setattr(flow, "start_chat_worker", lambda **kwargs: started.append(kwargs))
+    controller.chat_view.chat_input = "Was steht in uebung.pdf?"
+    flow.on_chat_send_clicked()
+    controller.chat_request_queue.push("chat-1", "Noch eine Frage")
+
+    flow.reset_session()
+
+    assert controller.pending_chat_files is None
+    assert controller.chat_files_loading == {}
+    assert controller._context_worker.cancelled is True
+    assert controller.chat_request_queue.depth("chat-1") == 0
+    assert controller.chat_view.queue_depth == 0
+    assert controller.unanswered_chat_sessions == {"chat-1": "chat"}
+
+    flow.on_context_file_settled("2")
+    assert started == []
+
+
+class DummyWorker:
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def make_request(session, messages, worker=None):
+    return chat_request(
+        session=session,
+        chat_id=session,
+        temp=False,
+        messages=messages,
+        files=[],
+        payload={},
+        worker=worker,
+    )
+
+
+def test_send_while_busy_queues_until_reply_is_done(monkeypatch):
+    controller = DummyController()
+    controller.chat_started = True
+    controller.current_chat_id = "chat-1"
+    flow = chat_core_flow(controller)
+    started = []
+
+    def fake_start_chat_worker(*, mode: str, payload: dict):
+        started.append(payload)
+        controller.chat_workers.active["chat-1"] = make_request("chat-1", controller.chat_messages)
+
+    monkeypatch.setattr(flow, "start_chat_worker", fake_start_chat_worker)
+    monkeypatch.setattr(flow, "persist_current_chat", lambda: None)
+
+    for text in ("Erste Frage", "Zweite Frage"):
+        controller.chat_view.chat_input = text
+        flow.on_chat_send_clicked()
+
+    assert len(started) == 1
+    assert controller.chat_view.queue_depth == 1
+    assert [m["content"] for m in controller.chat_messages] == ["Erste Frage"]
+
+    controller.chat_workers.active.clear()
+    flow.on_chat_worker_finished({"assistant": "Antwort"})
+
+    assert len(started) == 2
+    assert controller.chat_view.queue_depth == 0
+    assert controller.chat_messages[-1] == {"role": "user", "content": "Zweite Frage"}
+    assert controller.chat_request_queue.stats()["started"] == 1
+
+
+def test_cancel_aborts_worker_and_starts_next_queued(monkeypatch):
+    controller = DummyController()
+    controller.chat_started = True
+    controller.current_chat_id = "chat-1"
+    flow = chat_core_flow(controller)
+    worker = DummyWorker()
+    controller.chat_workers.active["chat-1"] = make_request("chat-1", [], worker)
+    controller.chat_request_queue.push("chat-1", "Naechste Frage")
+    controller.chat_view.mark_cancelled = lambda: controller.chat_view.messages.append("cancelled")
+    started = []
+    monkeypatch.setattr(flow, "start_chat_worker", lambda **kwargs: started.append(kwargs))
+
+    flow.on_chat_cancel_clicked()
+
+    assert worker.cancelled is True
+    assert controller.chat_workers.active == {}
+    assert "cancelled" in controller.chat_view.messages
+    assert len(started) == 1
+    assert controller.chat_request_queue.stats()["cancelled"] == 1
+
+
+def test_background_chat_reply_is_persisted_to_its_own_session():
+    controller = DummyController()
+    controller.chat_started = True
+    controller.current_chat_id = "chat-2"
+    controller.chat_messages = [{"role": "user", "content": "Neue Frage"}]
+    flow = chat_core_flow(controller)
+    background = [{"role": "user", "content": "Alte Frage"}]
+    request = make_request("chat-1", background)
+
+    flow.on_request_delta(request, "Teil")
+    flow.on_request_finished(request, {"assistant": "Alte Antwort"})
+
+    assert background[-1] == {"role": "assistant", "content": "Alte Antwort"}
+    assert controller.chat_messages == [{"role": "user", "content": "Neue Frage"}]
+    assert controller.chat_view.messages == []
+    assert controller.history_service.updated == [("chat-1", background)]
+
+
+def test_summary_button_runs_summary_mode_over_full_file_text(monkeypatch):
+    controller = DummyController()
+    controller.chat_file_meta = [{"id": 1, "name": "skript.pdf"}]
+    controller.chat_file_context = [{"id": 1, "name": "skript.pdf", "content": "x" * 50000}]
+    flow = chat_core_flow(controller)
+    started = []
+    monkeypatch.setattr(flow, "start_chat_worker", lambda **kwargs: started.append(kwargs))
+
+    flow.on_chat_summarize_clicked()
+
+    assert started[0]["mode"] == "summary"
+    assert started[0]["payload"]["documents"] == [{"name": "skript.pdf", "content": "x" * 50000}]
+    assert controller.chat_messages[-1]["content"] == "Fasse die ausgewaehlten Dateien zusammen."
+
+
+def test_summary_requires_selected_files(monkeypatch):
+    controller = DummyController()
+    flow = chat_core_flow(controller)
+    monkeypatch.setattr(flow, "start_chat_worker", lambda **kwargs: pytest.fail("no worker"))
+
+    flow.on_chat_summarize_clicked()
+
+    assert controller.datei_liste_view.errors == ["Bitte zuerst Dateien auswaehlen."]
+    assert controller.chat_messages == []
+
+
+@pytest.mark.parametrize(
+    "text", ["/zusammenfassen", "Fasse die ausgewaehlten Dateien zusammen."]
+)
+def test_typed_summary_text_is_a_regular_chat_message(monkeypatch, text):
+    controller = DummyController()
+    controller.chat_file_meta = [{"id": 1, "name": "skript.pdf"}]
+    flow = chat_core_flow(controller)
+    started = []
+    monkeypatch.setattr(flow, "start_chat_worker", lambda **kwargs: started.append(kwargs))
+
+    controller.chat_view.chat_input = text
+    flow.on_chat_send_clicked()
+
+    assert [call["mode"] for call in started] == ["chat"]
+    assert controller.chat_messages[-1]["content"] == text
+
+
+def test_queued_summary_keeps_summary_mode(monkeypatch):
+    controller = DummyController()
+    controller.chat_started = True
+    controller.current_chat_id = "chat-1"
+    controller.chat_file_meta = [{"id": 1, "name": "skript.pdf"}]
+    controller.chat_workers.active["chat-1"] = make_request("chat-1", [])
+    flow = chat_core_flow(controller)
+    started = []
+    monkeypatch.setattr(flow, "start_chat_worker", lambda **kwargs: started.append(kwargs))
+    monkeypatch.setattr(flow, "persist_current_chat", lambda: None)
+
+    flow.on_chat_summarize_clicked()
+    controller.chat_view.chat_input = "Fasse die ausgewaehlten Dateien zusammen."
+    flow.on_chat_send_clicked()
+    assert started == []
+
+    controller.chat_workers.active.clear()
+    flow.on_chat_worker_finished({"assistant": "Antwort"})
+    flow.on_chat_worker_finished({"assistant": "Zusammenfassung"})
+
+    assert [call["mode"] for call in started] == ["summary", "chat"]
+
+
+def test_reopened_summary_waiting_for_files_resumes_as_summary(monkeypatch):
+    controller = DummyController()
+    controller.chat_file_meta = [{"id": 2, "name": "uebung.pdf"}]
+    controller.chat_files_loading = {"2": "uebung.pdf"}
+    flow = chat_core_flow(controller)
+    started = []
+    monkeypatch.setattr(flow, "start_chat_worker", lambda **kwargs: started.append(kwargs))
+    flow.on_chat_summarize_clicked()
+
+    flow.leave_session()
+    assert controller.unanswered_chat_sessions == {"chat-1": "summary"}
+
+    flow.on_session_shown()
+    controller.chat_files_loading = {}
+    flow.on_context_file_settled("2")
+
+    assert [call["mode"] for call in started] == ["summary"]
+
+
+def test_render_chat_messages_adds_history_in_one_batch():
+    controller = DummyController()
+    flow = chat_core_flow(controller)
+
+    flow.render_chat_messages(
+        [
+            {"role": "system", "content": "intern"},
+            {"role": "user", "content": "Frage"},
+            {"role": "assistant", "content": None},
+        ]
+    )
+
+    assert controller.chat_view.messages == [("user", "Frage", False), ("assistant", "", False)]
+
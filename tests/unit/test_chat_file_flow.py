@@ -1,11 +1,16 @@
+from controller.backend_client import backend_client
 from controller.chat_file_flow import chat_file_flow
+from controller.text_cache import text_cache
 
 
 class DummyController:
-    def __init__(self):
+    def __init__(self, cache_dir=None):
         self.api_base_url = "http://example"
+        self.api_client = backend_client(self.api_base_url)
         self.auth_token = "token"
         self.visible_file_records = []
+        self.file_records = []
+        self.text_cache = text_cache(cache_dir) if cache_dir is not None else None
         self.chat_file_context = []
         self.chat_file_meta = []
         self.chat_view = type("View", (), {"show_error": lambda *a, **k: None, "set_selected_files": lambda *a, **k: None})()
@@ -31,21 +36,21 @@ def test_download_file_text_errors(monkeypatch):
             self.headers = {"Content-Type": "text/plain"}
             self.content = b""
 
-    monkeypatch.setattr("controller.chat_file_flow.requests.get", lambda *a, **k: Resp(401))
+    monkeypatch.setattr(controller.api_client.session, "request", lambda *a, **k: Resp(401))
     try:
         flow.download_file_text(1, "doc.txt")
         assert False
     except RuntimeError:
         assert True
 
-    monkeypatch.setattr("controller.chat_file_flow.requests.get", lambda *a, **k: Resp(403))
+    monkeypatch.setattr(controller.api_client.session, "request", lambda *a, **k: Resp(403))
     try:
         flow.download_file_text(1, "doc.txt")
         assert False
     except RuntimeError:
         assert True
 
-    monkeypatch.setattr("controller.chat_file_flow.requests.get", lambda *a, **k: Resp(404))
+    monkeypatch.setattr(controller.api_client.session, "request", lambda *a, **k: Resp(404))
     try:
         flow.download_file_text(1, "doc.txt")
         assert False
@@ -53,7 +58,7 @@ def test_download_file_text_errors(monkeypatch):
         assert True
 
 
-def test_download_file_text_limits_size(monkeypatch):
+def test_download_file_text_keeps_full_text(monkeypatch):
     controller = DummyController()
     flow = chat_file_flow(controller)
 
@@ -62,11 +67,38 @@ def test_download_file_text_limits_size(monkeypatch):
         headers = {"Content-Type": "text/plain"}
         content = b"data"
 
-    monkeypatch.setattr("controller.chat_file_flow.requests.get", lambda *a, **k: Resp())
+    monkeypatch.setattr(controller.api_client.session, "request", lambda *a, **k: Resp())
     monkeypatch.setattr(
         "controller.chat_file_flow.extract_text_from_downloaded_content",
         lambda **k: "x" * 13000,
     )
 
     result = flow.download_file_text(1, "doc.txt")
-    assert len(result) == 12000
+    assert len(result) == 13000
+
+
+def test_load_chat_file_contexts_reuses_cached_text(monkeypatch, tmp_path):
+    controller = DummyController(tmp_path)
+    controller.file_records = [{"id": 5, "name": "skript.pdf", "updated_at": "t1", "size": 10}]
+    flow = chat_file_flow(controller)
+    downloads = []
+
+    def fake_download(file_id, name):
+        downloads.append(file_id)
+        return "Inhalt"
+
+    monkeypatch.setattr(flow, "download_file_text", fake_download)
+    monkeypatch.setattr(flow, "local_cache_dir", lambda: None)
+    history_meta = [{"id": 5, "name": "skript.pdf"}]
+
+    first = flow.load_chat_file_contexts(history_meta)
+    second = flow.load_chat_file_contexts(history_meta)
+
+    assert downloads == [5]
+    assert first == second
+    assert second[0]["content"] == "Inhalt"
+    assert second[0]["version"] == "t1:10"
+
+    controller.file_records[0]["updated_at"] = "t2"
+    flow.load_chat_file_contexts(history_meta)
+    assert downloads == [5, 5]
@@ -12,8 +12,9 @@ class DummyChatView:
     def show_error(self, msg: str):
         self.errors.append(msg)
 
-    def set_selected_files(self, names):
+    def set_selected_files(self, names, *, loading=None):
         self.selected = list(names)
+        self.loading = set(loading or ())
 
     def clear_chat(self):
         self.cleared = True
@@ -40,6 +41,18 @@ class DummyChatCoreFlow:
     def __init__(self):
         self.persisted = False
         self.rendered = False
+        self.settled = []
+        self.left = 0
+        self.shown = 0
+
+    def leave_session(self):
+        self.left += 1
+
+    def session_messages(self, chat_id, stored):
+        return stored
+
+    def on_session_shown(self):
+        self.shown += 1
 
     def persist_current_chat(self):
         self.persisted = True
@@ -47,6 +60,9 @@ class DummyChatCoreFlow:
     def render_chat_messages(self, messages):
         self.rendered = True
 
+    def on_context_file_settled(self, file_id):
+        self.settled.append(file_id)
+
 
 class DummyController:
     def __init__(self):
@@ -61,6 +77,10 @@ class DummyController:
         self.is_temp_chat = False
         self.chat_started = True
         self.current_chat_id = "chat-1"
+        self.chat_files_loading = {}
+        self.settings = type("Settings", (), {"value": lambda self, key, default=None, type=str: default})()
+        self._context_thread = None
+        self._context_worker = None
         self.stack = type("Stack", (), {"setCurrentWidget": lambda *a, **k: None})()
 
 
@@ -80,7 +100,7 @@ def test_set_chat_files_empty_persists():
     assert controller.chat_core_flow.persisted is True
 
 
-def test_open_history_entry_success(monkeypatch):
+def test_open_history_entry_loads_files_in_background(qtbot, monkeypatch):
     controller = DummyController()
     flow = chat_file_flow(controller)
 
@@ -90,16 +110,23 @@ def test_open_history_entry_success(monkeypatch):
 
     monkeypatch.setattr(
         flow,
-        "load_chat_file_contexts",
-        lambda records: [{"id": 1, "name": "doc.txt", "content": "text"}],
+        "load_file_context",
+        lambda record: {"id": 1, "name": "doc.txt", "content": "text"},
     )
 
     flow.open_history_entry(history, 0)
     assert controller.chat_messages == [{"role": "user", "content": "Hi"}]
+    assert controller.chat_view.loading == {"doc.txt"}
+    assert controller.chat_core_flow.shown == 1
+
+    qtbot.waitUntil(lambda: controller._context_thread is None, timeout=5000)
+    assert controller.chat_file_context == [{"id": 1, "name": "doc.txt", "content": "text"}]
     assert controller.chat_view.selected == ["doc.txt"]
+    assert controller.chat_view.loading == set()
+    assert controller.chat_core_flow.settled == ["1"]
 
 
-def test_open_history_entry_failure(monkeypatch):
+def test_open_history_entry_failure(qtbot, monkeypatch):
     controller = DummyController()
     flow = chat_file_flow(controller)
 
@@ -110,8 +137,47 @@ def test_open_history_entry_failure(monkeypatch):
     def raise_error(*args, **kwargs):
         raise RuntimeError("bad")
 
-    monkeypatch.setattr(flow, "load_chat_file_contexts", raise_error)
+    monkeypatch.setattr(flow, "load_file_context", raise_error)
 
     flow.open_history_entry(history, 0)
+    qtbot.waitUntil(lambda: controller._context_thread is None, timeout=5000)
     assert controller.chat_view.selected == []
-    assert controller.history_view.errors
+    assert controller.chat_view.errors == ["bad"]
+    assert controller.chat_core_flow.settled == ["1"]
+
+
+def test_set_chat_files_loads_contexts_in_background(qtbot, monkeypatch):
+    import threading
+
+    controller = DummyController()
+    flow = chat_file_flow(controller)
+    release = threading.Event()
+
+    def fake_load(record):
+        if record["id"] == 2:
+            release.wait(5)
+        if record["id"] == 3:
+            raise RuntimeError("kaputt")
+        return {"id": record["id"], "name": record["name"], "content": f"text {record['id']}"}
+
+    monkeypatch.setattr(flow, "load_file_context", fake_load)
+    records = [
+        {"id": 1, "name": "a.txt"},
+        {"id": 2, "name": "b.txt"},
+        {"id": 3, "name": "c.txt"},
+    ]
+
+    flow.set_chat_files(records)
+
+    assert controller.chat_view.loading == {"a.txt", "b.txt", "c.txt"}
+    qtbot.waitUntil(lambda: [c["id"] for c in controller.chat_file_context] == [1], timeout=5000)
+    qtbot.waitUntil(lambda: controller.chat_view.errors == ["kaputt"], timeout=5000)
+    assert controller.chat_view.loading == {"b.txt"}
+    assert flow.is_loading_contexts() is True
+
+    release.set()
+    qtbot.waitUntil(lambda: controller._context_thread is None, timeout=5000)
+
+    assert [c["id"] for c in controller.chat_file_context] == [1, 2]
+    assert controller.chat_view.selected == ["a.txt", "b.txt"]
+    assert sorted(controller.chat_core_flow.settled) == ["1", "2", "3"]
@@ -0,0 +1,63 @@
+from controller.chat_request_queue import chat_request_queue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_queue_is_fifo_per_session():
+    queue = chat_request_queue()
+
+    assert queue.push("chat-1", "erste") == 1
+    assert queue.push("chat-1", "zweite") == 2
+    assert queue.push("chat-2", "andere") == 1
+
+    assert queue.pop("chat-1") == ("erste", "chat")
+    assert queue.pop("chat-1") == ("zweite", "chat")
+    assert queue.pop("chat-1") is None
+    assert queue.depth("chat-2") == 1
+
+
+def test_queue_records_depth_and_wait_time():
+    clock = FakeClock()
+    queue = chat_request_queue(clock=clock)
+    queue.push("chat-1", "a")
+    queue.push("chat-1", "b")
+
+    clock.now += 2.0
+    queue.pop("chat-1")
+    clock.now += 4.0
+    queue.pop("chat-1")
+    stats = queue.stats()
+
+    assert stats["max_depth"] == 2
+    assert stats["started"] == 2
+    assert stats["max_wait_s"] == 6.0
+    assert stats["last_wait_s"] == 6.0
+    assert stats["avg_wait_s"] == 4.0
+    assert stats["depth"] == 0
+
+
+def test_drop_discards_only_that_session():
+    queue = chat_request_queue()
+    queue.push("chat-1", "a")
+    queue.push("chat-1", "b")
+    queue.push("temp", "c")
+
+    assert queue.drop("chat-1") == 2
+    assert queue.depth("chat-1") == 0
+    assert queue.stats()["dropped"] == 2
+    assert queue.pop("temp") == ("c", "chat")
+
+
+def test_queued_message_keeps_its_reply_mode():
+    queue = chat_request_queue()
+    queue.push("chat-1", "Fasse zusammen", mode="summary")
+    queue.push("chat-1", "/zusammenfassen")
+
+    assert queue.pop("chat-1") == ("Fasse zusammen", "summary")
+    assert queue.pop("chat-1") == ("/zusammenfassen", "chat")
@@ -1,8 +1,9 @@
 import types
 
 import pytest
+from pdf_factory import make_pdf
 
-from controller import chat_worker
+from controller import chat_worker, pdf_extractor
 
 
 def test_extract_text_from_text_payload():
@@ -14,37 +15,48 @@ def test_extract_text_from_text_payload():
     assert content == "hello"
 
 
-def test_extract_text_from_pdf_payload(monkeypatch):
-    class FakePage:
-        def extract_text(self):
-            return "Page"
-
-    class FakeReader:
-        def __init__(self, _):
-            self.pages = [FakePage()]
-
-    monkeypatch.setattr(chat_worker, "PdfReader", FakeReader)
-    content = chat_worker.extract_text_from_downloaded_content(
-        file_name="note.pdf",
-        content_type="application/pdf",
-        content_bytes=b"%PDF-1.4",
-    )
-    assert content == "Page"
-
-
-def test_extract_text_empty_raises(monkeypatch):
-    class FakePage:
-        def extract_text(self):
-            return ""
+def test_extract_text_from_pdf_payload():
+    try:
+        content = chat_worker.extract_text_from_downloaded_content(
+            file_name="note.pdf",
+            content_type="application/pdf",
+            content_bytes=make_pdf(["Page"], lines_per_page=1),
+        )
+    finally:
+        pdf_extractor.shutdown_pool()
+    assert content == "Page 0"
 
-    class FakeReader:
-        def __init__(self, _):
-            self.pages = [FakePage()]
 
-    monkeypatch.setattr(chat_worker, "PdfReader", FakeReader)
+def test_extract_text_empty_raises():
     with pytest.raises(RuntimeError):
         chat_worker.extract_text_from_downloaded_content(
             file_name="note.pdf",
             content_type="application/pdf",
-            content_bytes=b"%PDF-1.4",
+            content_bytes=make_pdf([]),
         )
+
+
+def test_chat_worker_summary_mode_reports_progress(qtbot):
+    class FakeSummarizer:
+        def summarize(self, documents, *, on_progress, cancellation):
+            on_progress(1, 2)
+            on_progress(2, 2)
+            return f"Zusammenfassung von {documents[0]['name']}"
+
+    worker = chat_worker.chat_worker(
+        mode="summary",
+        payload={"documents": [{"name": "skript.pdf", "content": "Text"}]},
+        analyzer=None,
+        api_base_url="",
+        auth_token="",
+        ai_prefs="",
+        summarizer=FakeSummarizer(),
+    )
+    progress = []
+    worker.progress.connect(lambda done, total: progress.append((done, total)))
+
+    with qtbot.waitSignal(worker.finished, timeout=2000) as blocker:
+        worker.run()
+
+    assert blocker.args[0] == {"mode": "summary", "assistant": "Zusammenfassung von skript.pdf"}
+    assert progress == [(1, 2), (2, 2)]
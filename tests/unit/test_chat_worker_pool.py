@@ -0,0 +1,84 @@
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from controller.chat_worker_pool import chat_request, chat_worker_pool
+
+
+class GatedWorker(QObject):
+    delta = pyqtSignal(str)
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, request, gate):
+        super().__init__()
+        self.request = request
+        self.gate = gate
+        self.was_cancelled = False
+
+    def cancel(self):
+        self.was_cancelled = True
+
+    def run(self):
+        self.gate.wait(5)
+        self.delta.emit(self.request.session)
+        self.finished.emit({"assistant": f"Antwort fuer {self.request.session}"})
+
+
+def make_request(session):
+    return chat_request(
+        session=session, chat_id=session, temp=False, messages=[], files=[], payload={}
+    )
+
+
+def build_pool(gate, results, max_workers):
+    return chat_worker_pool(
+        make_worker=lambda request: GatedWorker(request, gate),
+        on_delta=lambda request, text: results.append(("delta", request.session, text)),
+        on_finished=lambda request, result: results.append(
+            ("done", request.session, result["assistant"])
+        ),
+        on_failed=lambda request, message: results.append(("failed", request.session)),
+        max_workers=max_workers,
+    )
+
+
+def test_pool_limits_parallel_sessions_and_routes_results(qtbot):
+    gate = threading.Event()
+    results = []
+    pool = build_pool(gate, results, max_workers=2)
+
+    for session in ("chat-1", "chat-2", "chat-3"):
+        pool.submit(make_request(session))
+
+    assert set(pool.active) == {"chat-1", "chat-2"}
+    assert [request.session for request in pool.waiting] == ["chat-3"]
+    assert pool.is_busy("chat-3")
+
+    gate.set()
+    qtbot.waitUntil(lambda: len([r for r in results if r[0] == "done"]) == 3, timeout=5000)
+
+    done = {session: text for kind, session, text in results if kind == "done"}
+    assert done == {s: f"Antwort fuer {s}" for s in ("chat-1", "chat-2", "chat-3")}
+    assert ("delta", "chat-2", "chat-2") in results
+    assert pool.stats()["max_active"] == 2
+    qtbot.waitUntil(lambda: not pool._retired, timeout=5000)
+
+
+def test_cancelled_request_frees_its_slot_and_stays_silent(qtbot):
+    gate = threading.Event()
+    results = []
+    pool = build_pool(gate, results, max_workers=1)
+    first = make_request("chat-1")
+    pool.submit(first)
+    pool.submit(make_request("chat-2"))
+
+    assert pool.cancel("chat-1") is first
+    assert first.worker.was_cancelled is True
+    assert set(pool.active) == {"chat-2"}
+
+    gate.set()
+    qtbot.waitUntil(lambda: ("done", "chat-2", "Antwort fuer chat-2") in results, timeout=5000)
+    qtbot.waitUntil(lambda: not pool._retired, timeout=5000)
+    assert all(session != "chat-1" for _, session, *_ in results)
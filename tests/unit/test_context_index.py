@@ -0,0 +1,77 @@
+from controller.context_index import chunk_text, context_index
+
+
+def filler(word: str, count: int) -> str:
+    return " ".join(f"{word}{i % 50}" for i in range(count))
+
+
+def test_chunk_text_overlaps_and_covers_text():
+    text = filler("wort", 2000)
+    chunks = chunk_text(text, size=1000, overlap=200)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert chunks[0][-100:] in chunks[1]
+    assert chunks[-1].endswith(text[-20:])
+
+
+def test_search_ranks_matching_chunks_first():
+    index = context_index()
+    index.sync(
+        [
+            {"id": 1, "name": "bio.txt", "content": filler("zelle", 600) + " Mitochondrien Energie"},
+            {"id": 2, "name": "recht.txt", "content": filler("paragraph", 600) + " Vertrag Kuendigung"},
+        ]
+    )
+
+    hits = index.search("Wie funktioniert die Kuendigung vom Vertrag?", k=2)
+
+    assert hits[0].name == "recht.txt"
+    assert "Kuendigung" in hits[0].text
+
+
+def test_sync_indexes_each_file_version_once():
+    index = context_index()
+    contexts = [{"id": 1, "name": "a.txt", "content": "alpha beta", "version": "v1"}]
+
+    index.sync(contexts)
+    index.sync(contexts)
+    assert index.files_indexed == 1
+
+    index.sync([{"id": 1, "name": "a.txt", "content": "gamma delta", "version": "v2"}])
+    assert index.files_indexed == 2
+    assert index.search("gamma")[0].text == "gamma delta"
+
+    index.sync([])
+    assert index.chunk_count() == 0
+
+
+def test_select_contexts_sends_only_top_chunks_of_many_files():
+    index = context_index()
+    contexts = [
+        {"id": i, "name": f"doc{i}.pdf", "content": filler(f"thema{i}x", 2500)} for i in range(10)
+    ]
+    contexts[7]["content"] += " Abgabetermin ist der 3. Mai"
+    index.sync(contexts)
+
+    selected = index.select_contexts("Wann ist der Abgabetermin?", k=4)
+
+    total_chars = sum(len(entry["content"]) for entry in selected)
+    assert sum(len(entry["content"]) for entry in contexts) > 120_000
+    assert total_chars <= 4 * 1200 + 100
+    assert selected[0]["name"] == "doc7.pdf"
+    assert "Abgabetermin" in selected[0]["content"]
+
+
+def test_select_contexts_falls_back_to_leading_chunks():
+    index = context_index()
+    index.sync(
+        [
+            {"id": 1, "name": "a.txt", "content": filler("aa", 800)},
+            {"id": 2, "name": "b.txt", "content": filler("bb", 800)},
+        ]
+    )
+
+    selected = index.select_contexts("Fasse zusammen", k=2)
+
+    assert [entry["name"] for entry in selected] == ["a.txt", "b.txt"]
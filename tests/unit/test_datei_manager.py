@@ -1,3 +1,4 @@
+import hashlib
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -50,3 +51,26 @@ def test_speichere_datei_writes_bytes(tmp_path):
     target = manager.speichere_datei("nested/file.txt", b"data")
     assert target.exists()
     assert target.read_bytes() == b"data"
+
+
+def test_schreibe_datei_is_atomic_and_hashed(tmp_path):
+    manager = datei_manager(StubValidator(ok=True))
+    manager.setze_und_pruefe_pfad(str(tmp_path))
+    (tmp_path / "file.txt").write_bytes(b"old")
+
+    def chunks():
+        yield b"new "
+        raise OSError("disk full")
+
+    try:
+        manager.schreibe_datei("file.txt", chunks())
+        assert False, "Expected OSError"
+    except OSError:
+        pass
+    assert (tmp_path / "file.txt").read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [tmp_path / "file.txt"]
+
+    result = manager.schreibe_datei("file.txt", [b"new ", b"data"])
+    assert result.size == 8
+    assert result.sha256 == hashlib.sha256(b"new data").hexdigest()
+    assert (tmp_path / "file.txt").read_bytes() == b"new data"
@@ -0,0 +1,151 @@
+import hashlib
+import threading
+import time
+
+from controller.backend_client import backend_client
+from controller.download_service import (
+    CHUNK_SIZE,
+    download_file,
+    ensure_local_copy,
+    part_path,
+)
+from controller.sync_manifest import sync_manifest
+
+
+def _client(fake_backend):
+    return backend_client(fake_backend.base_url)
+
+
+def test_download_file_writes_via_part_file(fake_backend, tmp_path):
+    dest = tmp_path / "report.pdf"
+    result = download_file(
+        _client(fake_backend), token="token", file_id=1, dest=dest, timeout=5
+    )
+    assert result.ok is True
+    assert dest.read_bytes() == b"PDF-DATA"
+    assert not part_path(dest).exists()
+    assert fake_backend.range_requests == []
+
+
+def test_download_file_resumes_after_dropped_connection(fake_backend, tmp_path):
+    fake_backend.file_bytes["3"] = bytes(range(256)) * 256
+    fake_backend.drop_after_bytes["3"] = 2 * CHUNK_SIZE + 100
+    dest = tmp_path / "big.bin"
+
+    result = download_file(
+        _client(fake_backend), token="token", file_id=3, dest=dest, timeout=5
+    )
+
+    assert result.ok is True
+    assert dest.read_bytes() == fake_backend.file_bytes["3"]
+    # Only whole chunks reach the part file before the connection drops.
+    assert fake_backend.range_requests == [("3", f"bytes={2 * CHUNK_SIZE}-")]
+
+
+def test_download_file_continues_existing_part(fake_backend, tmp_path):
+    dest = tmp_path / "notes.txt"
+    part_path(dest).write_bytes(b"No")
+
+    result = download_file(
+        _client(fake_backend), token="token", file_id=2, dest=dest, timeout=5
+    )
+
+    assert result.ok is True
+    assert dest.read_bytes() == b"Notes"
+    assert fake_backend.range_requests == [("2", "bytes=2-")]
+
+
+def test_download_file_finalizes_complete_part(fake_backend, tmp_path):
+    dest = tmp_path / "notes.txt"
+    part_path(dest).write_bytes(b"Notes")
+
+    result = download_file(
+        _client(fake_backend), token="token", file_id=2, dest=dest, timeout=5
+    )
+
+    assert result.ok is True
+    assert dest.read_bytes() == b"Notes"
+
+
+def test_download_file_keeps_part_when_incomplete(fake_backend, tmp_path):
+    fake_backend.file_bytes["3"] = b"x" * (4 * CHUNK_SIZE)
+    fake_backend.drop_after_bytes["3"] = CHUNK_SIZE + 100
+    dest = tmp_path / "big.bin"
+
+    result = download_file(
+        _client(fake_backend), token="token", file_id=3, dest=dest, timeout=5, max_resumes=0
+    )
+
+    assert result.ok is False
+    assert not dest.exists()
+    assert part_path(dest).stat().st_size == CHUNK_SIZE
+
+
+def test_download_file_reports_status(fake_backend, tmp_path):
+    result = download_file(
+        _client(fake_backend), token="wrong", file_id=1, dest=tmp_path / "x", timeout=5
+    )
+    assert result.ok is False
+    assert result.status_code == 401
+    assert "Sitzung abgelaufen" in result.msg
+
+
+def test_download_file_reports_hash_of_resumed_content(fake_backend, tmp_path):
+    dest = tmp_path / "notes.txt"
+    part_path(dest).write_bytes(b"No")
+
+    result = download_file(
+        _client(fake_backend), token="token", file_id=2, dest=dest, timeout=5
+    )
+
+    assert result.sha256 == hashlib.sha256(b"Notes").hexdigest()
+
+
+def _record(size=8):
+    return {"id": 1, "name": "report.pdf", "size": size, "updated_at": "2024-01-01T10:00:00"}
+
+
+class _SlowClient(backend_client):
+    """Holds every download open long enough for a second caller to arrive."""
+
+    def get(self, *args, **kwargs):
+        time.sleep(0.2)
+        return super().get(*args, **kwargs)
+
+
+def test_ensure_local_copy_downloads_shared_destination_once(fake_backend, tmp_path):
+    client = _SlowClient(fake_backend.base_url)
+    manifest = sync_manifest(tmp_path)
+    start = threading.Barrier(2)
+    results = []
+
+    def fetch():
+        start.wait()
+        results.append(
+            ensure_local_copy(
+                client, token="token", record=_record(), manifest=manifest, timeout=5
+            )
+        )
+
+    threads = [threading.Thread(target=fetch) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [result.ok for result in results] == [True, True]
+    assert fake_backend.download_requests == 1
+    assert (tmp_path / "report.pdf").read_bytes() == b"PDF-DATA"
+    assert manifest.get(1)["sha256"] == hashlib.sha256(b"PDF-DATA").hexdigest()
+
+
+def test_ensure_local_copy_accepts_size_given_as_string(fake_backend, tmp_path):
+    manifest = sync_manifest(tmp_path)
+    client = _client(fake_backend)
+    for _ in range(2):
+        result = ensure_local_copy(
+            client, token="token", record=_record("8"), manifest=manifest, timeout=5
+        )
+        assert result.ok is True
+
+    assert fake_backend.download_requests == 1
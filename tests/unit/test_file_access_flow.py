@@ -1,5 +1,6 @@
 from pathlib import Path
 
+from controller.backend_client import backend_client
 from controller.file_access_flow import file_access_flow
 
 
@@ -42,6 +43,7 @@ class DummyStack:
 class DummyController:
     def __init__(self):
         self.api_base_url = "http://example"
+        self.api_client = backend_client(self.api_base_url)
         self.auth_token = "token"
         self.settings = DummySettings()
         self.datei_liste_view = DummyView()
@@ -55,6 +57,16 @@ class FakeResponse:
         self.status_code = status_code
         self.content = content
         self.headers = {"Content-Type": "application/octet-stream"}
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.closed = True
 
     def iter_content(self, chunk_size=8192):
         yield self.content
@@ -92,7 +104,7 @@ def test_ensure_local_file_uses_cache(tmp_path, monkeypatch):
     def fail_request(*args, **kwargs):
         raise AssertionError("should not download")
 
-    monkeypatch.setattr("controller.file_access_flow.requests.get", fail_request)
+    monkeypatch.setattr(controller.api_client.session, "request", fail_request)
 
     local = flow.ensure_local_file({"id": 1, "name": "report.pdf"})
     assert local == cached
@@ -107,7 +119,8 @@ def test_ensure_local_file_unauthorized(tmp_path, monkeypatch):
         lambda settings, view: tmp_path,
     )
     monkeypatch.setattr(
-        "controller.file_access_flow.requests.get",
+        controller.api_client.session,
+        "request",
         lambda *a, **k: FakeResponse(401),
     )
 
@@ -125,7 +138,8 @@ def test_ensure_local_file_download_success(tmp_path, monkeypatch):
         lambda settings, view: tmp_path,
     )
     monkeypatch.setattr(
-        "controller.file_access_flow.requests.get",
+        controller.api_client.session,
+        "request",
         lambda *a, **k: FakeResponse(200, b"payload"),
     )
 
@@ -1,5 +1,6 @@
 from pathlib import Path
 
+from controller.backend_client import backend_client
 from controller.file_access_flow import file_access_flow
 
 
@@ -46,6 +47,7 @@ class DummyStack:
 class DummyController:
     def __init__(self):
         self.api_base_url = "http://example"
+        self.api_client = backend_client(self.api_base_url)
         self.auth_token = "token"
         self.settings = DummySettings()
         self.datei_liste_view = DummyView()
@@ -57,7 +59,18 @@ class DummyController:
 class FakeResponse:
     def __init__(self, status_code=200, content=b"data"):
         self.status_code = status_code
+        self.headers = {}
         self.content = content
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.closed = True
 
     def iter_content(self, chunk_size=8192):
         yield self.content
@@ -102,7 +115,8 @@ def test_on_download_success(monkeypatch, tmp_path):
     controller.datei_liste_view.save_path = str(tmp_path / "doc.txt")
 
     monkeypatch.setattr(
-        "controller.file_access_flow.requests.get",
+        controller.api_client.session,
+        "request",
         lambda *a, **k: FakeResponse(200, b"payload"),
     )
 
@@ -117,13 +131,13 @@ def test_on_download_unauthorized(monkeypatch, tmp_path):
     controller.visible_file_records = [{"id": 1, "name": "doc.txt"}]
     controller.datei_liste_view.save_path = str(tmp_path / "doc.txt")
 
-    monkeypatch.setattr(
-        "controller.file_access_flow.requests.get",
-        lambda *a, **k: FakeResponse(401, b""),
-    )
+    response = FakeResponse(401, b"")
+    monkeypatch.setattr(controller.api_client.session, "request", lambda *a, **k: response)
 
     flow = file_access_flow(controller)
     flow.on_download_clicked()
 
     assert controller.stack.current == controller.login_view
     assert controller.datei_liste_view.errors
+    # Error responses are streamed too and must hand their connection back.
+    assert response.closed
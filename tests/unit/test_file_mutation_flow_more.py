@@ -1,3 +1,4 @@
+from controller.backend_client import backend_client
 from controller.file_mutation_flow import file_mutation_flow
 
 
@@ -22,6 +23,8 @@ class DummyView:
         self.errors = []
         self._selected_indices = []
         self._checked_indices = []
+        self.delete_progress = []
+        self.delete_status = ""
 
     def show_error(self, msg: str):
         self.errors.append(msg)
@@ -32,6 +35,12 @@ class DummyView:
     def get_checked_indices(self):
         return list(self._checked_indices)
 
+    def set_delete_progress(self, done: int, total: int):
+        self.delete_progress.append((done, total))
+
+    def set_delete_status(self, text: str):
+        self.delete_status = text
+
 
 class DummyStack:
     def __init__(self):
@@ -57,8 +66,12 @@ class DummyController:
         self.stack = DummyStack()
         self.auth_token = "token"
         self.api_base_url = "http://example"
+        self.api_client = backend_client(self.api_base_url)
         self.file_list_flow = DummyFileListFlow()
         self.visible_file_records = []
+        self.bulk_delete_path = None
+        self._delete_thread = None
+        self._delete_worker = None
 
 
 class FakeResponse:
@@ -66,7 +79,7 @@ class FakeResponse:
         self.status_code = status_code
 
 
-def test_delete_unauthorized(monkeypatch):
+def test_delete_unauthorized(qtbot, monkeypatch):
     controller = DummyController()
     controller.visible_file_records = [{"id": 1, "name": "doc"}]
     controller.datei_liste_view._selected_indices = [0]
@@ -76,17 +89,19 @@ def test_delete_unauthorized(monkeypatch):
         lambda *a, **k: __import__("PyQt6.QtWidgets").QtWidgets.QMessageBox.StandardButton.Yes,
     )
     monkeypatch.setattr(
-        "controller.file_mutation_flow.requests.delete",
+        controller.api_client.session,
+        "request",
         lambda *a, **k: FakeResponse(401),
     )
 
     flow = file_mutation_flow(controller)
     flow.on_delete_clicked()
+    qtbot.waitUntil(lambda: controller._delete_thread is None, timeout=5000)
 
     assert controller.stack.current == controller.login_view
 
 
-def test_delete_success(monkeypatch):
+def test_delete_success(qtbot, monkeypatch):
     controller = DummyController()
     controller.visible_file_records = [{"id": 1, "name": "doc"}]
     controller.datei_liste_view._selected_indices = [0]
@@ -96,11 +111,46 @@ def test_delete_success(monkeypatch):
         lambda *a, **k: __import__("PyQt6.QtWidgets").QtWidgets.QMessageBox.StandardButton.Yes,
     )
     monkeypatch.setattr(
-        "controller.file_mutation_flow.requests.delete",
+        controller.api_client.session,
+        "request",
         lambda *a, **k: FakeResponse(204),
     )
 
     flow = file_mutation_flow(controller)
     flow.on_delete_clicked()
+    qtbot.waitUntil(lambda: controller._delete_thread is None, timeout=5000)
+
+    assert controller.file_list_flow.called is True
+    assert controller.datei_liste_view.delete_progress == [(0, 1), (1, 1)]
+    assert controller.datei_liste_view.delete_status == ""
+
+
+def test_delete_falls_back_when_bulk_endpoint_missing(qtbot, monkeypatch):
+    controller = DummyController()
+    controller.bulk_delete_path = "/files/bulk-delete"
+    controller.visible_file_records = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+    controller.datei_liste_view._checked_indices = [0, 1]
+
+    monkeypatch.setattr(
+        "controller.file_mutation_flow.QMessageBox.question",
+        lambda *a, **k: __import__("PyQt6.QtWidgets").QtWidgets.QMessageBox.StandardButton.Yes,
+    )
+    calls = []
+
+    def fake_request(method, url, **kwargs):
+        calls.append((method, url))
+        return FakeResponse(404 if method == "POST" else 204)
+
+    monkeypatch.setattr(controller.api_client.session, "request", fake_request)
+
+    flow = file_mutation_flow(controller)
+    flow.on_delete_clicked()
+    qtbot.waitUntil(lambda: controller._delete_thread is None, timeout=5000)
 
+    assert calls[0] == ("POST", "http://example/files/bulk-delete")
+    assert sorted(calls[1:]) == [
+        ("DELETE", "http://example/files/1"),
+        ("DELETE", "http://example/files/2"),
+    ]
     assert controller.file_list_flow.called is True
+    assert not controller.datei_liste_view.errors
@@ -1,5 +1,6 @@
 import requests
 
+from controller.backend_client import backend_client
 from controller.file_mutation_flow import file_mutation_flow
 
 
@@ -24,7 +25,12 @@ class DummyView:
         self.errors = []
         self._selected_indices = []
         self._checked_indices = []
-        self.prompt_open_file_value = ""
+        self.delete_progress = []
+        self.delete_status = ""
+        self.prompt_open_files_value = []
+        self.status = ""
+        self.upload_progress = []
+        self.upload_status = ""
 
     def show_error(self, msg: str):
         self.errors.append(msg)
@@ -35,8 +41,26 @@ class DummyView:
     def get_checked_indices(self):
         return list(self._checked_indices)
 
-    def prompt_open_file(self, default_dir: str = ""):
-        return self.prompt_open_file_value
+    def set_delete_progress(self, done: int, total: int):
+        self.delete_progress.append((done, total))
+
+    def set_delete_status(self, text: str):
+        self.delete_status = text
+
+    def prompt_open_files(self, default_dir: str = ""):
+        return list(self.prompt_open_files_value)
+
+    def set_sync_progress(self, done: int, total: int):
+        pass
+
+    def set_sync_status(self, text: str):
+        self.status = text
+
+    def set_upload_progress(self, done: int, total: int):
+        self.upload_progress.append((done, total))
+
+    def set_upload_status(self, text: str):
+        self.upload_status = text
 
 
 class DummyStack:
@@ -54,6 +78,9 @@ class DummyFileListFlow:
     def load_files_and_show(self):
         self.called = True
 
+    def refresh_file_list_view(self):
+        pass
+
 
 class DummyController:
     def __init__(self):
@@ -63,13 +90,26 @@ class DummyController:
         self.stack = DummyStack()
         self.auth_token = "token"
         self.api_base_url = "http://example"
+        self.api_client = backend_client(self.api_base_url)
         self.file_list_flow = DummyFileListFlow()
         self.visible_file_records = []
+        self.bulk_delete_path = None
+        self._delete_thread = None
+        self._delete_worker = None
+        self._upload_thread = None
+        self._upload_worker = None
+        self.file_records = []
 
 
 class FakeResponse:
-    def __init__(self, status_code=200):
+    def __init__(self, status_code=200, payload=None):
         self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        if self._payload is None:
+            raise ValueError("no json")
+        return self._payload
 
 
 def test_upload_requires_auth():
@@ -80,33 +120,64 @@ def test_upload_requires_auth():
     assert controller.datei_liste_view.errors
 
 
-def test_upload_success(monkeypatch, tmp_path):
+def test_upload_inserts_returned_record(qtbot, monkeypatch, tmp_path):
+    controller = DummyController()
+    controller.file_records = [{"id": 1, "name": "old.txt"}]
+    controller.datei_liste_view.prompt_open_files_value = [str(tmp_path / "file.txt")]
+    (tmp_path / "file.txt").write_text("data", encoding="utf-8")
+
+    monkeypatch.setattr(
+        controller.api_client.session,
+        "request",
+        lambda *a, **k: FakeResponse(201, {"id": 2, "filename": "file.txt", "size": 4}),
+    )
+
+    flow = file_mutation_flow(controller)
+    flow.sync_files_to_folder = lambda: None
+    controller.datei_liste_view.status = "Synchronisiert: old.txt"
+    flow.on_upload_clicked()
+    qtbot.waitUntil(lambda: controller._upload_thread is None, timeout=5000)
+
+    view = controller.datei_liste_view
+    assert view.upload_progress[0] == (0, 1000)
+    assert view.upload_status == ""
+    # A running sync keeps its own status line.
+    assert view.status == "Synchronisiert: old.txt"
+    assert [record["id"] for record in controller.file_records] == [1, 2]
+    assert controller.file_records[1]["name"] == "file.txt"
+    assert controller.file_list_flow.called is False
+
+
+def test_upload_success(qtbot, monkeypatch, tmp_path):
     controller = DummyController()
-    controller.datei_liste_view.prompt_open_file_value = str(tmp_path / "file.txt")
+    controller.datei_liste_view.prompt_open_files_value = [str(tmp_path / "file.txt")]
     (tmp_path / "file.txt").write_text("data", encoding="utf-8")
 
     monkeypatch.setattr(
-        "controller.file_mutation_flow.requests.post",
+        controller.api_client.session,
+        "request",
         lambda *a, **k: FakeResponse(201),
     )
 
     flow = file_mutation_flow(controller)
     flow.on_upload_clicked()
+    qtbot.waitUntil(lambda: controller._upload_thread is None, timeout=5000)
     assert controller.file_list_flow.called is True
 
 
-def test_upload_request_exception(monkeypatch, tmp_path):
+def test_upload_request_exception(qtbot, monkeypatch, tmp_path):
     controller = DummyController()
-    controller.datei_liste_view.prompt_open_file_value = str(tmp_path / "file.txt")
+    controller.datei_liste_view.prompt_open_files_value = [str(tmp_path / "file.txt")]
     (tmp_path / "file.txt").write_text("data", encoding="utf-8")
 
     def raise_request(*args, **kwargs):
         raise requests.RequestException("fail")
 
-    monkeypatch.setattr("controller.file_mutation_flow.requests.post", raise_request)
+    monkeypatch.setattr(controller.api_client.session, "request", raise_request)
 
     flow = file_mutation_flow(controller)
     flow.on_upload_clicked()
+    qtbot.waitUntil(lambda: controller._upload_thread is None, timeout=5000)
     assert controller.datei_liste_view.errors
 
 
@@ -117,7 +188,7 @@ def test_delete_requires_selection():
     assert controller.datei_liste_view.errors
 
 
-def test_delete_not_found(monkeypatch):
+def test_delete_not_found(qtbot, monkeypatch):
     controller = DummyController()
     controller.visible_file_records = [{"id": 1, "name": "doc"}]
     controller.datei_liste_view._selected_indices = [0]
@@ -127,10 +198,12 @@ def test_delete_not_found(monkeypatch):
         lambda *a, **k: __import__("PyQt6.QtWidgets").QtWidgets.QMessageBox.StandardButton.Yes,
     )
     monkeypatch.setattr(
-        "controller.file_mutation_flow.requests.delete",
+        controller.api_client.session,
+        "request",
         lambda *a, **k: FakeResponse(404),
     )
 
     flow = file_mutation_flow(controller)
     flow.on_delete_clicked()
+    qtbot.waitUntil(lambda: controller._delete_thread is None, timeout=5000)
     assert controller.datei_liste_view.errors
@@ -1,8 +1,10 @@
 import os
+import threading
 
 import pytest
 
 from controller.ki_analyzer import ki_analyzer
+from controller.retry_policy import circuit_breaker
 
 
 class FakeResponse:
@@ -31,7 +33,132 @@ def test_chat_success(monkeypatch):
         assert json["model"]
         return FakeResponse()
 
-    monkeypatch.setattr("controller.ki_analyzer.requests.post", fake_post)
     analyzer = ki_analyzer(max_wiederholungen=1)
+    monkeypatch.setattr(analyzer.session, "post", fake_post)
     result = analyzer.chat([{"role": "user", "content": "Hello"}])
     assert result == "Hi"
+
+
+def test_chat_does_not_retry_client_errors(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    calls = []
+
+    def fake_post(url, headers=None, json=None, timeout=None):
+        calls.append(url)
+        return FakeResponse(status_code=400, text="bad request")
+
+    analyzer = ki_analyzer(max_wiederholungen=3)
+    monkeypatch.setattr(analyzer.session, "post", fake_post)
+    monkeypatch.setattr(analyzer._retry, "_sleep", lambda s: pytest.fail("must not sleep"))
+
+    with pytest.raises(RuntimeError):
+        analyzer.chat([{"role": "user", "content": "Hello"}])
+    assert len(calls) == 1
+
+
+def test_chat_retries_rate_limit_without_trailing_sleep(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    responses = [FakeResponse(status_code=429), FakeResponse(status_code=503)]
+    sleeps = []
+
+    def fake_post(url, headers=None, json=None, timeout=None):
+        return responses.pop(0) if responses else FakeResponse(status_code=503)
+
+    analyzer = ki_analyzer(max_wiederholungen=3)
+    monkeypatch.setattr(analyzer.session, "post", fake_post)
+    monkeypatch.setattr(analyzer._retry, "_sleep", sleeps.append)
+
+    with pytest.raises(RuntimeError):
+        analyzer.chat([{"role": "user", "content": "Hello"}])
+    assert analyzer.aktuelle_iteration == 3
+    assert len(sleeps) == 2
+
+
+def test_chat_uses_cache_only_when_deterministic(monkeypatch, tmp_path):
+    from controller.response_cache import response_cache
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    calls = []
+
+    def fake_post(url, headers=None, json=None, timeout=None):
+        calls.append(json["temperature"])
+        return FakeResponse()
+
+    analyzer = ki_analyzer(max_wiederholungen=1, temperature=0, cache=response_cache(tmp_path))
+    monkeypatch.setattr(analyzer.session, "post", fake_post)
+    messages = [{"role": "user", "content": "Hello"}]
+
+    assert analyzer.chat(messages) == "Hi"
+    assert analyzer.chat(messages) == "Hi"
+    assert analyzer.chat(messages, temperature=0.7) == "Hi"
+
+    assert calls == [0.0, 0.7]
+    assert analyzer.cache_stats()["hits"] == 1
+
+
+def test_attempt_counter_is_per_thread(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+    def fake_post(url, headers=None, json=None, timeout=None):
+        return FakeResponse(status_code=503)
+
+    analyzer = ki_analyzer(max_wiederholungen=3)
+    monkeypatch.setattr(analyzer.session, "post", fake_post)
+    monkeypatch.setattr(analyzer._retry, "_sleep", lambda s: None)
+
+    def run():
+        with pytest.raises(RuntimeError):
+            analyzer.chat([{"role": "user", "content": "Hello"}])
+        seen.append(analyzer.aktuelle_iteration)
+
+    seen = []
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+
+    assert seen == [3]
+    assert analyzer.aktuelle_iteration == 0
+
+
+def test_open_circuit_fails_fast_and_is_reported(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    calls = []
+
+    def fake_post(url, headers=None, json=None, timeout=None):
+        calls.append(url)
+        return FakeResponse(status_code=502)
+
+    analyzer = ki_analyzer(max_wiederholungen=3, breaker=circuit_breaker(failure_threshold=2))
+    monkeypatch.setattr(analyzer.session, "post", fake_post)
+    monkeypatch.setattr(analyzer._retry, "_sleep", lambda s: None)
+
+    with pytest.raises(RuntimeError, match="temporarily unavailable"):
+        analyzer.chat([{"role": "user", "content": "Hello"}])
+    with pytest.raises(RuntimeError, match="temporarily unavailable"):
+        analyzer.chat([{"role": "user", "content": "Hello"}])
+
+    assert len(calls) == 2
+    metrics = analyzer.metrics()
+    assert metrics["calls"] == 2
+    assert metrics["attempts"] == 2
+    assert metrics["retries"] == 1
+    assert metrics["rejected"] == 2
+    assert metrics["breaker"]["state"] == "open"
+
+
+def test_rate_limit_leaves_breaker_untouched(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    responses = [FakeResponse(status_code=code) for code in (503, 429, 503)]
+
+    def fake_post(url, headers=None, json=None, timeout=None):
+        return responses.pop(0)
+
+    analyzer = ki_analyzer(max_wiederholungen=3, breaker=circuit_breaker(failure_threshold=2))
+    monkeypatch.setattr(analyzer.session, "post", fake_post)
+    monkeypatch.setattr(analyzer._retry, "_sleep", lambda s: None)
+
+    with pytest.raises(RuntimeError, match="HTTP 503"):
+        analyzer.chat([{"role": "user", "content": "Hello"}])
+
+    # The 429 in between neither reset the failure count nor added to it.
+    assert analyzer.metrics()["breaker"]["state"] == "open"
@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+from pdf_factory import make_pdf
+
+from controller import pdf_extractor
+from controller.pdf_extractor import extract_pdf_text, page_ranges
+
+
+@pytest.fixture
+def pool_cleanup():
+    yield
+    pdf_extractor.shutdown_pool()
+
+
+def test_page_ranges_cover_all_pages_in_order():
+    ranges = page_ranges(10, 4)
+    assert ranges == [(0, 3), (3, 6), (6, 8), (8, 10)]
+    assert page_ranges(2, 8) == [(0, 1), (1, 2)]
+
+
+def test_parallel_extraction_keeps_page_order(pool_cleanup):
+    pdf = make_pdf([f"Seite{i}" for i in range(30)], lines_per_page=2)
+
+    serial = extract_pdf_text(pdf, parallel=False)
+    parallel = extract_pdf_text(pdf, parallel=True, max_workers=2)
+
+    assert parallel == serial
+    assert [page.split()[0] for page in parallel] == [f"Seite{i}" for i in range(30)]
+
+
+def test_extraction_rejects_oversized_documents():
+    pdf = make_pdf(["klein"])
+    with pytest.raises(RuntimeError, match="zu gross"):
+        extract_pdf_text(pdf, max_pdf_bytes=100)
+
+
+def test_extraction_times_out(pool_cleanup):
+    pdf = make_pdf([f"Seite{i}" for i in range(30)])
+    with pytest.raises(RuntimeError, match="Zeitlimit"):
+        extract_pdf_text(pdf, parallel=True, max_workers=2, timeout_s=0.0)
+    assert pdf_extractor._pool is None
+
+
+def test_small_documents_are_held_to_the_deadline(pool_cleanup):
+    pdf = make_pdf(["klein"], lines_per_page=1)
+
+    assert extract_pdf_text(pdf) == ["klein 0"]
+    with pytest.raises(RuntimeError, match="Zeitlimit"):
+        extract_pdf_text(pdf, timeout_s=0.0)
+
+
+def test_timeout_of_one_document_spares_concurrent_documents(pool_cleanup):
+    pdf = make_pdf([f"Seite{i}" for i in range(30)], lines_per_page=2)
+    results = []
+    other = threading.Thread(
+        target=lambda: results.append(extract_pdf_text(pdf, parallel=True, max_workers=2))
+    )
+    other.start()
+    while not pdf_extractor._pool_users:
+        time.sleep(0.01)
+    shared = pdf_extractor._pool
+
+    with pytest.raises(RuntimeError, match="Zeitlimit"):
+        extract_pdf_text(pdf, parallel=True, max_workers=2, timeout_s=0.0)
+    assert shared in pdf_extractor._retired_pools
+    other.join(timeout=60)
+
+    assert len(results) == 1 and len(results[0]) == 30
+    assert shared not in pdf_extractor._retired_pools
+    assert not pdf_extractor._pool_users
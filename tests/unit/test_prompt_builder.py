@@ -0,0 +1,61 @@
+from controller.prompt_builder import estimate_tokens, prompt_builder
+
+
+def turns(count: int, size: int = 400) -> list[dict]:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"{i}:" + "t" * size}
+        for i in range(count)
+    ]
+
+
+def test_small_prompt_is_sent_unchanged():
+    history = turns(3, size=20)
+    plan = prompt_builder(8000).build("sys", [{"name": "a.txt", "content": "Hallo"}], history)
+
+    assert plan.messages[0] == {"role": "system", "content": "sys"}
+    assert "Hallo" in plan.messages[1]["content"]
+    assert plan.messages[2:] == history
+    assert plan.dropped_turns == 0
+    assert plan.truncated_files == []
+
+
+def test_oldest_turns_are_dropped_first():
+    history = turns(40)
+    plan = prompt_builder(2000).build("sys", [], history)
+
+    kept = plan.messages[1:]
+    assert kept[-1] == history[-1]
+    assert kept == history[-len(kept):]
+    assert plan.dropped_turns == 40 - len(kept)
+    assert plan.tokens <= 2000
+
+
+def test_files_share_budget_and_small_files_stay_whole():
+    files = [
+        {"name": "klein.txt", "content": "k" * 200},
+        {"name": "gross.txt", "content": "g" * 100_000},
+    ]
+    plan = prompt_builder(3000).build("sys", files, turns(1, size=10))
+
+    contents = [m["content"] for m in plan.messages]
+    assert any("k" * 200 in c for c in contents)
+    assert plan.truncated_files == ["gross.txt"]
+    assert plan.tokens <= 3000
+    assert sum(estimate_tokens(c) for c in contents) <= 3000
+
+
+def test_lowest_scored_files_are_dropped_when_budget_is_tight():
+    files = [
+        {"name": "wichtig.txt", "content": "w" * 5000, "score": 2.0},
+        {"name": "nebensache.txt", "content": "n" * 5000, "score": 0.1},
+    ]
+    plan = prompt_builder(400, min_file_tokens=200).build("sys", files, turns(1, size=10))
+
+    assert plan.files == ["wichtig.txt"]
+    assert plan.dropped_files == ["nebensache.txt"]
+
+
+def test_build_logs_summary(caplog):
+    with caplog.at_level("INFO", logger="controller.prompt_builder"):
+        prompt_builder(1000).build("sys", [], turns(2, size=10))
+    assert "Prompt: ~" in caplog.text
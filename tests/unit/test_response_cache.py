@@ -0,0 +1,82 @@
+import threading
+
+from controller.response_cache import cache_key, response_cache
+
+
+MESSAGES = [{"role": "user", "content": "Was steht in der Datei?"}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_ignores_whitespace_and_extra_fields():
+    noisy = [{"role": "user", "content": "  Was steht in der Datei?\r\n", "name": "x"}]
+    assert cache_key("m", 0, MESSAGES) == cache_key("m", 0.0, noisy)
+    assert cache_key("m", 0, MESSAGES) != cache_key("other", 0, MESSAGES)
+    assert cache_key("m", 0, MESSAGES) != cache_key("m", 0.5, MESSAGES)
+
+
+def test_cache_hit_miss_and_persistence(tmp_path):
+    cache = response_cache(tmp_path)
+    key = cache_key("m", 0, MESSAGES)
+
+    assert cache.get(key) is None
+    cache.put(key, "Antwort")
+    assert cache.get(key) == "Antwort"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    reopened = response_cache(tmp_path)
+    assert reopened.get(key) == "Antwort"
+
+
+def test_cache_expires_entries_after_ttl(tmp_path):
+    clock = FakeClock()
+    cache = response_cache(tmp_path, ttl_s=60, clock=clock)
+    cache.put("a", "alt")
+
+    clock.now += 61
+
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+    assert not (tmp_path / "a.json").exists()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = response_cache(tmp_path, max_bytes=10_000)
+    cache.put("a", "x" * 3000)
+    cache.put("b", "x" * 3000)
+    cache.put("c", "x" * 3000)
+    assert cache.get("a") is not None
+
+    cache.put("d", "x" * 3000)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= 10_000
+
+
+def test_cache_is_safe_across_threads(tmp_path):
+    cache = response_cache(tmp_path, max_bytes=50_000)
+
+    def work(n):
+        for i in range(50):
+            key = f"k{(n * 50 + i) % 40}"
+            cache.put(key, "v" * 200)
+            cache.get(key)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 200
+    assert stats["entries"] == len(list(tmp_path.glob("*.json")))
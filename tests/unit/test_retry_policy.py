@@ -0,0 +1,97 @@
+import random
+
+import requests
+
+from controller.retry_policy import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    circuit_breaker,
+    parse_retry_after,
+    retry_policy,
+    token_bucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_parse_retry_after_seconds_and_date():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:10 GMT", now=4.0) == 6.0
+
+
+def test_only_idempotent_methods_and_transient_statuses_retry():
+    policy = retry_policy()
+    assert policy.is_retryable_status("GET", 503)
+    assert policy.is_retryable_status("DELETE", 429)
+    assert not policy.is_retryable_status("GET", 404)
+    assert not policy.is_retryable_status("POST", 503)
+    assert policy.is_retryable_status("POST", 503, idempotent=True)
+    assert policy.is_retryable_exception("GET", requests.ConnectionError())
+    assert not policy.is_retryable_exception("GET", requests.TooManyRedirects())
+
+
+def test_decorrelated_jitter_stays_within_bounds():
+    policy = retry_policy(base_s=0.1, cap_s=1.0, rng=random.Random(7))
+    delay = 0.0
+    for _ in range(50):
+        previous = delay
+        delay = policy.next_delay(previous)
+        assert 0.1 <= delay <= min(1.0, max(previous * 3, 0.1))
+
+
+def test_retry_after_is_a_lower_bound_and_has_a_ceiling():
+    policy = retry_policy(base_s=0.1, cap_s=1.0, max_retry_after_s=5.0)
+    assert policy.next_delay(0.0, 2.0) == 2.0
+    assert policy.next_delay(0.0, 60.0) is None
+
+
+def test_token_bucket_limits_rate():
+    clock = FakeClock()
+    bucket = token_bucket(rate=10, capacity=2, clock=clock, sleep=clock.sleep)
+
+    for _ in range(6):
+        bucket.acquire()
+
+    # Two calls fit in the burst; the other four wait 0.1 s each.
+    assert round(clock.now, 6) == 0.4
+    assert round(bucket.waited_s, 6) == 0.4
+
+
+def test_circuit_breaker_opens_then_probes_after_cooldown():
+    clock = FakeClock()
+    breaker = circuit_breaker(failure_threshold=2, cooldown_s=10.0, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 10.0
+
+    clock.now = 10.0
+    assert breaker.allow()
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 10.0
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+
+    clock.now = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
+    assert breaker.stats()["opened"] == 2
+    assert breaker.stats()["rejected"] == 2
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from controller.response_cache import cache_key, response_cache
+from controller.summarizer import map_reduce_summarizer
+
+
+class FakeAnalyzer:
+    def __init__(self, fail_on=None, delay_s=0.0):
+        self.calls = []
+        self.fail_on = set(fail_on or ())
+        self.delay_s = delay_s
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def request_key(self, messages, *, temperature=None):
+        return cache_key("fake", 0.2, messages)
+
+    def chat(self, messages, *, cancellation=None):
+        with self._lock:
+            self.calls.append(messages)
+            number = len(self.calls)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay_s)
+            if number in self.fail_on:
+                raise RuntimeError("HTTP 503")
+            body = messages[-1]["content"]
+            return f"S({len(body)})"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def document(sections: int) -> dict:
+    paragraph = "Lorem ipsum dolor sit amet consectetur. " * 20
+    return {"name": "skript.pdf", "content": "\n".join([paragraph] * sections)}
+
+
+def test_summarize_maps_every_chunk_and_reduces_to_one():
+    analyzer = FakeAnalyzer()
+    summarizer = map_reduce_summarizer(analyzer, chunk_tokens=200, fan_in=3)
+    progress = []
+
+    result = summarizer.summarize([document(12)], on_progress=lambda d, t: progress.append((d, t)))
+
+    map_calls = [c for c in analyzer.calls if "Section" in c[-1]["content"]]
+    reduce_calls = [c for c in analyzer.calls if c[-1]["content"].startswith("Part 1:")]
+    assert len(map_calls) == len(summarizer.map_requests([document(12)])) > 3
+    assert len(reduce_calls) >= 2
+    assert result.startswith("S(")
+    assert progress[-1][0] == progress[-1][1] == len(analyzer.calls)
+
+
+def test_group_parts_always_merges_at_least_two():
+    summarizer = map_reduce_summarizer(FakeAnalyzer(), chunk_tokens=200, reduce_tokens=200, fan_in=4)
+    huge = "x" * 4000
+
+    groups = summarizer.group_parts([huge, huge, huge])
+
+    assert groups == [[huge, huge, huge]]
+    groups = summarizer.group_parts(["a"] * 9)
+    assert sum(len(group) for group in groups) == 9
+    assert all(2 <= len(group) <= 4 for group in groups)
+
+
+def test_retry_reuses_cached_partial_summaries(tmp_path):
+    cache = response_cache(tmp_path)
+    doc = document(6)
+    failing = FakeAnalyzer(fail_on={3})
+    summarizer = map_reduce_summarizer(failing, cache=cache, chunk_tokens=200, max_workers=1)
+    map_count = len(summarizer.map_requests([doc]))
+
+    with pytest.raises(RuntimeError, match="503"):
+        summarizer.summarize([doc])
+
+    retry = FakeAnalyzer()
+    map_reduce_summarizer(retry, cache=cache, chunk_tokens=200, max_workers=1).summarize([doc])
+    retried_maps = [c for c in retry.calls if "Section" in c[-1]["content"]]
+    # The two chunks before the failure are never requested again.
+    assert 1 <= len(retried_maps) <= map_count - 2
+
+
+def test_map_concurrency_is_bounded():
+    analyzer = FakeAnalyzer(delay_s=0.02)
+    summarizer = map_reduce_summarizer(analyzer, chunk_tokens=200, max_workers=2)
+
+    summarizer.summarize([document(10)])
+
+    assert analyzer.max_active == 2
@@ -0,0 +1,91 @@
+from controller.sync_manifest import sync_manifest
+
+
+def _record(file_id, name, size=5, updated_at="2024-01-01T10:00:00"):
+    return {"id": file_id, "name": name, "size": size, "updated_at": updated_at}
+
+
+def test_plan_adds_unknown_files(tmp_path):
+    manifest = sync_manifest(tmp_path)
+    plan = manifest.plan([_record(1, "a.txt"), _record(2, "b.txt")])
+
+    assert [dest.name for _, dest in plan.add] == ["a.txt", "b.txt"]
+    assert plan.update == []
+    assert plan.delete == []
+
+
+def test_plan_detects_unchanged_updated_and_deleted(tmp_path):
+    manifest = sync_manifest(tmp_path)
+    for record in (_record(1, "a.txt"), _record(2, "b.txt"), _record(3, "c.txt")):
+        manifest.record_download(record, tmp_path / record["name"], "hash")
+
+    plan = manifest.plan(
+        [_record(1, "a.txt"), _record(2, "b.txt", updated_at="2024-02-01T10:00:00")]
+    )
+
+    assert plan.unchanged == 1
+    assert [record["id"] for record, _ in plan.update] == [2]
+    assert plan.delete == ["3"]
+
+
+def test_plan_disambiguates_same_names(tmp_path):
+    manifest = sync_manifest(tmp_path)
+    plan = manifest.plan([_record(1, "report.pdf"), _record(2, "report.pdf")])
+
+    assert [dest.name for _, dest in plan.add] == ["report.pdf", "report_2.pdf"]
+
+
+def test_plan_adopts_existing_files_without_owning_them(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"hello")
+    (tmp_path / "b.txt").write_bytes(b"other content")
+    manifest = sync_manifest(tmp_path)
+
+    plan = manifest.plan([_record(1, "a.txt"), _record(2, "b.txt")])
+
+    assert [dest.name for _, dest in plan.adopt] == ["a.txt"]
+    assert [dest.name for _, dest in plan.add] == ["b_2.txt"]
+    assert manifest.get(1) is None
+
+    manifest.adopt(plan.adopt)
+    assert manifest.plan([_record(1, "a.txt")]).unchanged == 1
+    assert manifest.remove_obsolete(["1"]) == 0
+    assert (tmp_path / "a.txt").exists()
+
+
+def test_suffixed_names_avoid_planned_and_local_names(tmp_path):
+    (tmp_path / "report.pdf").write_bytes(b"unrelated")
+    (tmp_path / "report_1.pdf").write_bytes(b"also unrelated")
+    manifest = sync_manifest(tmp_path)
+
+    plan = manifest.plan(
+        [_record(1, "report.pdf"), _record(2, "report_1_2.pdf"), _record(3, "report.pdf")]
+    )
+
+    names = [dest.name for _, dest in plan.add]
+    assert names == ["report_1_2.pdf", "report_1_2_2.pdf", "report_3.pdf"]
+    assert manifest.resolve(_record(1, "report.pdf"))[1] == "add"
+
+
+def test_remove_obsolete_deletes_owned_copies(tmp_path):
+    manifest = sync_manifest(tmp_path)
+    (tmp_path / "a.txt").write_bytes(b"hello")
+    manifest.record_download(_record(1, "a.txt"), tmp_path / "a.txt", "hash")
+
+    assert manifest.remove_obsolete(["1"]) == 1
+    assert not (tmp_path / "a.txt").exists()
+    assert manifest.get(1) is None
+
+
+def test_manifest_persists_entries(tmp_path):
+    manifest = sync_manifest(tmp_path)
+    manifest.record_download(_record(1, "a.txt"), tmp_path / "a.txt", "abc")
+    manifest.save()
+
+    reloaded = sync_manifest(tmp_path)
+    assert reloaded.get(1)["sha256"] == "abc"
+    assert reloaded.local_path(1) == tmp_path / "a.txt"
+
+
+def test_manifest_ignores_corrupted_file(tmp_path):
+    (tmp_path / sync_manifest.FILE_NAME).write_text("{not json", encoding="utf-8")
+    assert sync_manifest(tmp_path).plan([_record(1, "a.txt")]).add
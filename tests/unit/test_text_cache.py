@@ -0,0 +1,46 @@
+import os
+
+from controller.text_cache import file_version, text_cache
+
+
+def test_file_version_uses_updated_at_and_size():
+    assert file_version({"updated_at": "2024-01-01", "size": 3}) == "2024-01-01:3"
+    assert file_version({"id": 1, "name": "a"}) is None
+    assert file_version(None) is None
+
+
+def test_text_cache_roundtrip_is_compressed(tmp_path):
+    cache = text_cache(tmp_path)
+    text = "Seite eins. " * 5000
+
+    assert cache.get(7, "v1") is None
+    cache.put(7, "v1", text)
+
+    assert text_cache(tmp_path).get(7, "v1") == text
+    stored = sum(path.stat().st_size for path in tmp_path.glob("*.txt.gz"))
+    assert stored < len(text) / 10
+
+
+def test_new_version_replaces_old_one(tmp_path):
+    cache = text_cache(tmp_path)
+    cache.put(7, "v1", "alt")
+    cache.put(7, "v2", "neu")
+    cache.put(8, "v1", "andere")
+
+    assert cache.get(7, "v1") is None
+    assert cache.get(7, "v2") == "neu"
+    assert cache.get(8, "v1") == "andere"
+    assert cache.stats()["entries"] == 2
+
+
+def test_text_cache_evicts_least_recently_used(tmp_path):
+    cache = text_cache(tmp_path, max_bytes=2500)
+    # Random hex compresses to roughly 1 KB per entry.
+    blobs = {i: os.urandom(1000).hex() for i in range(3)}
+    for file_id, text in blobs.items():
+        cache.put(file_id, "v", text)
+        cache.get(0, "v")
+
+    assert cache.get(0, "v") == blobs[0]
+    assert cache.stats()["bytes"] <= 2500
+    assert cache.stats()["evictions"] >= 1